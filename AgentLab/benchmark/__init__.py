@@ -1,9 +1,16 @@
 """
 Benchmark package for Acidwave tasks.
 
-Importing this module registers all Acidwave tasks so AgentLab and BrowserGym
-can discover them when creating environments (mirrors WebArena's registration
-pattern).
+Importing this module installs Acidwave task registration so AgentLab and
+BrowserGym can discover tasks when creating environments (mirrors WebArena's
+registration pattern).
 """
 
-from .acidwave import *  # noqa: F401,F403
+from . import acidwave
+
+
+def __getattr__(name):
+    # Re-export acidwave's public API; its heavy modules load on first access
+    if name in acidwave.__all__:
+        return getattr(acidwave, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
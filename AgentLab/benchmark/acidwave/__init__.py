@@ -2,49 +2,55 @@
 Acidwave Benchmark Package
 ===========================
 
-Registers all Acidwave tasks with BrowserGym.
+Registers Acidwave tasks with BrowserGym.
 
-Import this module to automatically register all tasks:
+Importing this module installs lazy registration: each task of test.raw.json
+is registered with Gymnasium the first time it is looked up. Modules with
+heavy dependencies (``AcidwaveTask``, ``AcidwaveBenchmark``) are imported on
+first access:
     >>> from benchmark.acidwave import AcidwaveBenchmark
-    >>> # All tasks are now registered with Gymnasium
+    >>> env = gym.make("browsergym/acidwave.task_3")  # registers acidwave.task_3
 """
 
-import json
-from pathlib import Path
-from browsergym.core.registration import register_task
-from .task import AcidwaveTask
-from .benchmark import AcidwaveBenchmark
+import importlib
 
-# Load all task IDs from test.raw.json
-_task_file = Path(__file__).parent / "test.raw.json"
-with open(_task_file, 'r', encoding='utf-8') as f:
-    _all_tasks = json.load(f)
+from .catalog import TaskCatalog, get_task_catalog
+from .metadata import TaskIndex
+from .registration import ensure_task_registered, gym_task_name, install_lazy_registration
 
-ALL_ACIDWAVE_TASK_IDS = []
+# Register tasks with Gymnasium on first lookup
+install_lazy_registration()
 
-# Register each task as a Gymnasium environment
-for task_config in _all_tasks:
-    task_id = task_config["task_id"]
-    gym_id = f"acidwave.task_{task_id}"
+# Exports whose modules pull in BrowserGym / Playwright / AgentLab / pandas,
+# imported on first access
+_LAZY_EXPORTS = {
+    "AcidwaveTask": ".task",
+    "AcidwaveBenchmark": ".benchmark",
+}
 
-    # Register with BrowserGym
-    # Note: Only pass task_id as frozen parameter
-    # start_url and goal will be passed at environment creation time
-    register_task(
-        gym_id,
-        AcidwaveTask,
-        task_kwargs={
-            "task_id": task_id,
-        },
-    )
 
-    ALL_ACIDWAVE_TASK_IDS.append(gym_id)
+def __getattr__(name):
+    if name in _LAZY_EXPORTS:
+        value = getattr(importlib.import_module(_LAZY_EXPORTS[name], __name__), name)
+        globals()[name] = value
+        return value
+    # Task names are derived from the catalog only when asked for
+    if name == "ALL_ACIDWAVE_TASK_IDS":
+        return [gym_task_name(task_id) for task_id in get_task_catalog().task_ids]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
 
-print(f"[OK] Registered {len(ALL_ACIDWAVE_TASK_IDS)} Acidwave tasks: {ALL_ACIDWAVE_TASK_IDS[:3]}...")
 
 # Export public API
 __all__ = [
     "AcidwaveTask",
     "AcidwaveBenchmark",
+    "TaskCatalog",
+    "get_task_catalog",
+    "TaskIndex",
+    "ensure_task_registered",
     "ALL_ACIDWAVE_TASK_IDS",
 ]
@@ -8,14 +8,31 @@ WebArena-style Benchmark wrapper so AgentLab's GenericAgent can adapt flags
 
 from __future__ import annotations
 
-import json
+import typing
 from pathlib import Path
-from typing import Iterable, List, Optional
+from typing import TYPE_CHECKING, Iterable, Iterator, List, Optional, Union
 
-import pandas as pd
-from browsergym.experiments.benchmark.base import Benchmark, HighLevelActionSetArgs
+from browsergym.experiments.benchmark.base import (
+    Benchmark,
+    BenchmarkBackend,
+    HighLevelActionSetArgs,
+)
 
-from agentlab.experiments.loop import EnvArgs
+from .catalog import iter_task_configs
+from .metadata import TaskIndex
+from .registration import add_task_file
+from .scheduling import load_task_history, longest_first, predict_task_durations
+from .sharding import shard_task_ids
+
+if TYPE_CHECKING:
+    # Imported where used: pandas only for task_metadata, AgentLab only for env_args_list
+    import pandas as pd
+
+    from agentlab.experiments.loop import EnvArgs
+
+
+# Task orders of env_args_list
+SCHEDULES = ("task_id", "longest_first")
 
 
 class AcidwaveBenchmark(Benchmark):
@@ -27,66 +44,128 @@ class AcidwaveBenchmark(Benchmark):
         difficulty: Optional[str] = None,
         max_steps: int = 30,
         headless: bool = True,
-        slow_mo: int = 100,
+        slow_mo: int = 0,
+        ready_timeout: Optional[int] = None,
+        resource_policy: Optional[str] = None,
+        storage_state: Optional[Union[str, Path]] = None,
+        reset_hook: Optional[str] = None,
+        har_mode: Optional[str] = None,
+        har_dir: Optional[Union[str, Path]] = None,
+        start_url: Optional[str] = None,
+        task_file: Optional[Union[str, Path]] = None,
+        shard_index: Optional[int] = None,
+        num_shards: Optional[int] = None,
+        cost_history: Optional[Iterable[Union[str, Path]]] = None,
+        schedule: str = "task_id",
     ) -> None:
-        # Load tasks from JSON (mirrors WebArena's evaluate loader)
-        task_file = Path(__file__).parent / "test.raw.json"
-        with open(task_file, "r", encoding="utf-8") as f:
-            raw_tasks = json.load(f)
-
-        # Normalize task list (dicts, matches WebArena evaluate usage)
-        tasks: List[dict] = []
-        for t in raw_tasks:
-            tasks.append(
-                {
-                    "task_id": t["task_id"],
-                    "intent": t.get("intent", ""),
-                    "difficulty": t.get("difficulty", "unknown"),
-                    "start_url": t.get("start_url", "http://localhost:5173"),
-                    "eval": t.get("eval", {}),
-                }
-            )
+        """
+        Args:
+            task_subset: Task IDs to include (None = all)
+            difficulty: Only include tasks of this difficulty
+            max_steps, headless, slow_mo: Settings of the default EnvArgs (slow_mo
+                only slows actions down; tasks wait for the page to settle instead)
+            ready_timeout: Upper bound (ms) for the app to settle after loading,
+                passed to each task (None: AcidwaveTask default)
+            resource_policy: "lean" or "full" request routing of each task
+                (None: AcidwaveTask default, "lean"; see resources.py)
+            storage_state: Storage snapshot applied to each task's page before
+                the app loads (see state_reset.py)
+            reset_hook: Backend API URL or shell command restoring the backend
+                checkpoint before each task with require_reset
+            har_mode, har_dir: "record" each task's API traffic to, or "replay"
+                it from, a HAR file in har_dir (see har.py)
+            start_url: App URL replacing each task's start_url (e.g. a
+                LocalBackend serving the frontend; None: the task's own)
+            task_file: Task file (default: test.raw.json, ``.jsonl`` supported)
+            shard_index: Shard of the selected tasks to keep, in [0, num_shards)
+            num_shards: Number of shards the selected tasks are split into
+            cost_history: Results directories whose summary_info.json files
+                predict task durations, used to balance shards and to schedule
+                (see scheduling.py; difficulty priors without history)
+            schedule: Task order of env_args_list: "task_id" (file order) or
+                "longest_first" (decreasing predicted duration, for n_jobs > 1)
 
-        # Apply filters (task IDs or difficulty)
-        if task_subset is not None:
-            subset_set = set(task_subset)
-            tasks = [t for t in tasks if t["task_id"] in subset_set]
+        Raises:
+            ValueError: If only one of shard_index / num_shards is given,
+                shard_index is out of range or schedule is unknown
+        """
+        if schedule not in SCHEDULES:
+            raise ValueError(f"Unknown schedule '{schedule}'. Expected one of {SCHEDULES}")
 
-        if difficulty is not None:
-            tasks = [t for t in tasks if t["difficulty"].lower() == difficulty.lower()]
+        # Custom suites: tasks and their gym registrations are looked up in task_file
+        if task_file is not None:
+            task_file = add_task_file(task_file)
 
-        self._tasks: List[dict] = tasks
+        # Stream tasks from test.raw.json (or a JSONL suite), filtering by task IDs and
+        # difficulty while reading, so only the selected tasks are kept in memory.
+        # Normalized to dicts, matches WebArena evaluate usage
+        self._tasks: List[dict] = []
+        # Task ID -> raw config of custom-suite tasks, handed to AcidwaveTask through
+        # task_kwargs so workers do not load the suite (test.raw.json is a small catalog)
+        self._task_configs: dict = {}
+        for t in iter_task_configs(task_file, task_ids=task_subset, difficulty=difficulty):
+            self._tasks.append({
+                "task_id": t["task_id"],
+                "intent": t.get("intent", ""),
+                "difficulty": t.get("difficulty", "unknown"),
+                "start_url": start_url or t.get("start_url", "http://localhost:5173"),
+                "sites": t.get("sites", []),
+                "eval": t.get("eval", {}),
+            })
+            if task_file is not None:
+                self._task_configs[t["task_id"]] = t
 
-        # Build default EnvArgs (same fields later customized in run_full_experiments.py)
-        env_args_list: List[EnvArgs] = []
-        for idx, task in enumerate(self._tasks):
-            env_args = EnvArgs(
-                task_name=f"acidwave.task_{task['task_id']}",
-                task_seed=idx,  # deterministic ordering
-                task_kwargs={
-                    "start_url": task["start_url"],
-                    "goal": task["intent"],
-                },
-                max_steps=max_steps,
-                headless=headless,
-                slow_mo=slow_mo,
-                viewport={"width": 1280, "height": 720},
-                record_video=False,
+        # Seeds follow the unsharded order, so a task runs identically in any shard
+        self._task_seeds = {task["task_id"]: idx for idx, task in enumerate(self._tasks)}
+
+        # Keep this node's shard of the selection (same partition on every node)
+        if (shard_index is None) != (num_shards is None):
+            raise ValueError("shard_index and num_shards must be given together")
+        self.shard_index = shard_index
+        self.num_shards = num_shards
+        self.schedule = schedule
+        # Task ID -> predicted seconds, from cost_history and difficulty priors
+        self.predicted_durations: dict = {}
+        if num_shards is not None or schedule == "longest_first":
+            history = load_task_history(cost_history) if cost_history else {}
+            self.predicted_durations = predict_task_durations(self._tasks, history)
+        if num_shards is not None:
+            shard = set(
+                shard_task_ids(self._task_seeds, shard_index, num_shards, self.predicted_durations)
             )
-            env_args_list.append(env_args)
-
-        # Minimal metadata for dependency graph helper (no dependencies column -> assumes none)
-        task_metadata = pd.DataFrame(
-            [
-                {
-                    "task_name": f"acidwave.task_{task['task_id']}",
-                    "task_id": task["task_id"],
-                    "difficulty": task["difficulty"],
-                    "intent": task["intent"],
-                }
-                for task in self._tasks
-            ]
-        )
+            self._tasks = [task for task in self._tasks if task["task_id"] in shard]
+            self._task_configs = {
+                task_id: config for task_id, config in self._task_configs.items() if task_id in shard
+            }
+
+        # Workers pick up experiments in list order: start the longest ones first
+        if schedule == "longest_first":
+            self._tasks = longest_first(self._tasks, self.predicted_durations)
+
+        # Settings of the default EnvArgs, built on first access of env_args_list
+        self._env_args_defaults = {
+            "max_steps": max_steps,
+            "headless": headless,
+            "slow_mo": slow_mo,
+        }
+        # AcidwaveTask options passed through task_kwargs (unset ones keep the task defaults)
+        self._task_kwargs_defaults = {
+            name: value
+            for name, value in (
+                ("ready_timeout", ready_timeout),
+                ("resource_policy", resource_policy),
+                ("storage_state", str(Path(storage_state).resolve()) if storage_state else None),
+                ("reset_hook", reset_hook),
+                ("har_mode", har_mode),
+                ("har_dir", str(Path(har_dir).resolve()) if har_dir else None),
+                ("task_file", str(task_file) if task_file else None),
+            )
+            if value is not None
+        }
+        self._env_args_list: Optional[List[EnvArgs]] = None
+        self._task_metadata: Optional[pd.DataFrame] = None
+        self._task_index: Optional[TaskIndex] = None
+        self._tasks_by_id: dict = {}
 
         # Define action space for GenericAgent (BID + chat)
         action_set_args = HighLevelActionSetArgs(
@@ -101,12 +180,86 @@ class AcidwaveBenchmark(Benchmark):
             high_level_action_set_args=action_set_args,
             is_multi_tab=False,
             supports_parallel_seeds=True,
-            env_args_list=env_args_list,
+            # None: env_args_list and task_metadata are built from self._tasks on first access
+            env_args_list=None,
             # Must be one of BrowserGym's known backends; reuse "webarena" but override prepare_backends
             backends=["webarena"],
-            task_metadata=task_metadata,
+            task_metadata=None,
         )
 
+    def __post_init__(self):
+        # Benchmark.__post_init__ would materialize env_args_list and task_metadata to
+        # cross-check them; both are derived from self._tasks here, so only check backends
+        for backend in self.backends:
+            if backend not in typing.get_args(BenchmarkBackend):
+                raise ValueError(
+                    f"Unknown Benchmark backend {repr(backend)}. Available backends: {typing.get_args(BenchmarkBackend)}"
+                )
+
+    @property
+    def env_args_list(self) -> List[EnvArgs]:
+        if self._env_args_list is None:
+            self._env_args_list = list(self.iter_env_args())
+        return self._env_args_list
+
+    @env_args_list.setter
+    def env_args_list(self, value: Optional[List[EnvArgs]]) -> None:
+        self._env_args_list = value
+
+    @property
+    def task_metadata(self) -> pd.DataFrame:
+        if self._task_metadata is None:
+            import pandas as pd
+
+            # Minimal metadata for dependency graph helper (no dependencies column -> assumes none)
+            self._task_metadata = pd.DataFrame(
+                [
+                    {
+                        "task_name": record["task_name"],
+                        "task_id": record["task_id"],
+                        "difficulty": record["difficulty"],
+                        "intent": record["intent"],
+                        "intent_template": record["intent_template"],
+                        "eval_types": ",".join(record["eval_types"]),
+                    }
+                    for record in self.task_index
+                ]
+            )
+        return self._task_metadata
+
+    @task_metadata.setter
+    def task_metadata(self, value: Optional[pd.DataFrame]) -> None:
+        self._task_metadata = value
+
+    @property
+    def task_index(self) -> TaskIndex:
+        """Metadata index of the selected tasks, in run order (see metadata.py)."""
+        if self._task_index is None:
+            self._task_index = TaskIndex(self._tasks)
+            self._tasks_by_id = {task["task_id"]: task for task in self._tasks}
+        return self._task_index
+
+    def iter_env_args(self) -> Iterator[EnvArgs]:
+        """Yield the default EnvArgs of each task without building the full list."""
+        from agentlab.experiments.loop import EnvArgs
+
+        # Same fields later customized in run_full_experiments.py
+        for task in self._tasks:
+            task_config = self._task_configs.get(task["task_id"])
+            yield EnvArgs(
+                task_name=f"acidwave.task_{task['task_id']}",
+                task_seed=self._task_seeds[task["task_id"]],  # deterministic ordering
+                task_kwargs={
+                    "start_url": task["start_url"],
+                    "goal": task["intent"],
+                    **self._task_kwargs_defaults,
+                    **({"task_config": task_config} if task_config is not None else {}),
+                },
+                viewport={"width": 1280, "height": 720},
+                record_video=False,
+                **self._env_args_defaults,
+            )
+
     def __len__(self) -> int:
         return len(self._tasks)
 
@@ -116,13 +269,19 @@ class AcidwaveBenchmark(Benchmark):
     def __getitem__(self, idx: int) -> dict:
         return self._tasks[idx]
 
+    def select_tasks(self, **criteria) -> List[dict]:
+        """
+        Return raw task dicts matching every criterion, in run order.
+
+        Criteria are ``TaskIndex.where`` filters, e.g.
+        ``select_tasks(difficulty="hard", eval_type="program_html")``.
+        """
+        records = self.task_index.select(**criteria)
+        return [self._tasks_by_id[record["task_id"]] for record in records]
+
     def get_tasks_by_difficulty(self, difficulty: str) -> List[dict]:
         """Return raw task dicts filtered by difficulty."""
-        return [
-            task
-            for task in self._tasks
-            if task["difficulty"].lower() == difficulty.lower()
-        ]
+        return self.select_tasks(difficulty=difficulty)
 
     def prepare_backends(self):
         """
@@ -0,0 +1,371 @@
+"""
+Task Catalog
+============
+
+Single, process-wide view of ``test.raw.json``.
+
+The task file is parsed once per process and indexed by ``task_id``;
+``get_task_catalog()`` hands out the same catalog until the file's mtime
+(or size) changes, in which case it is reloaded. Compiled EvalPlans are
+built on first use and cached alongside.
+
+Loading goes through a binary cache in the user cache directory
+(``$ACIDWAVE_CACHE_DIR``, default ``~/.cache/acidwave``; set it to an
+empty string to disable the cache) holding the parsed tasks and all
+compiled EvalPlans. It is keyed by a hash of the task file's content and of the
+modules plans are built from, so a fresh worker unpickles the catalog in
+milliseconds and only falls back to JSON parsing and plan compilation
+after the task file or the evaluator code changed, or when the cache
+cannot be read.
+
+``iter_task_configs`` is the streaming alternative for building task lists
+(e.g. ``AcidwaveBenchmark``) from very large suites: it parses a JSON
+array or a JSONL file incrementally and applies task-ID and difficulty
+filters while reading, so the full task list is never materialized.
+
+Example:
+    >>> catalog = get_task_catalog()
+    >>> catalog[3]["intent"]
+    'Open the album "Plastic Love" by Mise Darling'
+    >>> catalog.eval_plan(3).evaluators
+    >>> catalog.index.where(difficulty="hard", eval_type="program_html")
+"""
+
+import hashlib
+import json
+import logging
+import os
+import pickle
+import tempfile
+import threading
+from pathlib import Path
+from typing import Iterable, Iterator, Optional, Union
+
+from .eval_plan import EvalPlan, compile_eval_plan
+from .metadata import TaskIndex
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_TASK_FILE = Path(__file__).parent / "test.raw.json"
+
+# Bump when the cache layout changes
+CACHE_VERSION = 1
+
+# Directory of the binary catalog caches ("" disables caching)
+CACHE_DIR_ENV = "ACIDWAVE_CACHE_DIR"
+
+# Modules whose classes end up pickled in the cache (plans, evaluators, checks)
+_PLAN_MODULES = ("catalog.py", "eval_plan.py", "evaluators.py", "html_checks.py", "matcher.py")
+
+
+class TaskCatalog:
+    """
+    Tasks of one task file, indexed by ``task_id``.
+
+    Iterating yields the raw task configs in file order. Configs are shared
+    between all users of the catalog and must be treated as read-only.
+    """
+
+    def __init__(self, path: Union[str, Path], tasks: list[dict], stamp: tuple) -> None:
+        self.path = Path(path)
+        # (mtime_ns, size) of the file the catalog was loaded from
+        self.stamp = stamp
+        self._tasks: dict[int, dict] = {task["task_id"]: task for task in tasks}
+        self._plans: dict[int, EvalPlan] = {}
+        # Pickled plans from the binary cache, unpickled on first use
+        self._pickled_plans: dict[int, bytes] = {}
+        self._index = None
+
+    @classmethod
+    def load(cls, path: Union[str, Path] = DEFAULT_TASK_FILE, use_cache: bool = True) -> "TaskCatalog":
+        """
+        Load a task file (bypassing the process-wide catalog).
+
+        Args:
+            path: Task file
+            use_cache: Read and refresh the binary cache (see ``catalog_cache_path``)
+        """
+        stamp = file_stamp(path)
+        with open(path, 'rb') as f:
+            content = f.read()
+        cache_path = catalog_cache_path(path) if use_cache else None
+        if cache_path is None:
+            return cls(path, _parse_tasks(path, content), stamp)
+
+        key = _cache_key(content)
+        cached = _read_cache(cache_path, key)
+        if cached is not None:
+            catalog = cls(path, cached["tasks"], stamp)
+            catalog._pickled_plans = cached["plans"]
+            return catalog
+
+        catalog = cls(path, _parse_tasks(path, content), stamp)
+        # Plans are pickled one by one so a worker only pays for the tasks it runs.
+        # A task whose plan does not compile is left out of the cache: it fails in
+        # eval_plan() for that task only, not when loading the catalog.
+        plans = {}
+        for task_id in catalog.task_ids:
+            try:
+                plan = compile_eval_plan(catalog[task_id])
+            except Exception as e:
+                logger.warning(f"Task {task_id} of {Path(path).name} has an invalid eval config: {e}")
+                continue
+            catalog._plans[task_id] = plan
+            plans[task_id] = pickle.dumps(plan, protocol=pickle.HIGHEST_PROTOCOL)
+        _write_cache(cache_path, {"key": key, "tasks": list(catalog), "plans": plans})
+        return catalog
+
+    def __len__(self) -> int:
+        return len(self._tasks)
+
+    def __iter__(self) -> Iterator[dict]:
+        return iter(self._tasks.values())
+
+    def __contains__(self, task_id: int) -> bool:
+        return task_id in self._tasks
+
+    def __getitem__(self, task_id: int) -> dict:
+        return self._tasks[task_id]
+
+    def get(self, task_id: int, default: Optional[dict] = None) -> Optional[dict]:
+        return self._tasks.get(task_id, default)
+
+    @property
+    def task_ids(self) -> list[int]:
+        return list(self._tasks)
+
+    @property
+    def index(self) -> "TaskIndex":
+        """Metadata index of the catalog's tasks (built on first use)."""
+        if self._index is None:
+            self._index = TaskIndex(self)
+        return self._index
+
+    def eval_plan(self, task_id: int) -> EvalPlan:
+        """
+        Compiled EvalPlan of a task (compiled on first use).
+
+        Raises:
+            KeyError: If the task ID is not in the catalog
+        """
+        plan = self._plans.get(task_id)
+        if plan is None:
+            pickled = self._pickled_plans.pop(task_id, None)
+            if pickled is not None:
+                try:
+                    plan = pickle.loads(pickled)
+                except Exception as e:
+                    logger.debug(f"Recompiling EvalPlan of task {task_id} (unreadable cache entry): {e}")
+            if plan is None:
+                plan = compile_eval_plan(self._tasks[task_id])
+            self._plans[task_id] = plan
+        return plan
+
+
+def _parse_tasks(path: Union[str, Path], content: bytes) -> list[dict]:
+    """Task configs of a task file's content (JSON array, or JSON Lines for ``*.jsonl``)."""
+    if Path(path).suffix == ".jsonl":
+        return [json.loads(line) for line in content.decode("utf-8").splitlines() if line.strip()]
+    return json.loads(content)
+
+
+def _iter_json_array(f, chunk_size: int = 1 << 16) -> Iterator[dict]:
+    """Yield the elements of a top-level JSON array, reading ``f`` in chunks."""
+    decoder = json.JSONDecoder()
+    buf, pos, eof = "", 0, False
+    read_size = chunk_size
+    started = False
+
+    while True:
+        while pos < len(buf) and (buf[pos].isspace() or (started and buf[pos] == ",")):
+            pos += 1
+
+        if pos < len(buf):
+            if not started:
+                if buf[pos] != "[":
+                    raise ValueError(f"Task file is not a JSON array (found {buf[pos]!r})")
+                started = True
+                pos += 1
+                continue
+            if buf[pos] == "]":
+                return
+            try:
+                task, end = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+            else:
+                # A value ending at the buffer end (e.g. a number) may be cut short
+                if end < len(buf) or eof:
+                    yield task
+                    pos = end
+                    read_size = chunk_size
+                    continue
+        elif eof:
+            raise ValueError("Unterminated JSON array in task file")
+
+        # Need more input; grow reads for elements larger than a chunk
+        more = f.read(read_size)
+        read_size *= 2
+        eof = not more
+        buf = buf[pos:] + more
+        pos = 0
+
+
+def iter_task_configs(
+    path: Union[str, Path, None] = None,
+    task_ids: Optional[Iterable[int]] = None,
+    difficulty: Optional[str] = None,
+) -> Iterator[dict]:
+    """
+    Stream task configs from a task file, filtering while reading.
+
+    Supports a JSON array (``test.raw.json``) and JSON Lines (``*.jsonl``,
+    one task per line). Reading stops early once every requested task ID
+    has been seen.
+
+    Args:
+        path: Task file (default: test.raw.json next to this module)
+        task_ids: Only yield these task IDs
+        difficulty: Only yield tasks of this difficulty (case-insensitive)
+
+    Yields:
+        Raw task configs in file order
+    """
+    path = Path(path or DEFAULT_TASK_FILE)
+    wanted = set(task_ids) if task_ids is not None else None
+    difficulty = difficulty.lower() if difficulty is not None else None
+    if wanted is not None and not wanted:
+        return
+
+    with open(path, 'r', encoding='utf-8') as f:
+        if path.suffix == ".jsonl":
+            tasks = (json.loads(line) for line in f if line.strip())
+        else:
+            tasks = _iter_json_array(f)
+
+        for task in tasks:
+            if wanted is not None and task["task_id"] not in wanted:
+                continue
+            if difficulty is not None and task.get("difficulty", "unknown").lower() != difficulty:
+                continue
+            yield task
+            if wanted is not None:
+                wanted.discard(task["task_id"])
+                if not wanted:
+                    return
+
+
+def find_task_config(path: Union[str, Path, None], task_id: int) -> Optional[dict]:
+    """
+    Config of one task, streamed from a task file (None if it is not defined).
+
+    Memory use does not depend on the size of the file, and reading stops
+    at the task; used by workers resolving tasks of large suites.
+    """
+    return next(iter_task_configs(path, task_ids=(task_id,)), None)
+
+
+def file_stamp(path: Union[str, Path]) -> tuple:
+    """(mtime_ns, size) of a file, used to detect edits."""
+    stat = os.stat(path)
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def cache_dir() -> Optional[Path]:
+    """Directory of the binary catalog caches (None: caching disabled)."""
+    configured = os.environ.get(CACHE_DIR_ENV)
+    if configured is not None:
+        return Path(configured).expanduser() if configured else None
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "acidwave"
+
+
+def catalog_cache_path(path: Union[str, Path]) -> Optional[Path]:
+    """
+    Binary cache file of a task file (None: caching disabled).
+
+    ``.../test.raw.json`` -> ``<cache dir>/test.raw-<path hash>.catalog.pkl``;
+    the hash of the absolute path keeps task files of the same name apart.
+    """
+    directory = cache_dir()
+    if directory is None:
+        return None
+    path = Path(path).resolve()
+    stem = path.name[:-len(".json")] if path.name.endswith(".json") else path.name
+    path_hash = hashlib.blake2b(str(path).encode(), digest_size=4).hexdigest()
+    return directory / f"{stem}-{path_hash}.catalog.pkl"
+
+
+def _cache_key(content: bytes) -> str:
+    digest = hashlib.blake2b(content, digest_size=16)
+    digest.update(str(CACHE_VERSION).encode())
+    for name in _PLAN_MODULES:
+        digest.update((Path(__file__).parent / name).read_bytes())
+    return digest.hexdigest()
+
+
+def _read_cache(cache_path: Path, key: str) -> Optional[dict]:
+    try:
+        with open(cache_path, 'rb') as f:
+            cached = pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.debug(f"Ignoring unreadable task catalog cache {cache_path}: {e}")
+        return None
+    if (
+        not isinstance(cached, dict)
+        or cached.get("key") != key
+        or not isinstance(cached.get("tasks"), list)
+        or not isinstance(cached.get("plans"), dict)
+    ):
+        return None
+    return cached
+
+
+def _write_cache(cache_path: Path, payload: dict) -> None:
+    """Atomically write the cache; failures (e.g. read-only cache dir) are not fatal."""
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=cache_path.parent, prefix=cache_path.name, suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, cache_path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        # mkstemp creates the file as 0600
+        os.chmod(cache_path, 0o644)
+    except Exception as e:
+        logger.debug(f"Could not write task catalog cache {cache_path}: {e}")
+
+
+_catalogs: dict[Path, TaskCatalog] = {}
+_catalogs_lock = threading.Lock()
+
+
+def get_task_catalog(path: Union[str, Path, None] = None) -> TaskCatalog:
+    """
+    Return the process-wide catalog of a task file.
+
+    Args:
+        path: Task file (default: test.raw.json next to this module)
+
+    Returns:
+        Cached TaskCatalog, reloaded if the file changed since it was parsed
+    """
+    path = Path(path or DEFAULT_TASK_FILE).resolve()
+    stamp = file_stamp(path)
+    catalog = _catalogs.get(path)
+    if catalog is not None and catalog.stamp == stamp:
+        return catalog
+
+    with _catalogs_lock:
+        catalog = _catalogs.get(path)
+        if catalog is None or catalog.stamp != stamp:
+            catalog = TaskCatalog.load(path)
+            _catalogs[path] = catalog
+    return catalog
@@ -0,0 +1,298 @@
+"""
+DOM Snapshot Tree
+=================
+
+Read-only view over the CDP ``DOMSnapshot`` that BrowserGym stores as
+``obs["dom_object"]``, with enough of a selector engine to probe compiled
+``program_html`` checks without a browser.
+
+Supported selectors are the CSS subset the batched probe emits: type, ``*``,
+``.class``, ``#id`` and attribute selectors (``=``, ``*=``, ``^=``, ``$=``,
+``~=``, ``|=``, optional ``i`` flag) joined by descendant or child
+combinators, plus the ``:has-text()`` filters carried by each alternative.
+
+Approximations compared to a live page: visibility means "has a non-empty
+layout box" (computed styles are not captured), and element text is built
+from rendered text nodes, so CSS ``text-transform`` is not applied.
+"""
+
+import re
+import time
+from typing import Optional
+
+from .html_checks import probe_fields, text_hash
+
+
+ELEMENT_NODE = 1
+TEXT_NODE = 3
+
+# Subtrees whose text never shows up in textContent-based text matching
+_NON_TEXT_TAGS = {"SCRIPT", "STYLE", "NOSCRIPT", "TEMPLATE", "HEAD"}
+
+# Elements that start a new line in innerText
+_BLOCK_TAGS = {
+    "ADDRESS", "ARTICLE", "ASIDE", "BLOCKQUOTE", "BR", "DD", "DETAILS", "DIALOG",
+    "DIV", "DL", "DT", "FIELDSET", "FIGCAPTION", "FIGURE", "FOOTER", "FORM",
+    "H1", "H2", "H3", "H4", "H5", "H6", "HEADER", "HR", "LI", "MAIN", "NAV",
+    "OL", "P", "PRE", "SECTION", "SUMMARY", "TABLE", "TR", "UL",
+}
+
+_COMPOUND_TOKEN = re.compile(
+    r"""(?P<type>\*|[a-zA-Z][\w-]*)"""
+    r"""|\.(?P<cls>-?[_a-zA-Z][\w-]*)"""
+    r"""|\#(?P<id>[\w-]+)"""
+    r"""|\[\s*(?P<attr>[\w:-]+)\s*(?:(?P<op>[*^$~|]?=)\s*"""
+    r"""(?:"(?P<dq>[^"]*)"|'(?P<sq>[^']*)'|(?P<bare>[\w-]+))\s*(?P<flag>[iIsS])?\s*)?\]"""
+)
+_COMBINATOR = re.compile(r"\s*>\s*|\s+")
+
+
+def _parse_compound(text: str) -> list[tuple]:
+    """Parse one compound selector into ``(kind, ...)`` conditions."""
+    conditions = []
+    pos = 0
+    while pos < len(text):
+        match = _COMPOUND_TOKEN.match(text, pos)
+        if match is None or (match.group("type") and pos != 0):
+            raise ValueError(f"Unsupported selector syntax for offline probing: {text[pos:]!r}")
+        if match.group("type"):
+            if match.group("type") != "*":
+                conditions.append(("type", match.group("type").upper()))
+        elif match.group("cls"):
+            conditions.append(("class", match.group("cls")))
+        elif match.group("id"):
+            conditions.append(("attr", "id", "=", match.group("id"), False))
+        else:
+            value = next(
+                (v for v in (match.group("dq"), match.group("sq"), match.group("bare")) if v is not None),
+                None,
+            )
+            ignore_case = (match.group("flag") or "").lower() == "i"
+            conditions.append(("attr", match.group("attr").lower(), match.group("op"), value, ignore_case))
+        pos = match.end()
+    return conditions
+
+
+def parse_selector(css: str) -> list[tuple[str, list[tuple]]]:
+    """
+    Parse a complex selector into ``[(combinator, conditions), ...]``.
+
+    The first entry's combinator is empty; later ones are ``" "`` or ``">"``.
+
+    Raises:
+        ValueError: If the selector is outside the supported subset
+    """
+    css = css.strip()
+    parts = []
+    combinator = ""
+    pos = 0
+    for match in _COMBINATOR.finditer(css):
+        # Combinator-looking whitespace inside [...] belongs to the compound
+        if css.count("[", 0, match.start()) != css.count("]", 0, match.start()):
+            continue
+        parts.append((combinator, css[pos:match.start()]))
+        combinator = ">" if ">" in match.group() else " "
+        pos = match.end()
+    parts.append((combinator, css[pos:]))
+    if any(not text for _, text in parts):
+        raise ValueError(f"Unsupported selector syntax for offline probing: {css!r}")
+    return [(comb, _parse_compound(text)) for comb, text in parts]
+
+
+def _match_attr(actual: Optional[str], op: Optional[str], expected: Optional[str], ignore_case: bool) -> bool:
+    if actual is None:
+        return False
+    if op is None:
+        return True
+    if ignore_case:
+        actual, expected = actual.lower(), expected.lower()
+    if op == "=":
+        return actual == expected
+    if op == "*=":
+        return bool(expected) and expected in actual
+    if op == "^=":
+        return bool(expected) and actual.startswith(expected)
+    if op == "$=":
+        return bool(expected) and actual.endswith(expected)
+    if op == "~=":
+        return expected in actual.split()
+    if op == "|=":
+        return actual == expected or actual.startswith(expected + "-")
+    return False
+
+
+class DomSnapshotTree:
+    """Element tree of the main document in a CDP DOMSnapshot."""
+
+    def __init__(self, dom_object: dict) -> None:
+        self.strings = dom_object["strings"]
+        document = dom_object["documents"][0]
+        nodes = document["nodes"]
+        self.parent = nodes["parentIndex"]
+        self.node_type = nodes["nodeType"]
+        self.node_name = nodes["nodeName"]
+        self.node_value = nodes["nodeValue"]
+        self._raw_attributes = nodes["attributes"]
+
+        self.children: list[list[int]] = [[] for _ in self.parent]
+        for idx, parent in enumerate(self.parent):
+            if parent >= 0:
+                self.children[parent].append(idx)
+
+        layout = document.get("layout", {})
+        self.bounds = dict(zip(layout.get("nodeIndex", []), layout.get("bounds", [])))
+
+        self._attributes: dict[int, dict[str, str]] = {}
+        self._text_content: dict[int, str] = {}
+
+    def _string(self, index: int) -> str:
+        return self.strings[index] if index >= 0 else ""
+
+    def tag(self, idx: int) -> str:
+        return self._string(self.node_name[idx]).upper()
+
+    def attributes(self, idx: int) -> dict[str, str]:
+        attrs = self._attributes.get(idx)
+        if attrs is None:
+            raw = self._raw_attributes[idx]
+            attrs = {
+                self._string(raw[i]).lower(): self._string(raw[i + 1])
+                for i in range(0, len(raw) - 1, 2)
+            }
+            self._attributes[idx] = attrs
+        return attrs
+
+    def elements(self):
+        """Element node indices in document order."""
+        return (idx for idx, node_type in enumerate(self.node_type) if node_type == ELEMENT_NODE)
+
+    def find_body(self) -> Optional[int]:
+        return next((idx for idx in self.elements() if self.tag(idx) == "BODY"), None)
+
+    def is_visible(self, idx: int) -> bool:
+        box = self.bounds.get(idx)
+        return bool(box) and box[2] > 0 and box[3] > 0
+
+    def text_content(self, idx: int) -> str:
+        """Concatenated descendant text, like ``Node.textContent`` (memoized)."""
+        cached = self._text_content.get(idx)
+        if cached is None:
+            if self.node_type[idx] == TEXT_NODE:
+                cached = self._string(self.node_value[idx])
+            elif self.tag(idx) in _NON_TEXT_TAGS:
+                cached = ""
+            else:
+                cached = "".join(self.text_content(child) for child in self.children[idx])
+            self._text_content[idx] = cached
+        return cached
+
+    def inner_text(self, idx: int) -> str:
+        """Rendered text of a subtree, approximating ``HTMLElement.innerText``."""
+        pieces = []
+        stack = [(idx, False)]
+        while stack:
+            node, leaving = stack.pop()
+            if self.node_type[node] == TEXT_NODE:
+                # Only text nodes with a layout box are rendered
+                if node in self.bounds:
+                    pieces.append(" ".join(self._string(self.node_value[node]).split()))
+                continue
+            if self.node_type[node] != ELEMENT_NODE:
+                stack.extend((child, False) for child in reversed(self.children[node]))
+                continue
+            tag = self.tag(node)
+            if tag in _NON_TEXT_TAGS:
+                continue
+            if tag in _BLOCK_TAGS:
+                pieces.append("\n")
+                if not leaving:
+                    stack.append((node, True))
+            if not leaving:
+                stack.extend((child, False) for child in reversed(self.children[node]))
+        text = re.sub(r" *\n[\n ]*", "\n", "".join(pieces))
+        return text.strip()
+
+    def _matches_compound(self, idx: int, conditions: list[tuple]) -> bool:
+        if self.node_type[idx] != ELEMENT_NODE:
+            return False
+        for condition in conditions:
+            kind = condition[0]
+            if kind == "type":
+                if self.tag(idx) != condition[1]:
+                    return False
+            elif kind == "class":
+                if condition[1] not in self.attributes(idx).get("class", "").split():
+                    return False
+            else:
+                _, name, op, expected, ignore_case = condition
+                if not _match_attr(self.attributes(idx).get(name), op, expected, ignore_case):
+                    return False
+        return True
+
+    def _matches(self, idx: int, parts: list[tuple[str, list[tuple]]], last: int) -> bool:
+        combinator, conditions = parts[last]
+        if not self._matches_compound(idx, conditions):
+            return False
+        if last == 0:
+            return True
+        parent = self.parent[idx]
+        if combinator == ">":
+            return parent >= 0 and self._matches(parent, parts, last - 1)
+        while parent >= 0:
+            if self._matches(parent, parts, last - 1):
+                return True
+            parent = self.parent[parent]
+        return False
+
+    def select(self, css: str) -> list[int]:
+        """Element indices matching a supported CSS selector, in document order."""
+        parts = parse_selector(css)
+        return [idx for idx in self.elements() if self._matches(idx, parts, len(parts) - 1)]
+
+
+def probe_checks_offline(tree: DomSnapshotTree, checks) -> list[dict]:
+    """
+    Probe compiled ``HtmlCheck`` objects against a stored DOM snapshot.
+
+    Mirrors the batched in-page probe: same alternatives, text filters and
+    first-match-in-document-order semantics.
+
+    Returns:
+        One probe dict per check, ``{"error": msg}`` where the locator cannot
+        be resolved offline
+    """
+    probes = []
+    for check in checks:
+        start = time.perf_counter()
+        probe = _probe_check(tree, check)
+        probe["elapsed_ms"] = (time.perf_counter() - start) * 1000
+        probes.append(probe)
+    return probes
+
+
+def _probe_check(tree: DomSnapshotTree, check) -> dict:
+    if check.alternatives is None:
+        return {"error": f"Locator needs Playwright's selector engine: {check.locator}"}
+    try:
+        matched = set()
+        for alt in check.alternatives:
+            for idx in tree.select(alt["css"]):
+                text = " ".join(tree.text_content(idx).split()).lower() if alt["texts"] else ""
+                if all(t in text for t in alt["texts"]):
+                    matched.add(idx)
+    except ValueError as e:
+        return {"error": str(e)}
+
+    probe = {"count": len(matched)}
+    if matched:
+        first = min(matched)
+        fields = probe_fields(check)
+        if fields["visible"]:
+            probe["visible"] = tree.is_visible(first)
+        if fields["attribute"]:
+            probe["attribute"] = tree.attributes(first).get(fields["attribute"].lower())
+        if fields["text"]:
+            probe["text"] = tree.inner_text(first)
+        if fields["text_hash"]:
+            probe["text_hash"] = text_hash(tree.inner_text(first))
+    return probe
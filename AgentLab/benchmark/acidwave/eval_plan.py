@@ -0,0 +1,86 @@
+"""
+Evaluation Plans
+================
+
+Compiled, immutable form of a task's ``eval`` block from test.raw.json.
+
+``compile_eval_plan`` does all config interpretation once per task: it
+compiles one registered evaluator per eval type (regex compilation, string
+normalization, check classification) and orders them cheapest first, so
+``AcidwaveTask.validate`` only executes the plan.
+"""
+
+import logging
+from dataclasses import dataclass
+
+from .evaluators import EVALUATORS, Evaluator
+from .html_checks import HtmlCheck
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class EvalPlan:
+    """
+    Everything ``validate`` needs to score a task.
+
+    Attributes:
+        eval_types: Raw eval types from the config
+        evaluators: Evaluators whose scores are min-aggregated, cheapest first
+    """
+
+    eval_types: tuple[str, ...]
+    evaluators: tuple[Evaluator, ...] = ()
+
+    @property
+    def uses_heuristic(self) -> bool:
+        """No evaluator applies, so validate falls back to goal keywords."""
+        return not self.evaluators
+
+    @property
+    def needs_page_text(self) -> bool:
+        return self.uses_heuristic or any(evaluator.needs_text for evaluator in self.evaluators)
+
+    @property
+    def html_checks(self) -> tuple[HtmlCheck, ...]:
+        """All program_html checks probed by the plan's evaluators."""
+        return tuple(check for evaluator in self.evaluators for check in evaluator.html_checks)
+
+    @property
+    def text_changed_checks(self) -> tuple[HtmlCheck, ...]:
+        """Checks that compare an element's text with its state at setup."""
+        return tuple(check for check in self.html_checks if check.kind == "text_changed")
+
+
+def compile_eval_plan(task_config: dict) -> EvalPlan:
+    """
+    Compile a task config's ``eval`` block.
+
+    Eval types without a registered evaluator (e.g. ``element_state``, which
+    program_html covers) do not contribute to the score.
+
+    Args:
+        task_config: Task entry from test.raw.json
+
+    Returns:
+        Immutable EvalPlan
+
+    Raises:
+        re.error: If the url_match pattern is not a valid regex
+    """
+    eval_config = task_config.get("eval", {})
+    eval_types = tuple(eval_config.get("eval_types", []))
+
+    evaluators = []
+    for eval_type in dict.fromkeys(eval_types):
+        evaluator_cls = EVALUATORS.get(eval_type)
+        if evaluator_cls is None:
+            logger.debug(f"No evaluator registered for eval type '{eval_type}'")
+            continue
+        evaluator = evaluator_cls.from_config(eval_config)
+        if evaluator is not None:
+            evaluators.append(evaluator)
+
+    # Stable sort: equal-cost evaluators keep their config order
+    evaluators.sort(key=lambda evaluator: evaluator.cost)
+    return EvalPlan(eval_types=eval_types, evaluators=tuple(evaluators))
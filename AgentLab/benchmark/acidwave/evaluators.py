@@ -0,0 +1,354 @@
+"""
+Evaluators
+==========
+
+One evaluator class per ``eval_types`` entry of test.raw.json, looked up in
+a registry, so a new check type is added by registering a class rather
+than by editing ``validate``:
+
+    >>> @register_evaluator
+    ... @dataclass(frozen=True)
+    ... class TitleMatchEvaluator(Evaluator):
+    ...     eval_type: ClassVar[str] = "title_match"
+    ...     cost: ClassVar[int] = 1
+    ...     title: str
+    ...
+    ...     @classmethod
+    ...     def from_config(cls, eval_config):
+    ...         return cls(eval_config["reference_answers"]["title"])
+    ...
+    ...     def evaluate(self, state, ctx):
+    ...         ...
+
+Evaluators are compiled once per task (``from_config``) and hold their
+pre-processed config. Each scores a page state in [0, 1]; the task reward is
+the minimum over all evaluators.
+"""
+
+import logging
+import re
+from dataclasses import dataclass, field
+from typing import ClassVar, Optional
+
+from .html_checks import HtmlCheck, compile_html_check
+from .matcher import MultiPatternMatcher
+
+logger = logging.getLogger(__name__)
+
+
+# Partial credit for string_match when not every condition holds
+STRING_MATCH_WEIGHTS = {"exact": 0.4, "include": 0.4, "exclude": 0.2}
+
+# program_html pass-rate policy: full pass -> 1.0, otherwise rate * factor
+HTML_HIGH_PASS_RATE = 0.8
+HTML_HIGH_PASS_FACTOR = 0.85
+HTML_LOW_PASS_FACTOR = 0.6
+
+
+@dataclass
+class EvalContext:
+    """Per-validation state shared by the evaluators of a task."""
+
+    checks_passed: list[str] = field(default_factory=list)
+    checks_failed: list[str] = field(default_factory=list)
+    # Setup-time text hashes for text_changed checks, keyed by locator
+    text_baselines: Optional[dict[str, Optional[int]]] = None
+    # {"locator", "kind", "ms"} per program_html check, in probe order
+    check_timings: list[dict] = field(default_factory=list)
+
+
+class Evaluator:
+    """
+    Base class of evaluators.
+
+    Subclasses set ``eval_type`` (the config name they handle) and ``cost``
+    (relative price of the page access they need: 0 = nothing beyond the URL,
+    1 = body text, 2 = element probes). Cheaper evaluators run first, so an
+    expensive one can be skipped once the reward is already decided.
+    """
+
+    eval_type: ClassVar[str] = ""
+    cost: ClassVar[int] = 0
+    # Whether evaluate() reads state.text
+    needs_text: ClassVar[bool] = False
+
+    @classmethod
+    def from_config(cls, eval_config: dict) -> Optional["Evaluator"]:
+        """Compile the evaluator from a task's ``eval`` block (None if it does not apply)."""
+        raise NotImplementedError
+
+    @property
+    def html_checks(self) -> tuple[HtmlCheck, ...]:
+        """program_html checks this evaluator probes."""
+        return ()
+
+    def evaluate(self, state, ctx: EvalContext) -> float:
+        """Score the page state in [0, 1], recording outcomes in ``ctx``."""
+        raise NotImplementedError
+
+
+# eval_type -> evaluator class
+EVALUATORS: dict[str, type[Evaluator]] = {}
+
+
+def register_evaluator(cls: type[Evaluator]) -> type[Evaluator]:
+    """Class decorator adding an evaluator to the registry under its ``eval_type``."""
+    if not cls.eval_type:
+        raise ValueError(f"{cls.__name__} does not define an eval_type")
+    EVALUATORS[cls.eval_type] = cls
+    return cls
+
+
+@register_evaluator
+@dataclass(frozen=True)
+class UrlMatchEvaluator(Evaluator):
+    """Compare the page URL with a regex (``url_pattern``) or an exact URL."""
+
+    eval_type: ClassVar[str] = "url_match"
+    cost: ClassVar[int] = 0
+
+    pattern: Optional[re.Pattern] = None
+    exact_url: str = ""
+
+    @classmethod
+    def from_config(cls, eval_config: dict) -> "UrlMatchEvaluator":
+        """
+        Raises:
+            re.error: If the url_pattern is not a valid regex
+        """
+        reference = eval_config.get("reference_answers", {})
+        # Support both url_pattern (regex) and exact_match (exact URL)
+        url_pattern = reference.get("url_pattern", "")
+        return cls(
+            pattern=re.compile(url_pattern) if url_pattern else None,
+            exact_url=reference.get("exact_match", ""),
+        )
+
+    def evaluate(self, state, ctx: EvalContext) -> float:
+        if self.pattern is not None:
+            # Use regex pattern matching
+            if self.pattern.search(state.url):
+                ctx.checks_passed.append(f"URL matches pattern: {self.pattern.pattern}")
+                return 1.0
+            ctx.checks_failed.append(
+                f"URL doesn't match pattern: {self.pattern.pattern} (got: {state.url})"
+            )
+            return 0.0
+        if self.exact_url:
+            # Use exact URL matching
+            if state.url == self.exact_url:
+                ctx.checks_passed.append(f"URL matches exactly: {self.exact_url}")
+                return 1.0
+            ctx.checks_failed.append(
+                f"URL doesn't match: expected '{self.exact_url}', got '{state.url}'"
+            )
+            return 0.0
+        ctx.checks_failed.append("No URL pattern or exact match specified in eval config")
+        return 0.0
+
+
+@register_evaluator
+@dataclass(frozen=True)
+class StringMatchEvaluator(Evaluator):
+    """Look for exact / required / excluded strings in the page body text."""
+
+    eval_type: ClassVar[str] = "string_match"
+    cost: ClassVar[int] = 1
+    needs_text: ClassVar[bool] = True
+
+    exact_match: str
+    must_include: tuple[str, ...]
+    must_exclude: tuple[str, ...]
+    case_insensitive: bool
+    # Finds exact_match, must_include and must_exclude terms in one call
+    matcher: MultiPatternMatcher
+
+    @classmethod
+    def from_config(cls, eval_config: dict) -> "StringMatchEvaluator":
+        reference = eval_config.get("reference_answers", {})
+        exact_match = reference.get("exact_match", "")
+        must_include = tuple(reference.get("must_include", []))
+        must_exclude = tuple(reference.get("must_exclude", []))
+        case_insensitive = bool(reference.get("case_insensitive", False))
+        return cls(
+            exact_match=exact_match,
+            must_include=must_include,
+            must_exclude=must_exclude,
+            case_insensitive=case_insensitive,
+            matcher=MultiPatternMatcher(
+                (exact_match, *must_include, *must_exclude),
+                case_insensitive=case_insensitive,
+            ),
+        )
+
+    def evaluate(self, state, ctx: EvalContext) -> float:
+        found_terms = self.matcher.find(state.text)
+
+        # Check exact match
+        exact_found = True
+        if self.exact_match:
+            exact_found = self.exact_match in found_terms
+            if exact_found:
+                ctx.checks_passed.append(f"Found exact: '{self.exact_match}'")
+            else:
+                ctx.checks_failed.append(f"Missing exact: '{self.exact_match}'")
+
+        # Check must include
+        all_includes = True
+        for term in self.must_include:
+            if term in found_terms:
+                ctx.checks_passed.append(f"Found required: '{term}'")
+            else:
+                ctx.checks_failed.append(f"Missing required: '{term}'")
+                all_includes = False
+
+        # Check must exclude
+        no_excludes = True
+        for term in self.must_exclude:
+            if term not in found_terms:
+                ctx.checks_passed.append(f"Correctly excluded: '{term}'")
+            else:
+                ctx.checks_failed.append(f"Found excluded term: '{term}'")
+                no_excludes = False
+
+        if exact_found and all_includes and no_excludes:
+            return 1.0
+
+        # Partial credit
+        partial_score = 0.0
+        if exact_found:
+            partial_score += STRING_MATCH_WEIGHTS["exact"]
+        if all_includes:
+            partial_score += STRING_MATCH_WEIGHTS["include"]
+        if no_excludes:
+            partial_score += STRING_MATCH_WEIGHTS["exclude"]
+        return partial_score
+
+
+def score_html_check(check: HtmlCheck, probe: dict, ctx: EvalContext) -> bool:
+    """Score one program_html check from its probe, recording the outcome."""
+    locator_str = check.locator
+    checks_passed, checks_failed = ctx.checks_passed, ctx.checks_failed
+    try:
+        if "error" in probe:
+            raise RuntimeError(probe["error"])
+
+        if probe["count"] == 0:
+            checks_failed.append(f"Element not found: {locator_str}")
+            return False
+
+        # Check 1: Visibility state
+        if check.kind == "visible":
+            if probe["visible"]:
+                checks_passed.append(f"Element visible: {locator_str}")
+                return True
+            checks_failed.append(f"Element not visible: {locator_str}")
+            return False
+
+        # Check 2: Element attribute contains required content
+        if check.kind == "attribute_contains":
+            attr_value = probe["attribute"]
+            if attr_value and check.required_contents_lower in attr_value.lower():
+                checks_passed.append(
+                    f"Attribute '{check.attribute}' contains '{check.required_contents}'"
+                )
+                return True
+            checks_failed.append(
+                f"Attribute '{check.attribute}' missing '{check.required_contents}' (got: {attr_value})"
+            )
+            return False
+
+        # Check 2b: Element attribute in range
+        if check.kind == "attribute_range":
+            attr_value = probe["attribute"]
+            try:
+                value = float(attr_value or 0)
+            except ValueError:
+                checks_failed.append(
+                    f"Attribute '{check.attribute}' not numeric: {attr_value}"
+                )
+                return False
+            min_val, max_val = check.required_range
+            if min_val <= value <= max_val:
+                checks_passed.append(
+                    f"Attribute '{check.attribute}' in range [{min_val}, {max_val}]: {value}"
+                )
+                return True
+            checks_failed.append(
+                f"Attribute '{check.attribute}' out of range (got: {value})"
+            )
+            return False
+
+        # Check 3: Element text content
+        if check.kind == "text_contains":
+            text_content = probe["text"]
+            if check.required_contents_lower in text_content.lower():
+                checks_passed.append(f"Element contains: '{check.required_contents}'")
+                return True
+            checks_failed.append(
+                f"Element missing text: '{check.required_contents}' (got: {text_content[:50]})"
+            )
+            return False
+
+        # Check 4: Element text changed since setup (for dynamic content)
+        if check.kind == "text_changed":
+            baselines = ctx.text_baselines
+            if baselines is None or locator_str not in baselines:
+                checks_failed.append(f"No baseline recorded for: {locator_str}")
+                return False
+            if probe["text_hash"] != baselines[locator_str]:
+                checks_passed.append(f"Element text changed: {locator_str}")
+                return True
+            checks_failed.append(f"Element text unchanged: {locator_str}")
+            return False
+
+        # Default: element exists
+        checks_passed.append(f"Element exists: {locator_str}")
+        return True
+
+    except Exception as e:
+        logger.warning(f"Error checking element '{locator_str}': {e}")
+        checks_failed.append(f"Error checking: {locator_str}")
+        return False
+
+
+@register_evaluator
+@dataclass(frozen=True)
+class ProgramHtmlEvaluator(Evaluator):
+    """Check elements of the page (existence, visibility, attributes, text)."""
+
+    eval_type: ClassVar[str] = "program_html"
+    cost: ClassVar[int] = 2
+
+    checks: tuple[HtmlCheck, ...]
+
+    @classmethod
+    def from_config(cls, eval_config: dict) -> Optional["ProgramHtmlEvaluator"]:
+        program_html = eval_config.get("program_html", None) or []
+        if not program_html:
+            return None
+        return cls(checks=tuple(compile_html_check(c) for c in program_html))
+
+    @property
+    def html_checks(self) -> tuple[HtmlCheck, ...]:
+        return self.checks
+
+    def evaluate(self, state, ctx: EvalContext) -> float:
+        probes = state.probe_html_checks(self.checks)
+        html_checks = []
+        for check, probe in zip(self.checks, probes):
+            html_checks.append(score_html_check(check, probe, ctx))
+            ctx.check_timings.append(
+                {"locator": check.locator, "kind": check.kind, "ms": probe.get("elapsed_ms")}
+            )
+
+        # Calculate HTML check score
+        html_success_rate = sum(html_checks) / len(html_checks)
+        if html_success_rate == 1.0:
+            # 所有HTML检查都通过
+            return 1.0
+        if html_success_rate >= HTML_HIGH_PASS_RATE:
+            # 大部分通过，给予较高分数但不算完全成功
+            return html_success_rate * HTML_HIGH_PASS_FACTOR
+        # 通过率低，给予较低分数
+        return html_success_rate * HTML_LOW_PASS_FACTOR
@@ -0,0 +1,77 @@
+"""
+HAR Record / Replay
+===================
+
+Serves the Acidwave API from HAR files, so runs do not depend on the
+deployed backend (and its Supabase database) being reachable or fast.
+
+- ``record``: ``AcidwaveTask.setup`` routes the page's API traffic through
+  Playwright's HAR recorder; the task's HAR file is written when BrowserGym
+  closes the episode's context.
+- ``replay``: API requests are answered from the task's HAR file by an
+  in-process route handler. Requests missing from the HAR are aborted rather
+  than sent, so a replayed run never reaches the network for the API.
+
+One HAR file per task (``<har_dir>/acidwave.task_<id>.har``), since every
+episode runs in its own browser context. Matching is by URL and method (and
+body for POST), so a replayed episode sees what the recorded one saw; an
+agent that deviates from the recording gets aborted API calls instead.
+
+Example:
+    $ python experiments/run_full_experiments.py --har-record hars/
+    $ python experiments/run_full_experiments.py --har-replay hars/
+"""
+
+import json
+import logging
+from pathlib import Path
+from typing import Union
+
+from .metadata import task_name
+
+logger = logging.getLogger(__name__)
+
+
+HAR_MODES = ("record", "replay")
+
+# Requests recorded / replayed ("**/*" also covers the frontend's own files)
+DEFAULT_HAR_URL = "**/api/**"
+
+
+def task_har_path(har_dir: Union[str, Path], task_id: int) -> Path:
+    """HAR file of a task in ``har_dir``."""
+    return Path(har_dir) / f"{task_name(task_id)}.har"
+
+
+def install_har(page, mode: str, har_path: Union[str, Path], url: str = DEFAULT_HAR_URL) -> None:
+    """
+    Record ``url`` requests of ``page`` to, or replay them from, ``har_path``.
+
+    Raises:
+        ValueError: If mode is unknown
+        FileNotFoundError: If replaying and the HAR file does not exist
+    """
+    har_path = Path(har_path)
+    if mode == "record":
+        har_path.parent.mkdir(parents=True, exist_ok=True)
+        # Written when the context closes; embedded bodies keep one file per task
+        page.route_from_har(har_path, url=url, update=True, update_content="embed", update_mode="minimal")
+    elif mode == "replay":
+        if not har_path.exists():
+            raise FileNotFoundError(f"No recorded HAR for replay: {har_path}")
+        page.route_from_har(har_path, url=url, not_found="abort")
+    else:
+        raise ValueError(f"Unknown HAR mode '{mode}', expected one of {HAR_MODES}")
+    logger.info(f"HAR {mode}: {url} <-> {har_path}")
+
+
+def har_summary(har_dir: Union[str, Path]) -> dict[str, int]:
+    """Number of recorded entries of each HAR file in ``har_dir``."""
+    summary = {}
+    for har_path in sorted(Path(har_dir).glob("*.har")):
+        try:
+            with open(har_path, 'r', encoding='utf-8') as f:
+                summary[har_path.stem] = len(json.load(f)["log"]["entries"])
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Unreadable HAR file {har_path}: {e}")
+    return summary
@@ -0,0 +1,337 @@
+"""
+Program HTML Checks
+===================
+
+Compiled ``program_html`` checks, and probing the page for the facts they
+are scored on (match count, visibility, attribute value, inner text or a
+hash of it).
+
+Two probing strategies produce the same probe dicts:
+
+- batched: every locator is translated into plain CSS plus the
+  ``:has-text()`` filters Playwright layers on top of it, and all checks of
+  a task are resolved by a single ``page.evaluate`` roundtrip.
+- locator: one Playwright locator per check (``count()``, ``.first``,
+  ``is_visible()``, ...), used for selectors that only Playwright's own
+  engine understands or when the batched call fails.
+"""
+
+import logging
+import re
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+HTML_EVAL_MODES = ("batched", "locator")
+
+# Kinds of program_html checks, in the order a check config is classified
+HTML_CHECK_KINDS = (
+    "visible",
+    "attribute_contains",
+    "attribute_range",
+    "text_contains",
+    "text_changed",
+    "exists",
+)
+
+# Playwright selector features that have no CSS equivalent. Locators using
+# any of them are probed through the locator API instead.
+_PLAYWRIGHT_ONLY_SYNTAX = re.compile(
+    r">>|^\s*(?:text|xpath|css|id|role|data-testid|internal:[\w-]+)=|^\s*//"
+    r"|:(?:has-text|has-not-text|text|text-is|text-matches|nth-match|"
+    r"left-of|right-of|above|below|near)\(|:visible\b"
+)
+
+_HAS_TEXT = re.compile(r""":has-text\(\s*(?P<quote>["'])(?P<text>(?:\\.|(?!(?P=quote)).)*)(?P=quote)\s*\)""")
+_BRACKETED = re.compile(r"\[[^\]]*\]|\([^)]*\)")
+_COMBINATOR = re.compile(r"[\s>+~]")
+
+
+BATCH_PROBE_JS = """
+(checks) => {
+    const norm = (s) => (s || "").replace(/\\s+/g, " ").trim().toLowerCase();
+    // Same rule as Playwright: non-empty bounding box and not visibility:hidden
+    const isVisible = (el) => {
+        const rect = el.getBoundingClientRect();
+        if (!rect.width || !rect.height) return false;
+        return window.getComputedStyle(el).visibility !== "hidden";
+    };
+    // 32-bit FNV-1a over UTF-16 code units, identical to text_hash() in Python
+    const fnv1a = (s) => {
+        let h = 0x811c9dc5;
+        for (let i = 0; i < s.length; i++) {
+            h ^= s.charCodeAt(i);
+            h = Math.imul(h, 0x01000193);
+        }
+        return h >>> 0;
+    };
+    const byDocumentOrder = (a, b) =>
+        a === b ? 0 : (a.compareDocumentPosition(b) & Node.DOCUMENT_POSITION_FOLLOWING ? -1 : 1);
+
+    const probe = (check) => {
+        const matched = [];
+        try {
+            const seen = new Set();
+            for (const alt of check.alternatives) {
+                for (const el of document.querySelectorAll(alt.css)) {
+                    if (seen.has(el)) continue;
+                    const text = alt.texts.length ? norm(el.textContent) : "";
+                    if (alt.texts.every((t) => text.includes(t))) {
+                        seen.add(el);
+                        matched.push(el);
+                    }
+                }
+            }
+        } catch (e) {
+            return {error: String(e)};
+        }
+        if (check.alternatives.length > 1) matched.sort(byDocumentOrder);
+
+        const result = {count: matched.length};
+        if (!matched.length) return result;
+        const el = matched[0];
+        if (check.visible) result.visible = isVisible(el);
+        if (check.attribute) result.attribute = el.getAttribute(check.attribute);
+        if (check.text) result.text = el.innerText;
+        if (check.text_hash) result.text_hash = fnv1a(el.innerText);
+        return result;
+    };
+
+    return checks.map((check) => {
+        const start = performance.now();
+        const result = probe(check);
+        result.elapsed_ms = performance.now() - start;
+        return result;
+    });
+}
+"""
+
+
+def split_selector_list(selector: str) -> list[str]:
+    """Split a selector on top-level commas (ignoring quotes, brackets, parens)."""
+    parts = []
+    depth = 0
+    quote = None
+    start = 0
+    i = 0
+    while i < len(selector):
+        ch = selector[i]
+        if quote:
+            if ch == "\\":
+                i += 1
+            elif ch == quote:
+                quote = None
+        elif ch in "\"'":
+            quote = ch
+        elif ch in "([":
+            depth += 1
+        elif ch in ")]":
+            depth -= 1
+        elif ch == "," and depth == 0:
+            parts.append(selector[start:i].strip())
+            start = i + 1
+        i += 1
+    parts.append(selector[start:].strip())
+    return [part for part in parts if part]
+
+
+def _paren_depth(selector: str, end: int) -> int:
+    """Parenthesis nesting depth at ``selector[end]`` (ignoring quoted text)."""
+    depth = 0
+    quote = None
+    i = 0
+    while i < end:
+        ch = selector[i]
+        if quote:
+            if ch == "\\":
+                i += 1
+            elif ch == quote:
+                quote = None
+        elif ch in "\"'":
+            quote = ch
+        elif ch == "(":
+            depth += 1
+        elif ch == ")":
+            depth -= 1
+        i += 1
+    return depth
+
+
+def _normalize_text(text: str) -> str:
+    return " ".join(text.split()).lower()
+
+
+def compile_locator(locator: str) -> Optional[list[dict]]:
+    """
+    Translate a Playwright locator into CSS alternatives with text filters.
+
+    Args:
+        locator: Selector string from a ``program_html`` check
+
+    Returns:
+        List of ``{"css": str, "texts": list[str]}`` alternatives (one per
+        comma-separated selector), or None if the locator uses Playwright
+        syntax that cannot be expressed in CSS.
+    """
+    alternatives = []
+    for part in split_selector_list(locator):
+        texts = []
+        for match in _HAS_TEXT.finditer(part):
+            # Text filters only translate when they apply to the subject element:
+            # not inside :has() / :not() / :is() arguments, nor before a combinator
+            if _paren_depth(part, match.start()) > 0:
+                return None
+            if _COMBINATOR.search(_BRACKETED.sub("", part[match.end():])):
+                return None
+            texts.append(_normalize_text(re.sub(r"\\(.)", r"\1", match.group("text"))))
+
+        css = _HAS_TEXT.sub("", part).strip()
+        if _PLAYWRIGHT_ONLY_SYNTAX.search(css):
+            return None
+        if not css:
+            css = "*"
+        alternatives.append({"css": css, "texts": texts})
+    return alternatives or None
+
+
+@dataclass(frozen=True)
+class HtmlCheck:
+    """A single classified program_html check."""
+
+    locator: str
+    kind: str
+    attribute: Optional[str] = None
+    required_contents: Optional[str] = None
+    required_contents_lower: Optional[str] = None
+    required_range: Optional[tuple[float, float]] = None
+    # CSS alternatives for batched probing, None if only Playwright can resolve it
+    alternatives: Optional[tuple[dict, ...]] = None
+
+
+def compile_html_check(check_config: dict) -> HtmlCheck:
+    """Classify a program_html check config and pre-normalize its values."""
+    locator = check_config.get("locator", "")
+    required_state = check_config.get("required_state", None)
+    required_contents = check_config.get("required_contents", None)
+    attribute = check_config.get("attribute", None)
+    required_range = check_config.get("required_range", None)
+
+    if required_state == "visible":
+        kind = "visible"
+    elif attribute and required_contents:
+        kind = "attribute_contains"
+    elif attribute and required_range:
+        kind = "attribute_range"
+    elif required_contents and not attribute:
+        kind = "text_contains"
+    elif check_config.get("check", None) == "text_changed":
+        kind = "text_changed"
+    else:
+        kind = "exists"
+
+    alternatives = compile_locator(locator)
+    return HtmlCheck(
+        locator=locator,
+        kind=kind,
+        attribute=attribute,
+        required_contents=required_contents,
+        required_contents_lower=required_contents.lower() if required_contents else None,
+        required_range=tuple(required_range) if required_range else None,
+        alternatives=tuple(alternatives) if alternatives is not None else None,
+    )
+
+
+def text_hash(text: str) -> int:
+    """
+    32-bit FNV-1a hash of ``text``'s UTF-16 code units.
+
+    Matches the in-page ``fnv1a`` of BATCH_PROBE_JS, so baselines and probes
+    from either probing strategy can be compared.
+    """
+    h = 0x811C9DC5
+    data = text.encode("utf-16-le", "surrogatepass")
+    for i in range(0, len(data), 2):
+        h ^= data[i] | data[i + 1] << 8
+        h = (h * 0x01000193) & 0xFFFFFFFF
+    return h
+
+
+def probe_fields(check: HtmlCheck) -> dict:
+    """Return which element facts a check is scored on."""
+    return {
+        "visible": check.kind == "visible",
+        "attribute": check.attribute if check.kind.startswith("attribute_") else None,
+        "text": check.kind == "text_contains",
+        # text_changed only needs to compare against its setup-time baseline
+        "text_hash": check.kind == "text_changed",
+    }
+
+
+def probe_check_with_locator(page, check: HtmlCheck) -> dict:
+    """
+    Probe a single check through the Playwright locator API.
+
+    Returns:
+        Probe dict with ``count``, the requested facts and ``elapsed_ms``,
+        or ``{"error": msg}``
+    """
+    start = time.perf_counter()
+    try:
+        locator = page.locator(check.locator)
+        result = {"count": locator.count()}
+        if result["count"] > 0:
+            element = locator.first
+            fields = probe_fields(check)
+            if fields["visible"]:
+                result["visible"] = element.is_visible()
+            if fields["attribute"]:
+                result["attribute"] = element.get_attribute(fields["attribute"])
+            if fields["text"]:
+                result["text"] = element.inner_text()
+            if fields["text_hash"]:
+                result["text_hash"] = text_hash(element.inner_text())
+    except Exception as e:
+        result = {"error": str(e)}
+    result["elapsed_ms"] = (time.perf_counter() - start) * 1000
+    return result
+
+
+def probe_checks_batched(page, checks) -> list[dict]:
+    """
+    Probe all checks of a task with one ``page.evaluate`` roundtrip.
+
+    Checks whose locator cannot be compiled to CSS, or that the browser
+    rejects, are probed individually through the locator API.
+
+    Args:
+        page: Playwright page object
+        checks: Compiled ``HtmlCheck`` objects from the task's EvalPlan
+
+    Returns:
+        One probe dict per check, in order. ``elapsed_ms`` is the in-page time
+        for batched checks and the full locator roundtrips otherwise.
+    """
+    payload = []
+    batched_indices = []
+    for idx, check in enumerate(checks):
+        if check.alternatives is None:
+            continue
+        payload.append({"alternatives": list(check.alternatives), **probe_fields(check)})
+        batched_indices.append(idx)
+
+    probes: list[Optional[dict]] = [None] * len(checks)
+    if payload:
+        try:
+            for idx, probe in zip(batched_indices, page.evaluate(BATCH_PROBE_JS, payload)):
+                if "error" not in probe:
+                    probes[idx] = probe
+        except Exception as e:
+            logger.warning(f"Batched HTML probe failed, falling back to locators: {e}")
+
+    return [
+        probe if probe is not None else probe_check_with_locator(page, check)
+        for probe, check in zip(probes, checks)
+    ]
@@ -0,0 +1,84 @@
+"""
+Goal Keyword Matching
+=====================
+
+Heuristic fallback for tasks without an applicable evaluator: the share of
+goal keywords that appear on the page.
+
+The goal is reduced to a set of stemmed, non-stopword terms once per task,
+and the page body is tokenized once per validation into a set of the same
+stems, so the cost is linear in the page size regardless of the goal length.
+"""
+
+import re
+from typing import Iterable
+
+_TOKEN = re.compile(r"[^\W_]+")
+
+STOPWORDS = frozenset("""
+    a about after all an and any are as at be been before but by can do does
+    for from has have how i if in into is it its me my no not of on or our so
+    than that the their them then there these this those to up was we what
+    when where which who will with you your
+""".split())
+
+_SIBILANT_ENDINGS = ("s", "x", "z", "ch", "sh")
+# Doubled final consonants that are undone after stripping "-ed"/"-ing"
+_UNDOUBLE = set("bdfgmnprt")
+
+
+def _trim_e(token: str) -> str:
+    return token[:-1] if len(token) > 3 and token.endswith("e") and not token.endswith("ee") else token
+
+
+def stem(token: str) -> str:
+    """
+    Light suffix-stripping stemmer for lowercase tokens.
+
+    Conflates the inflections that matter for goal matching ("plays",
+    "playing", "played" -> "play"; "albums" -> "album"; "liked" / "like"
+    -> "lik") without a full Porter implementation.
+    """
+    if len(token) < 4 or token.isdigit():
+        return token
+
+    if token.endswith(("ies", "ied")) and len(token) > 4:
+        return token[:-3] + "y"
+    if token.endswith("es") and token[:-2].endswith(_SIBILANT_ENDINGS):
+        return token[:-2]
+    if token.endswith("s") and not token.endswith(("ss", "us", "is")):
+        return _trim_e(token[:-1])
+
+    for suffix in ("ing", "ed"):
+        if token.endswith(suffix) and len(token) - len(suffix) >= 3:
+            token = token[:-len(suffix)]
+            # "stopped" -> "stop"
+            if token[-1] == token[-2] and token[-1] in _UNDOUBLE:
+                token = token[:-1]
+            return _trim_e(token)
+
+    return _trim_e(token)
+
+
+def tokenize(text: str) -> list[str]:
+    """Lowercase word tokens (letters and digits) of ``text``."""
+    return _TOKEN.findall(text.lower())
+
+
+def goal_terms(goal: str) -> tuple[str, ...]:
+    """Distinct stemmed non-stopword terms of a goal, in order of appearance."""
+    return tuple(dict.fromkeys(stem(token) for token in tokenize(goal) if token not in STOPWORDS))
+
+
+def page_terms(text: str) -> frozenset[str]:
+    """Set of stemmed terms on a page (one pass over the text)."""
+    # str.split() runs in C; only the distinct chunks go through the regex
+    # tokenizer and the stemmer, since page text repeats itself a lot
+    chunks = " ".join(set(text.lower().split()))
+    return frozenset(map(stem, set(_TOKEN.findall(chunks))))
+
+
+def count_found_terms(terms: Iterable[str], text: str) -> int:
+    """Number of ``terms`` (from ``goal_terms``) that occur in ``text``."""
+    found = page_terms(text)
+    return sum(1 for term in terms if term in found)
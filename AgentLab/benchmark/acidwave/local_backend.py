@@ -0,0 +1,784 @@
+"""
+Local Backend
+=============
+
+Stand-in for the Acidwave API (``backend/src``) that runs in-process, so
+benchmark runs do not depend on the deployed backend and its Supabase
+database.
+
+``LocalBackend`` implements the ``/api/songs``, ``/albums``, ``/artists``,
+``/playlists``, ``/favorites`` and ``/health`` routes of
+``backend/src/routes/*.js`` with the same JSON shapes, on an in-memory
+SQLite database created from ``backend/database/schema.sql`` (plus
+``add-user-favorites.sql``) and seeded from ``mock-data.sql``. Postgres-only
+parts are translated when loading: UUID and timestamp defaults become
+Python functions, ``VARCHAR[]`` / ``JSONB`` columns hold JSON text, and the
+album / playlist statistics triggers are re-created as SQLite triggers.
+
+It also serves a built frontend (``acidwave-app/dist``), so tasks can start
+on the local server instead of the deployed app. The production build calls
+``http://localhost:3000/api`` unless ``VITE_API_URL`` is set, which is this
+server on its default port.
+
+Resetting restores an in-memory copy of the database (``sqlite3`` backup,
+a few milliseconds). The ``/api/state/checkpoint`` and ``/api/state/restore``
+routes of ``backend/src/routes/state.js`` are always available, so
+``HttpResetHook(backend.api_url)`` works unchanged.
+
+Note: mock-data.sql is the development catalog; tasks whose intent names
+songs or albums of the deployed catalog need a seed file with that data.
+
+Example:
+    >>> backend = LocalBackend().start()
+    >>> backend.url, backend.api_url
+    ('http://localhost:3000', 'http://localhost:3000/api')
+    >>> backend.reset()
+    >>> backend.stop()
+"""
+
+import json
+import logging
+import mimetypes
+import re
+import sqlite3
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Iterable, Optional, Union
+from urllib.parse import parse_qs, unquote, urlsplit
+
+logger = logging.getLogger(__name__)
+
+
+_REPO_ROOT = Path(__file__).resolve().parents[3]
+
+DEFAULT_DATABASE_DIR = _REPO_ROOT / "backend" / "database"
+DEFAULT_FRONTEND_DIR = _REPO_ROOT / "acidwave-app" / "dist"
+
+# Loaded in order from the database directory
+SCHEMA_FILES = ("schema.sql", "add-user-favorites.sql")
+SEED_FILES = ("mock-data.sql",)
+
+TABLES = ("artists", "albums", "songs", "playlists", "playlist_songs", "user_favorites")
+
+DEFAULT_HOST = "localhost"
+DEFAULT_PORT = 3000
+
+# Embedded rows, as selected by the Express routes
+ARTIST_SUMMARY = ("id", "name", "avatar_url")
+ALBUM_SUMMARY = ("id", "title", "cover_url")
+
+
+# ============================================
+# Schema translation (Postgres -> SQLite)
+# ============================================
+
+_CREATE_TABLE = re.compile(r"CREATE TABLE IF NOT EXISTS \w+ \(.*?\n\);", re.S)
+_ARRAY_LITERAL = re.compile(r"ARRAY\[(.*?)\]", re.S)
+
+# Declared types ending in TEXT keep text affinity; the names mark JSON columns
+_TYPE_REWRITES = (
+    (re.compile(r"UUID DEFAULT gen_random_uuid\(\)"), "TEXT DEFAULT (gen_random_uuid())"),
+    (re.compile(r"\bUUID\b"), "TEXT"),
+    (re.compile(r"TIMESTAMP WITH TIME ZONE DEFAULT TIMEZONE\('utc', NOW\(\)\)"), "TEXT DEFAULT (utc_now())"),
+    (re.compile(r"VARCHAR\(\d+\)\[\]"), "ARRAY_TEXT"),
+    (re.compile(r"\bJSONB\b"), "JSON_TEXT"),
+)
+_JSON_TYPES = ("ARRAY_TEXT", "JSON_TEXT")
+
+# schema.sql keeps these up to date with plpgsql triggers
+_ALBUM_STATS = (
+    "UPDATE albums SET "
+    "total_tracks = (SELECT COUNT(*) FROM songs WHERE album_id = albums.id), "
+    "duration = (SELECT COALESCE(SUM(duration), 0) FROM songs WHERE album_id = albums.id) "
+    "WHERE id = {row}.album_id;"
+)
+_PLAYLIST_STATS = (
+    "UPDATE playlists SET "
+    "total_tracks = (SELECT COUNT(*) FROM playlist_songs WHERE playlist_id = playlists.id), "
+    "total_duration = (SELECT COALESCE(SUM(s.duration), 0) FROM playlist_songs ps "
+    "JOIN songs s ON ps.song_id = s.id WHERE ps.playlist_id = playlists.id) "
+    "WHERE id = {row}.playlist_id;"
+)
+
+
+def translate_schema(sql: str) -> str:
+    """SQLite version of the CREATE TABLE statements of a Postgres schema file."""
+    statements = []
+    for statement in _CREATE_TABLE.findall(sql):
+        for pattern, replacement in _TYPE_REWRITES:
+            statement = pattern.sub(replacement, statement)
+        statements.append(statement)
+    return "\n".join(statements)
+
+
+def translate_seed(sql: str) -> str:
+    """SQLite version of a seed file (``ARRAY[...]`` literals become JSON arrays)."""
+    return _ARRAY_LITERAL.sub(r"json_array(\1)", sql)
+
+
+def _stats_triggers() -> Iterable[str]:
+    for table, stats in (("songs", _ALBUM_STATS), ("playlist_songs", _PLAYLIST_STATS)):
+        for event, rows in (("INSERT", ("NEW",)), ("UPDATE", ("OLD", "NEW")), ("DELETE", ("OLD",))):
+            body = " ".join(stats.format(row=row) for row in rows)
+            yield f"CREATE TRIGGER {table}_stats_{event.lower()} AFTER {event} ON {table} BEGIN {body} END;"
+
+
+def _utc_now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+class NotFound(Exception):
+    """Row or route that does not exist (HTTP 404)."""
+
+
+class BadRequest(Exception):
+    """Missing required field or malformed body (HTTP 400)."""
+
+
+# ============================================
+# API
+# ============================================
+
+class LocalBackend:
+    """
+    In-memory Acidwave API and static frontend server.
+
+    Requests are handled on threads but served one at a time, as they share
+    one SQLite connection.
+    """
+
+    def __init__(
+        self,
+        host: str = DEFAULT_HOST,
+        port: int = DEFAULT_PORT,
+        database_dir: Union[str, Path] = DEFAULT_DATABASE_DIR,
+        seed_files: Optional[Iterable[Union[str, Path]]] = None,
+        frontend_dir: Optional[Union[str, Path]] = None,
+    ) -> None:
+        """
+        Args:
+            host, port: Address to listen on (port 0: any free port)
+            database_dir: Directory of schema.sql and add-user-favorites.sql
+            seed_files: SQL files with the data (default: mock-data.sql of database_dir)
+            frontend_dir: Built frontend served for non-API paths (None: API only)
+
+        Raises:
+            FileNotFoundError: If a schema, seed or frontend path does not exist
+        """
+        database_dir = Path(database_dir)
+        if seed_files is None:
+            seed_files = [database_dir / name for name in SEED_FILES]
+        self.host = host
+        self.port = port
+        self.frontend_dir = Path(frontend_dir).resolve() if frontend_dir else None
+        if self.frontend_dir is not None and not (self.frontend_dir / "index.html").is_file():
+            raise FileNotFoundError(
+                f"No built frontend in {self.frontend_dir} (run `npm run build` in acidwave-app)"
+            )
+
+        self._lock = threading.RLock()
+        self._started = time.monotonic()
+        # Postgres' NOW() is the transaction time: seeded rows share one timestamp
+        self._frozen_now: Optional[str] = None
+        self.conn = self._connect()
+        self._load([database_dir / name for name in SCHEMA_FILES], [Path(p) for p in seed_files])
+        self._columns = {
+            table: {row["name"]: row["type"] for row in self.conn.execute(f"PRAGMA table_info({table})")}
+            for table in TABLES
+        }
+
+        # Restored by reset(); replaced by checkpoint()
+        self._checkpoint = sqlite3.connect(":memory:", check_same_thread=False)
+        self.checkpoint_at: Optional[str] = None
+        self.checkpoint()
+
+        self._routes = [
+            (method, re.compile(pattern), handler)
+            for method, pattern, handler in (
+                ("GET", r"/api/health", self.health),
+                ("GET", r"/api/songs", self.list_songs),
+                ("GET", r"/api/songs/([^/]+)", self.get_song),
+                ("POST", r"/api/songs", self.create_song),
+                ("PUT", r"/api/songs/([^/]+)", self.update_song),
+                ("DELETE", r"/api/songs/([^/]+)", self.delete_song),
+                ("GET", r"/api/albums", self.list_albums),
+                ("GET", r"/api/albums/browse/new-releases", self.new_releases),
+                ("GET", r"/api/albums/([^/]+)", self.get_album),
+                ("GET", r"/api/albums/([^/]+)/tracks", self.album_tracks),
+                ("POST", r"/api/albums", self.create_album),
+                ("PUT", r"/api/albums/([^/]+)", self.update_album),
+                ("DELETE", r"/api/albums/([^/]+)", self.delete_album),
+                ("GET", r"/api/artists", self.list_artists),
+                ("GET", r"/api/artists/([^/]+)", self.get_artist),
+                ("GET", r"/api/artists/([^/]+)/albums", self.artist_albums),
+                ("GET", r"/api/artists/([^/]+)/songs", self.artist_songs),
+                ("POST", r"/api/artists", self.create_artist),
+                ("PUT", r"/api/artists/([^/]+)", self.update_artist),
+                ("DELETE", r"/api/artists/([^/]+)", self.delete_artist),
+                ("GET", r"/api/playlists", self.list_playlists),
+                ("GET", r"/api/playlists/([^/]+)", self.get_playlist),
+                ("POST", r"/api/playlists", self.create_playlist),
+                ("POST", r"/api/playlists/([^/]+)/songs", self.add_playlist_song),
+                ("DELETE", r"/api/playlists/([^/]+)/songs/([^/]+)", self.remove_playlist_song),
+                ("DELETE", r"/api/playlists/([^/]+)", self.delete_playlist),
+                ("GET", r"/api/favorites", self.list_favorites),
+                ("POST", r"/api/favorites/check", self.check_favorite),
+                ("POST", r"/api/favorites", self.add_favorite),
+                ("DELETE", r"/api/favorites/([^/]+)", self.remove_favorite),
+                ("POST", r"/api/state/checkpoint", self.checkpoint_route),
+                ("POST", r"/api/state/restore", self.restore_route),
+            )
+        ]
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    # ----- database -----
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(":memory:", check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        conn.create_function("gen_random_uuid", 0, lambda: str(uuid.uuid4()))
+        conn.create_function("utc_now", 0, lambda: self._frozen_now or _utc_now())
+        conn.execute("PRAGMA foreign_keys = ON")
+        return conn
+
+    def _load(self, schema_files: list, seed_files: list) -> None:
+        started = time.perf_counter()
+        for path in schema_files:
+            self.conn.executescript(translate_schema(path.read_text(encoding="utf-8")))
+        self.conn.executescript("\n".join(_stats_triggers()))
+        self._frozen_now = _utc_now()
+        try:
+            for path in seed_files:
+                self.conn.executescript(translate_seed(path.read_text(encoding="utf-8")))
+        finally:
+            self._frozen_now = None
+        counts = self.counts()
+        logger.info(
+            f"Local backend database loaded in {(time.perf_counter() - started) * 1000:.0f}ms: "
+            + ", ".join(f"{n} {table}" for table, n in counts.items())
+        )
+
+    def counts(self) -> dict[str, int]:
+        """Number of rows per table."""
+        with self._lock:
+            return {
+                table: self.conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                for table in TABLES
+            }
+
+    def checkpoint(self) -> None:
+        """Make the current data the state ``reset`` restores."""
+        with self._lock:
+            self.conn.backup(self._checkpoint)
+            self.checkpoint_at = _utc_now()
+
+    def reset(self) -> None:
+        """Restore the data of the last checkpoint (the seed data by default)."""
+        with self._lock:
+            self._checkpoint.backup(self.conn)
+
+    def _decode(self, table: str, row: sqlite3.Row) -> dict:
+        record = dict(row)
+        for name, value in record.items():
+            column_type = self._columns[table].get(name)
+            if value is None:
+                continue
+            if column_type == "BOOLEAN":
+                record[name] = bool(value)
+            elif column_type in _JSON_TYPES:
+                record[name] = json.loads(value)
+        return record
+
+    def _encode(self, table: str, values: dict) -> dict:
+        return {
+            name: json.dumps(value) if self._columns[table].get(name) in _JSON_TYPES and value is not None else value
+            for name, value in values.items()
+        }
+
+    def _order(self, table: str, column: str, ascending: bool) -> str:
+        if column not in self._columns[table]:
+            raise BadRequest(f"column {table}.{column} does not exist")
+        # Postgres sorts NULLs as larger than any value; rowid keeps ties in insert order
+        return f'"{column}" {"ASC NULLS LAST" if ascending else "DESC NULLS FIRST"}, rowid'
+
+    def _select(
+        self,
+        table: str,
+        where: str = "",
+        params: tuple = (),
+        order: Optional[str] = None,
+        limit: Optional[int] = None,
+        offset: int = 0,
+    ) -> list[dict]:
+        sql = f"SELECT * FROM {table}"
+        if where:
+            sql += f" WHERE {where}"
+        sql += f" ORDER BY {order or 'rowid'}"
+        if limit is not None:
+            sql += f" LIMIT {int(limit)} OFFSET {int(offset)}"
+        return [self._decode(table, row) for row in self.conn.execute(sql, params)]
+
+    def _get(self, table: str, row_id: str, what: str) -> dict:
+        rows = self._select(table, "id = ?", (row_id,))
+        if not rows:
+            raise NotFound(f"{what} not found")
+        return rows[0]
+
+    def _insert(self, table: str, values: dict) -> dict:
+        values = self._encode(table, values)
+        columns = ", ".join(f'"{name}"' for name in values)
+        placeholders = ", ".join("?" for _ in values)
+        sql = (
+            f"INSERT INTO {table} ({columns}) VALUES ({placeholders}) RETURNING *"
+            if values else f"INSERT INTO {table} DEFAULT VALUES RETURNING *"
+        )
+        with self.conn:
+            row = self.conn.execute(sql, tuple(values.values())).fetchone()
+        return self._decode(table, row)
+
+    def _update(self, table: str, row_id: str, values: dict, what: str) -> dict:
+        values = self._encode(table, values)
+        if "updated_at" in self._columns[table]:
+            values["updated_at"] = _utc_now()
+        assignments = ", ".join(f'"{name}" = ?' for name in values)
+        with self.conn:
+            rows = self.conn.execute(
+                f"UPDATE {table} SET {assignments} WHERE id = ? RETURNING *", (*values.values(), row_id)
+            ).fetchall()
+        if not rows:
+            raise NotFound(f"{what} not found")
+        return self._decode(table, rows[0])
+
+    def _delete(self, table: str, where: str, params: tuple) -> None:
+        with self.conn:
+            self.conn.execute(f"DELETE FROM {table} WHERE {where}", params)
+
+    def _embed(self, rows: list[dict], name: str, table: str, key: str, columns: Optional[tuple] = None) -> list[dict]:
+        """Attach the row of ``table`` referenced by ``row[key]`` as ``row[name]``."""
+        ids = {row[key] for row in rows if row.get(key) is not None}
+        related = {}
+        if ids:
+            placeholders = ", ".join("?" for _ in ids)
+            related = {r["id"]: r for r in self._select(table, f"id IN ({placeholders})", tuple(ids))}
+        for row in rows:
+            match = related.get(row.get(key))
+            row[name] = {c: match[c] for c in columns} if match is not None and columns else match
+        return rows
+
+    def _with_song_refs(self, songs: list[dict]) -> list[dict]:
+        self._embed(songs, "artist", "artists", "artist_id", ARTIST_SUMMARY)
+        return self._embed(songs, "album", "albums", "album_id", ALBUM_SUMMARY)
+
+    # ----- /api/health -----
+
+    def health(self, query, body):
+        return {
+            "status": "ok",
+            "timestamp": _utc_now(),
+            "uptime": time.monotonic() - self._started,
+            "database": {
+                "connected": True,
+                "tables_exist": True,
+                "songs_count": self.counts()["songs"],
+            },
+        }
+
+    # ----- /api/songs -----
+
+    _SONG_FIELDS = (
+        "title", "album_id", "track_number", "duration", "url", "cover_url", "genre",
+        "release_date", "lyrics", "license", "attribution", "source_url",
+        "requires_attribution", "is_explicit",
+    )
+
+    def list_songs(self, query, body):
+        sort = query.get("sort", "created_at")
+        where, params = self._filters(query, {"genre": "genre", "artist_id": "artist_id", "album_id": "album_id"})
+        if query.get("search"):
+            where.append("title LIKE ?")
+            params.append(f"%{query['search']}%")
+        data = self._with_song_refs(self._select(
+            "songs", " AND ".join(where), tuple(params), self._order("songs", sort, sort == "title"),
+            limit=_int_param(query, "limit", 50), offset=_int_param(query, "offset", 0),
+        ))
+        # The routes do not ask Supabase for a count
+        return {"success": True, "count": len(data), "total": None, "data": data}
+
+    def get_song(self, query, body, song_id):
+        song = self._get("songs", song_id, "Song")
+        self._embed([song], "artist", "artists", "artist_id", (*ARTIST_SUMMARY, "country"))
+        self._embed([song], "album", "albums", "album_id", (*ALBUM_SUMMARY, "release_date"))
+        return {"success": True, "data": song}
+
+    def create_song(self, query, body):
+        if not all(body.get(field) for field in ("title", "artist_id", "duration", "url")):
+            raise BadRequest("Title, artist_id, duration, and url are required")
+        song = self._insert("songs", _pick(body, ("artist_id", *self._SONG_FIELDS)))
+        return 201, {"success": True, "data": self._with_song_refs([song])[0]}
+
+    def update_song(self, query, body, song_id):
+        song = self._update("songs", song_id, _pick(body, (*self._SONG_FIELDS, "plays", "likes")), "Song")
+        return {"success": True, "data": self._with_song_refs([song])[0]}
+
+    def delete_song(self, query, body, song_id):
+        self._delete("songs", "id = ?", (song_id,))
+        return {"success": True, "message": "Song deleted successfully"}
+
+    # ----- /api/albums -----
+
+    _ALBUM_FIELDS = (
+        "title", "cover_url", "release_date", "genre", "description", "label",
+        "license", "attribution", "source_url", "requires_attribution",
+    )
+
+    def list_albums(self, query, body):
+        sort = query.get("sort", "release_date")
+        where, params = self._filters(query, {"genre": "genre", "artist_id": "artist_id"})
+        if query.get("search"):
+            where.append("title LIKE ?")
+            params.append(f"%{query['search']}%")
+        data = self._embed(self._select(
+            "albums", " AND ".join(where), tuple(params), self._order("albums", sort, sort == "title"),
+            limit=_int_param(query, "limit", 50), offset=_int_param(query, "offset", 0),
+        ), "artist", "artists", "artist_id", ARTIST_SUMMARY)
+        return {"success": True, "count": len(data), "total": None, "data": data}
+
+    def new_releases(self, query, body):
+        data = self._embed(
+            self._select("albums", order=self._order("albums", "release_date", False),
+                         limit=_int_param(query, "limit", 20)),
+            "artist", "artists", "artist_id", ARTIST_SUMMARY,
+        )
+        return {"success": True, "count": len(data), "data": data}
+
+    def get_album(self, query, body, album_id):
+        album = self._get("albums", album_id, "Album")
+        self._embed([album], "artist", "artists", "artist_id", (*ARTIST_SUMMARY, "country"))
+        album["tracks"] = self._album_tracks(album_id)
+        return {"success": True, "data": album}
+
+    def _album_tracks(self, album_id: str) -> list[dict]:
+        return self._select("songs", "album_id = ?", (album_id,), self._order("songs", "track_number", True))
+
+    def album_tracks(self, query, body, album_id):
+        data = self._album_tracks(album_id)
+        return {"success": True, "count": len(data), "data": data}
+
+    def create_album(self, query, body):
+        if not (body.get("title") and body.get("artist_id")):
+            raise BadRequest("Title and artist_id are required")
+        album = self._insert("albums", _pick(body, ("artist_id", *self._ALBUM_FIELDS)))
+        return 201, {"success": True, "data": self._embed([album], "artist", "artists", "artist_id", ARTIST_SUMMARY)[0]}
+
+    def update_album(self, query, body, album_id):
+        album = self._update("albums", album_id, _pick(body, self._ALBUM_FIELDS), "Album")
+        return {"success": True, "data": self._embed([album], "artist", "artists", "artist_id", ARTIST_SUMMARY)[0]}
+
+    def delete_album(self, query, body, album_id):
+        self._delete("albums", "id = ?", (album_id,))
+        return {"success": True, "message": "Album deleted successfully"}
+
+    # ----- /api/artists -----
+
+    _ARTIST_FIELDS = ("name", "bio", "avatar_url", "genres", "country", "website_url", "social_links")
+
+    def list_artists(self, query, body):
+        where, params = [], []
+        if query.get("search"):
+            where.append("name LIKE ?")
+            params.append(f"%{query['search']}%")
+        if query.get("genre"):
+            where.append("EXISTS (SELECT 1 FROM json_each(artists.genres) WHERE value = ?)")
+            params.append(query["genre"])
+        data = self._select(
+            "artists", " AND ".join(where), tuple(params), self._order("artists", "name", True),
+            limit=_int_param(query, "limit", 50), offset=_int_param(query, "offset", 0),
+        )
+        include_albums = query.get("include_albums", "false") == "true"
+        for artist in data:
+            albums = self._select("albums", "artist_id = ?", (artist["id"],))
+            artist["albums"] = (
+                [_pick(album, ("id", "title", "cover_url", "release_date")) for album in albums]
+                if include_albums else [{"count": len(albums)}]
+            )
+            n_songs = self.conn.execute("SELECT COUNT(*) FROM songs WHERE artist_id = ?", (artist["id"],)).fetchone()[0]
+            artist["songs"] = [{"count": n_songs}]
+        return {"success": True, "count": len(data), "total": None, "data": data}
+
+    def get_artist(self, query, body, artist_id):
+        artist = self._get("artists", artist_id, "Artist")
+        artist["albums"] = self._artist_albums(artist_id)
+        artist["top_songs"] = self._select(
+            "songs", "artist_id = ?", (artist_id,), self._order("songs", "plays", False), limit=10
+        )
+        return {"success": True, "data": artist}
+
+    def _artist_albums(self, artist_id: str) -> list[dict]:
+        return self._select("albums", "artist_id = ?", (artist_id,), self._order("albums", "release_date", False))
+
+    def artist_albums(self, query, body, artist_id):
+        data = self._artist_albums(artist_id)
+        return {"success": True, "count": len(data), "data": data}
+
+    def artist_songs(self, query, body, artist_id):
+        data = self._embed(
+            self._select("songs", "artist_id = ?", (artist_id,), self._order("songs", "plays", False),
+                         limit=_int_param(query, "limit", 50)),
+            "album", "albums", "album_id", ALBUM_SUMMARY,
+        )
+        return {"success": True, "count": len(data), "data": data}
+
+    def create_artist(self, query, body):
+        if not body.get("name"):
+            raise BadRequest("Artist name is required")
+        return 201, {"success": True, "data": self._insert("artists", _pick(body, self._ARTIST_FIELDS))}
+
+    def update_artist(self, query, body, artist_id):
+        return {"success": True, "data": self._update("artists", artist_id, _pick(body, self._ARTIST_FIELDS), "Artist")}
+
+    def delete_artist(self, query, body, artist_id):
+        self._delete("artists", "id = ?", (artist_id,))
+        return {"success": True, "message": "Artist deleted successfully"}
+
+    # ----- /api/playlists -----
+
+    def list_playlists(self, query, body):
+        data = self._select("playlists", order=self._order("playlists", "created_at", False))
+        return {"success": True, "count": len(data), "data": data}
+
+    def get_playlist(self, query, body, playlist_id):
+        playlist = self._get("playlists", playlist_id, "Playlist")
+        entries = [
+            _pick(entry, ("song_id", "position", "added_at"))
+            for entry in self._select("playlist_songs", "playlist_id = ?", (playlist_id,))
+        ]
+        self._embed(entries, "songs", "songs", "song_id")
+        self._with_song_refs([entry["songs"] for entry in entries if entry["songs"] is not None])
+        playlist["playlist_songs"] = entries
+        return {"success": True, "data": playlist}
+
+    def create_playlist(self, query, body):
+        playlist = self._insert("playlists", _pick(body, ("name", "description", "cover_url")))
+        return 201, {"success": True, "data": playlist}
+
+    def add_playlist_song(self, query, body, playlist_id):
+        entry = self._insert("playlist_songs", {
+            "playlist_id": playlist_id,
+            "song_id": body.get("song_id"),
+            "position": body.get("position") or 0,
+        })
+        return 201, {"success": True, "data": entry}
+
+    def remove_playlist_song(self, query, body, playlist_id, song_id):
+        self._delete("playlist_songs", "playlist_id = ? AND song_id = ?", (playlist_id, song_id))
+        return {"success": True, "message": "Song removed from playlist successfully"}
+
+    def delete_playlist(self, query, body, playlist_id):
+        self._delete("playlists", "id = ?", (playlist_id,))
+        return {"success": True, "message": "Playlist deleted successfully"}
+
+    # ----- /api/favorites -----
+
+    def list_favorites(self, query, body):
+        data = [
+            _pick(favorite, ("id", "song_id", "created_at"))
+            for favorite in self._select(
+                "user_favorites", "user_id = ?", (query.get("user_id", "guest"),),
+                self._order("user_favorites", "created_at", False),
+            )
+        ]
+        self._embed(data, "songs", "songs", "song_id")
+        self._with_song_refs([favorite["songs"] for favorite in data if favorite["songs"] is not None])
+        return {"success": True, "count": len(data), "data": data}
+
+    def add_favorite(self, query, body):
+        if not body.get("song_id"):
+            raise BadRequest("song_id is required")
+        values = {"song_id": body["song_id"], "user_id": body.get("user_id", "guest")}
+        try:
+            favorite = self._insert("user_favorites", values)
+        except sqlite3.IntegrityError as e:
+            if "UNIQUE" not in str(e):
+                raise
+            return {"success": True, "message": "Song already in favorites", "data": None}
+        return 201, {"success": True, "data": favorite}
+
+    def remove_favorite(self, query, body, song_id):
+        self._delete("user_favorites", "song_id = ? AND user_id = ?", (song_id, query.get("user_id", "guest")))
+        return {"success": True, "message": "Song removed from favorites successfully"}
+
+    def check_favorite(self, query, body):
+        if not body.get("song_id"):
+            raise BadRequest("song_id is required")
+        rows = self._select(
+            "user_favorites", "song_id = ? AND user_id = ?", (body["song_id"], body.get("user_id", "guest"))
+        )
+        return {"success": True, "is_favorited": bool(rows)}
+
+    # ----- /api/state (same responses as backend/src/routes/state.js) -----
+
+    def checkpoint_route(self, query, body):
+        self.checkpoint()
+        return {"success": True, "created_at": self.checkpoint_at, "counts": self.counts()}
+
+    def restore_route(self, query, body):
+        started = time.perf_counter()
+        self.reset()
+        return {
+            "success": True,
+            "checkpoint": self.checkpoint_at,
+            "counts": self.counts(),
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 2),
+        }
+
+    @staticmethod
+    def _filters(query: dict, columns: dict) -> tuple:
+        where, params = [], []
+        for param, column in columns.items():
+            if query.get(param):
+                where.append(f"{column} = ?")
+                params.append(query[param])
+        return where, params
+
+    # ----- HTTP -----
+
+    def handle(self, method: str, path: str, query: dict, body: dict) -> tuple:
+        """Dispatch one API request; returns (status, JSON payload)."""
+        for route_method, pattern, handler in self._routes:
+            match = pattern.fullmatch(path)
+            if route_method != method or match is None:
+                continue
+            try:
+                with self._lock:
+                    result = handler(query, body, *(unquote(group) for group in match.groups()))
+            except NotFound as e:
+                return 404, {"success": False, "error": str(e)}
+            except BadRequest as e:
+                return 400, {"success": False, "error": str(e)}
+            except (sqlite3.Error, ValueError) as e:
+                if self.conn.in_transaction:
+                    self.conn.rollback()
+                logger.warning(f"{method} {path} failed: {e}")
+                return 500, {"success": False, "error": str(e)}
+            return result if isinstance(result, tuple) else (200, result)
+        return 404, {"error": "Route not found"}
+
+    @property
+    def url(self) -> str:
+        """Base URL of the server (the frontend, if served)."""
+        return f"http://{self.host}:{self.port}"
+
+    @property
+    def api_url(self) -> str:
+        return f"{self.url}/api"
+
+    def start(self) -> "LocalBackend":
+        """Serve on a daemon thread."""
+        self._server = ThreadingHTTPServer((self.host, self.port), _RequestHandler)
+        self._server.daemon_threads = True
+        self._server.backend = self
+        # Port 0 picks a free port
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, name="acidwave-local-backend", daemon=True)
+        self._thread.start()
+        logger.info(f"Local backend serving {self.api_url}" + (f" and {self.frontend_dir}" if self.frontend_dir else ""))
+        return self
+
+    def stop(self) -> None:
+        if self._server is None:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+        self._server = None
+        self._thread = None
+
+    def __enter__(self) -> "LocalBackend":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+def _int_param(query: dict, name: str, default: int) -> int:
+    """Non-negative integer query parameter (BadRequest when malformed)."""
+    value = query.get(name)
+    if value is None or value == "":
+        return default
+    try:
+        number = int(value)
+    except ValueError:
+        raise BadRequest(f"{name} must be an integer") from None
+    if number < 0:
+        raise BadRequest(f"{name} must not be negative")
+    return number
+
+
+def _pick(values: dict, fields: Iterable[str]) -> dict:
+    """Fields present in ``values`` (absent ones keep the column defaults)."""
+    return {field: values[field] for field in fields if field in values}
+
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    """Routes /api/* to the server's LocalBackend and everything else to the frontend."""
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args) -> None:
+        logger.debug(f"{self.address_string()} {format % args}")
+
+    def _send(self, status: int, body: bytes, content_type: str) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Access-Control-Allow-Origin", "*")
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+    def _send_json(self, status: int, payload) -> None:
+        self._send(status, json.dumps(payload, ensure_ascii=False).encode("utf-8"), "application/json; charset=utf-8")
+
+    def _dispatch(self) -> None:
+        backend: LocalBackend = self.server.backend
+        parts = urlsplit(self.path)
+        path = parts.path.rstrip("/") or "/"
+        length = int(self.headers.get("Content-Length") or 0)
+        raw_body = self.rfile.read(length) if length else b""
+
+        if path == "/api" or path.startswith("/api/"):
+            try:
+                body = json.loads(raw_body) if raw_body else {}
+            except ValueError as e:
+                self._send_json(400, {"success": False, "error": f"Invalid JSON body: {e}"})
+                return
+            query = {key: values[0] for key, values in parse_qs(parts.query).items()}
+            self._send_json(*backend.handle(self.command, path, query, body if isinstance(body, dict) else {}))
+        elif self.command in ("GET", "HEAD") and backend.frontend_dir is not None:
+            self._send_static(backend.frontend_dir, unquote(parts.path))
+        else:
+            self._send_json(404, {"error": "Route not found"})
+
+    def _send_static(self, root: Path, path: str) -> None:
+        target = (root / path.lstrip("/")).resolve()
+        # Unknown paths are client-side routes of the single-page app
+        if not target.is_file() or root not in target.parents:
+            target = root / "index.html"
+        content_type = mimetypes.guess_type(target.name)[0] or "application/octet-stream"
+        self._send(200, target.read_bytes(), content_type)
+
+    do_GET = do_HEAD = do_POST = do_PUT = do_DELETE = _dispatch
+
+    def do_OPTIONS(self) -> None:
+        # CORS preflight (frontend served from another origin)
+        self.send_response(204)
+        self.send_header("Access-Control-Allow-Origin", "*")
+        self.send_header("Access-Control-Allow-Methods", "GET, POST, PUT, DELETE, OPTIONS")
+        self.send_header("Access-Control-Allow-Headers", self.headers.get("Access-Control-Request-Headers", "Content-Type"))
+        self.send_header("Content-Length", "0")
+        self.end_headers()
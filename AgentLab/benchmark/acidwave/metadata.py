@@ -0,0 +1,181 @@
+"""
+Task Metadata Index
+===================
+
+In-memory index of task metadata shared by ``AcidwaveBenchmark``,
+``run_full_experiments.py`` and ``analyze_results.py``.
+
+Each task is normalized once (difficulty lowercased, eval types and sites
+extracted, intent template derived) and posted into one bucket per indexed
+field. Lookups by task ID, task name or field value are dict lookups, and
+buckets are frozensets, so filters compose with set algebra:
+
+Example:
+    >>> index = get_task_catalog().index
+    >>> index["difficulty", "hard"] & index["eval_type", "program_html"]
+    frozenset({16})
+    >>> index.select(difficulty="hard", eval_type="program_html")
+    [{'task_id': 16, ...}]
+    >>> index.select(difficulty=["easy", "medium"], site="acidwave")
+"""
+
+import re
+from typing import Iterable, Iterator, Optional, Union
+
+# Fields with a value -> task IDs bucket (eval_type and site are multi-valued)
+INDEXED_FIELDS = ("difficulty", "site", "eval_type", "intent_template")
+
+# Quoted entity names and numbers are the variable parts of an intent
+_TEMPLATE_SLOTS = re.compile(r'"[^"]*"|\b\d+(?:\.\d+)?\b')
+
+
+def task_name(task_id: int) -> str:
+    """Experiment task name of a task ID (``acidwave.task_<id>``)."""
+    return f"acidwave.task_{task_id}"
+
+
+def intent_template(intent: str) -> str:
+    """Intent with quoted names and numbers replaced by ``{}``."""
+    return _TEMPLATE_SLOTS.sub("{}", intent).strip()
+
+
+def task_record(task: dict) -> dict:
+    """Normalized metadata of a raw (or ``AcidwaveBenchmark``) task config."""
+    intent = task.get("intent", "")
+    return {
+        "task_id": task["task_id"],
+        "task_name": task_name(task["task_id"]),
+        "intent": intent,
+        "intent_template": task.get("intent_template") or intent_template(intent),
+        "difficulty": str(task.get("difficulty", "unknown")).lower(),
+        "sites": tuple(task.get("sites") or ()),
+        "eval_types": tuple((task.get("eval") or {}).get("eval_types") or ()),
+        "start_url": task.get("start_url", "http://localhost:5173"),
+    }
+
+
+class TaskIndex:
+    """
+    Task metadata records indexed by task ID, task name and ``INDEXED_FIELDS``.
+
+    Records are plain dicts (see ``task_record``) shared between users of the
+    index and must be treated as read-only. Iteration and ``select`` follow
+    the order tasks were given in.
+    """
+
+    def __init__(self, tasks: Iterable[dict]) -> None:
+        self._records: dict[int, dict] = {}
+        self._by_name: dict[str, int] = {}
+        self._buckets: dict[str, dict[str, list[int]]] = {field: {} for field in INDEXED_FIELDS}
+        for task in tasks:
+            record = task_record(task)
+            task_id = record["task_id"]
+            self._records[task_id] = record
+            self._by_name[record["task_name"]] = task_id
+            for field, values in (
+                ("difficulty", (record["difficulty"],)),
+                ("site", record["sites"]),
+                ("eval_type", record["eval_types"]),
+                ("intent_template", (record["intent_template"],)),
+            ):
+                for value in dict.fromkeys(values):
+                    self._buckets[field].setdefault(value, []).append(task_id)
+        # Ordered IDs for select(), frozensets for set algebra
+        self._ordered = {
+            field: {value: tuple(ids) for value, ids in buckets.items()}
+            for field, buckets in self._buckets.items()
+        }
+        self._sets = {
+            field: {value: frozenset(ids) for value, ids in buckets.items()}
+            for field, buckets in self._buckets.items()
+        }
+        del self._buckets
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __iter__(self) -> Iterator[dict]:
+        return iter(self._records.values())
+
+    def __contains__(self, task_id: int) -> bool:
+        return task_id in self._records
+
+    def __getitem__(self, key: Union[int, tuple]) -> Union[dict, frozenset]:
+        """``index[task_id]`` -> record, ``index[field, value]`` -> task IDs."""
+        if isinstance(key, tuple):
+            return self.ids(*key)
+        return self._records[key]
+
+    def get(self, task_id: int, default: Optional[dict] = None) -> Optional[dict]:
+        return self._records.get(task_id, default)
+
+    @property
+    def task_ids(self) -> list[int]:
+        return list(self._records)
+
+    def by_name(self, name: str) -> Optional[dict]:
+        """Record of an experiment task name (``acidwave.task_<id>``), or None."""
+        task_id = self._by_name.get(name)
+        return None if task_id is None else self._records[task_id]
+
+    def values(self, field: str) -> list[str]:
+        """Distinct values of an indexed field, in first-seen order."""
+        return list(self._sets[self._check_field(field)])
+
+    def ids(self, field: str, value: str) -> frozenset:
+        """
+        IDs of the tasks whose ``field`` has ``value`` (difficulty is case-insensitive).
+
+        Raises:
+            KeyError: If field is not one of INDEXED_FIELDS
+        """
+        return self._sets[self._check_field(field)].get(self._normalize(field, value), frozenset())
+
+    def where(self, **criteria: Union[str, Iterable[str]]) -> frozenset:
+        """
+        IDs of the tasks matching every criterion.
+
+        Criteria are ``field=value`` (or ``field=[value, ...]`` for any of the
+        values) over INDEXED_FIELDS; no criteria matches every task.
+        """
+        result = None
+        for field, wanted in criteria.items():
+            matches = self._any_of(field, wanted)
+            result = matches if result is None else result & matches
+            if not result:
+                break
+        return frozenset(self._records) if result is None else result
+
+    def select(self, **criteria: Union[str, Iterable[str]]) -> list[dict]:
+        """Records matching ``where(**criteria)``, in task order."""
+        if not criteria:
+            return list(self._records.values())
+        matches = self.where(**criteria)
+        if not matches:
+            return []
+        # Walk the smallest ordered bucket of the first criterion rather than all tasks
+        field, wanted = next(iter(criteria.items()))
+        values = [wanted] if isinstance(wanted, str) else list(wanted)
+        if len(values) == 1:
+            ordered = self._ordered[field].get(self._normalize(field, values[0]), ())
+        else:
+            ordered = self._records
+        return [self._records[task_id] for task_id in ordered if task_id in matches]
+
+    def column(self, field: str, key: str = "task_name") -> dict:
+        """``{record[key]: record[field]}`` over all tasks, e.g. task name -> difficulty."""
+        return {record[key]: record[field] for record in self._records.values()}
+
+    def _any_of(self, field: str, wanted: Union[str, Iterable[str]]) -> frozenset:
+        if isinstance(wanted, str):
+            return self.ids(field, wanted)
+        return frozenset().union(*(self.ids(field, value) for value in wanted))
+
+    def _check_field(self, field: str) -> str:
+        if field not in self._sets:
+            raise KeyError(f"Unknown task metadata field '{field}'. Expected one of {INDEXED_FIELDS}")
+        return field
+
+    @staticmethod
+    def _normalize(field: str, value: str) -> str:
+        return str(value).lower() if field == "difficulty" else value
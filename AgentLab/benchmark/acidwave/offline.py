@@ -0,0 +1,262 @@
+"""
+Offline Re-scoring
+==================
+
+Re-scores stored AgentLab trajectories against the current ``test.raw.json``
+without a browser or an LLM.
+
+Every ``step_*.pkl.gz`` of an experiment holds the observation the task was
+validated on (URL and CDP DOM snapshot), so the current EvalPlan can be
+replayed over it with the same ``score_page`` logic ``AcidwaveTask.validate``
+uses. Episodes are re-scored in parallel across a process pool.
+
+Example:
+    >>> from benchmark.acidwave.offline import rescore_study
+    >>> results = rescore_study("agentlab_results/2025-12-14_19-35-53_...")
+    >>> sum(r["success"] for r in results)
+"""
+
+import gzip
+import json
+import logging
+import pickle
+import re
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Iterator, Optional, Union
+
+from .catalog import DEFAULT_TASK_FILE, get_task_catalog
+from .dom_snapshot import DomSnapshotTree, probe_checks_offline
+from .keywords import goal_terms
+from .scoring import record_text_baselines, score_page
+
+logger = logging.getLogger(__name__)
+
+
+_STEP_FILE = re.compile(r"step_(\d+)\.pkl\.gz$")
+_EXP_TASK_ID = re.compile(r"acidwave\.task_(\d+)(?:_\d+)?$")
+
+
+class _MissingClass:
+    """
+    Stand-in for pickled classes that cannot be imported here.
+
+    Stored steps reference agent and LLM classes (messages, chat wrappers)
+    that re-scoring does not need; their state is kept but never used.
+    """
+
+    def __init__(self, *args, **kwargs) -> None:
+        self._args = args
+
+    def __setstate__(self, state) -> None:
+        if isinstance(state, tuple) and len(state) == 2 and isinstance(state[1], dict):
+            state = state[1]
+        if isinstance(state, dict):
+            self.__dict__.update(state)
+        else:
+            self._state = state
+
+    # Containers (dict or list subclasses) are rebuilt item by item
+    def __setitem__(self, key, value) -> None:
+        self.__dict__.setdefault("_items", {})[key] = value
+
+    def append(self, value) -> None:
+        self.__dict__.setdefault("_items", []).append(value)
+
+    def extend(self, values) -> None:
+        self.__dict__.setdefault("_items", []).extend(values)
+
+
+class _LenientUnpickler(pickle.Unpickler):
+    def find_class(self, module, name):
+        try:
+            return super().find_class(module, name)
+        except (ImportError, AttributeError):
+            return type(name, (_MissingClass,), {"__module__": module})
+
+
+def load_step(path: Union[str, Path]):
+    """Load a stored ``StepInfo``, tolerating classes missing from this environment."""
+    with gzip.open(path, "rb") as f:
+        return _LenientUnpickler(f).load()
+
+
+def iter_step_files(exp_dir: Union[str, Path]) -> list[Path]:
+    """Return an experiment's step files in step order."""
+    steps = []
+    for path in Path(exp_dir).glob("step_*.pkl.gz"):
+        match = _STEP_FILE.search(path.name)
+        if match:
+            steps.append((int(match.group(1)), path))
+    return [path for _, path in sorted(steps)]
+
+
+def iter_experiment_dirs(study_dir: Union[str, Path]) -> Iterator[Path]:
+    """Yield the experiment directories of a study (or the directory itself)."""
+    study_dir = Path(study_dir)
+    if iter_step_files(study_dir):
+        yield study_dir
+        return
+    for child in sorted(study_dir.iterdir()):
+        if child.is_dir() and iter_step_files(child):
+            yield child
+
+
+def parse_task_id(exp_dir: Union[str, Path]) -> int:
+    """
+    Extract the task ID from an experiment directory name.
+
+    Raises:
+        ValueError: If the name does not end with ``acidwave.task_<id>[_<seed>]``
+    """
+    match = _EXP_TASK_ID.search(Path(exp_dir).name)
+    if match is None:
+        raise ValueError(f"Not an Acidwave experiment directory: {exp_dir}")
+    return int(match.group(1))
+
+
+class StoredPageState:
+    """
+    Page state reconstructed from a stored observation.
+
+    Same interface ``score_page`` reads from a live ``PageSnapshot``: ``url``,
+    ``text`` (body inner text) and ``probe_html_checks``.
+    """
+
+    def __init__(self, obs: dict) -> None:
+        self.url = obs.get("url", "")
+        self._dom_object = obs.get("dom_object")
+        self._tree: Optional[DomSnapshotTree] = None
+        self._text: Optional[str] = None
+
+    @property
+    def tree(self) -> DomSnapshotTree:
+        if self._tree is None:
+            if not self._dom_object:
+                raise ValueError("Observation has no DOM snapshot")
+            self._tree = DomSnapshotTree(self._dom_object)
+        return self._tree
+
+    @property
+    def text(self) -> str:
+        if self._text is None:
+            body = self.tree.find_body()
+            self._text = self.tree.inner_text(body) if body is not None else ""
+        return self._text
+
+    def probe_html_checks(self, checks) -> list[dict]:
+        return probe_checks_offline(self.tree, checks)
+
+
+def _read_summary(exp_dir: Path) -> dict:
+    try:
+        with open(exp_dir / "summary_info.json", 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+
+def rescore_episode(exp_dir: Union[str, Path], task_file: Union[str, Path] = DEFAULT_TASK_FILE) -> dict:
+    """
+    Re-score one stored episode with the current eval config.
+
+    Step 0 is the observation after ``reset`` and is never validated, like in
+    a live run; it provides the baseline for ``text_changed`` checks. The
+    episode ends at the first step the current config marks done; steps
+    recorded after it do not count toward the reward.
+
+    Args:
+        exp_dir: Experiment directory containing ``step_*.pkl.gz`` files
+        task_file: Task definitions to score against
+
+    Returns:
+        Dict with the re-scored and the originally recorded outcome
+    """
+    exp_dir = Path(exp_dir)
+    task_id = parse_task_id(exp_dir)
+    catalog = get_task_catalog(task_file)
+    plan = catalog.eval_plan(task_id)
+    terms = goal_terms(catalog[task_id]["intent"])
+
+    step_files = iter_step_files(exp_dir)
+    text_baselines = {}
+    if plan.text_changed_checks:
+        reset_obs = load_step(step_files[0]).obs
+        if reset_obs:
+            text_baselines = record_text_baselines(plan, StoredPageState(reset_obs))
+
+    rewards = []
+    done_step = None
+    info = {}
+    message = ""
+    for path in step_files[1:]:
+        step_info = load_step(path)
+        if not step_info.obs:
+            continue
+        try:
+            reward, done, message, info = score_page(
+                plan, StoredPageState(step_info.obs), task_id, terms, text_baselines
+            )
+        except Exception as e:
+            # Mirrors validate(): a page that cannot be read ends the episode
+            reward, done, message, info = 0.0, True, f"Error: {e}", {}
+        rewards.append(reward)
+        if done:
+            done_step = step_info.step
+            break
+
+    summary = _read_summary(exp_dir)
+    return {
+        "exp_dir": str(exp_dir),
+        "task_id": task_id,
+        "n_steps_scored": len(rewards),
+        "rewards": rewards,
+        "cum_reward": sum(rewards),
+        "success": bool(info.get("success", False)),
+        "done_step": done_step,
+        "message": message,
+        "checks_failed": info.get("checks_failed", []),
+        "original_cum_reward": summary.get("cum_reward"),
+        "original_terminated": summary.get("terminated"),
+    }
+
+
+def _rescore_episode_safe(args: tuple) -> dict:
+    exp_dir, task_file = args
+    try:
+        return rescore_episode(exp_dir, task_file)
+    except Exception as e:
+        logger.warning(f"Failed to re-score {exp_dir}: {e}")
+        return {"exp_dir": str(exp_dir), "error": str(e)}
+
+
+def rescore_study(
+    study_dirs: Union[str, Path, list],
+    task_file: Union[str, Path] = DEFAULT_TASK_FILE,
+    max_workers: Optional[int] = None,
+) -> list[dict]:
+    """
+    Re-score every episode of one or more studies in a process pool.
+
+    Args:
+        study_dirs: Study directory or list of them (experiment directories
+            are accepted as well)
+        task_file: Task definitions to score against
+        max_workers: Pool size (default: CPU count); 1 scores in-process
+
+    Returns:
+        One result dict per episode (see ``rescore_episode``), in directory
+        order; episodes that could not be read carry an ``error`` key instead
+    """
+    if isinstance(study_dirs, (str, Path)):
+        study_dirs = [study_dirs]
+    jobs = [
+        (str(exp_dir), str(task_file))
+        for study_dir in study_dirs
+        for exp_dir in iter_experiment_dirs(study_dir)
+    ]
+    if max_workers == 1 or len(jobs) <= 1:
+        return [_rescore_episode_safe(job) for job in jobs]
+
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        return list(pool.map(_rescore_episode_safe, jobs))
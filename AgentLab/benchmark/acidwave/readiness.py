@@ -0,0 +1,136 @@
+"""
+Page Readiness
+==============
+
+Event-driven replacement for fixed delays (``slow_mo``, selector timeouts,
+BrowserGym's ``pre_observation_delay``).
+
+A page counts as ready once no request is in flight and the DOM has not
+mutated for a short quiet window. ``PageReadiness`` tracks requests through
+Playwright's request events; DOM quiescence is awaited in the page with a
+MutationObserver. Both waits share one upper bound, so a page that never
+settles (e.g. a progress bar updating while a song plays) costs at most that
+bound, and a page that is already settled costs one quiet window.
+
+Example:
+    >>> readiness = PageReadiness(page)
+    >>> page.goto(url, wait_until="domcontentloaded")
+    >>> readiness.wait(timeout_ms=5000)
+    True
+"""
+
+import logging
+import time
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+# Upper bound for the page to settle after navigation (setup) and after an action
+DEFAULT_READY_TIMEOUT_MS = 5000
+DEFAULT_STEP_READY_TIMEOUT_MS = 2000
+
+# The DOM is quiet once it has not mutated for this long
+DEFAULT_QUIET_MS = 100
+
+# Requests that stay open while the page is usable (audio streaming, live updates)
+LONG_LIVED_RESOURCE_TYPES = frozenset({"media", "websocket", "eventsource"})
+
+# Resolves true after quietMs without mutations, false if timeoutMs passes first
+DOM_QUIET_JS = """
+({quietMs, timeoutMs}) => new Promise((resolve) => {
+    let quietTimer = null;
+    let capTimer = null;
+    const observer = new MutationObserver(() => {
+        clearTimeout(quietTimer);
+        quietTimer = setTimeout(() => finish(true), quietMs);
+    });
+    const finish = (quiet) => {
+        observer.disconnect();
+        clearTimeout(quietTimer);
+        clearTimeout(capTimer);
+        resolve(quiet);
+    };
+    observer.observe(document, {subtree: true, childList: true, attributes: true, characterData: true});
+    quietTimer = setTimeout(() => finish(true), quietMs);
+    capTimer = setTimeout(() => finish(false), timeoutMs);
+})
+"""
+
+
+class PageReadiness:
+    """
+    Network and DOM quiescence tracker of one page.
+
+    Attach it before navigating so requests started by the navigation are
+    counted. Request events are delivered while Playwright waits or
+    evaluates, so the in-flight count is current whenever ``wait`` checks it.
+    """
+
+    def __init__(self, page, quiet_ms: int = DEFAULT_QUIET_MS) -> None:
+        self.page = page
+        self.quiet_ms = quiet_ms
+        self._inflight: set = set()
+        page.on("request", self._on_request)
+        page.on("requestfinished", self._on_request_done)
+        page.on("requestfailed", self._on_request_done)
+
+    @property
+    def inflight(self) -> int:
+        """Number of requests in flight (long-lived resource types excluded)."""
+        return len(self._inflight)
+
+    def _on_request(self, request) -> None:
+        if request.resource_type not in LONG_LIVED_RESOURCE_TYPES:
+            self._inflight.add(request)
+
+    def _on_request_done(self, request) -> None:
+        self._inflight.discard(request)
+
+    def wait(self, timeout_ms: int = DEFAULT_READY_TIMEOUT_MS, quiet_ms: Optional[int] = None) -> bool:
+        """
+        Block until the network is idle and the DOM quiet, or ``timeout_ms`` passes.
+
+        Returns:
+            True if the page settled within the bound
+        """
+        quiet_ms = self.quiet_ms if quiet_ms is None else quiet_ms
+        deadline = time.monotonic() + timeout_ms / 1000
+        while True:
+            remaining_ms = int((deadline - time.monotonic()) * 1000)
+            if remaining_ms <= 0:
+                logger.debug(f"Page not ready after {timeout_ms}ms ({self.inflight} requests in flight)")
+                return False
+            if self._inflight:
+                # Lets Playwright deliver the pending request events
+                self.page.wait_for_timeout(min(quiet_ms, remaining_ms))
+                continue
+            try:
+                quiet = self.page.evaluate(DOM_QUIET_JS, {"quietMs": quiet_ms, "timeoutMs": remaining_ms})
+            except Exception as e:
+                # Context destroyed by a navigation: wait for the new document
+                logger.debug(f"Readiness check interrupted: {e}")
+                self._wait_for_document(remaining_ms)
+                continue
+            # Requests started while the DOM settled restart the wait
+            if quiet and not self._inflight:
+                return True
+
+    def _wait_for_document(self, timeout_ms: int) -> None:
+        try:
+            self.page.wait_for_load_state("domcontentloaded", timeout=max(timeout_ms, 1))
+        except Exception as e:
+            logger.debug(f"No document within {timeout_ms}ms: {e}")
+
+    def detach(self) -> None:
+        """Stop tracking requests."""
+        for event, handler in (
+            ("request", self._on_request),
+            ("requestfinished", self._on_request_done),
+            ("requestfailed", self._on_request_done),
+        ):
+            try:
+                self.page.remove_listener(event, handler)
+            except Exception:
+                pass
+        self._inflight.clear()
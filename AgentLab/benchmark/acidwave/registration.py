@@ -0,0 +1,243 @@
+"""
+Lazy Task Registration
+======================
+
+Registers Acidwave tasks with Gymnasium on demand instead of all at import.
+
+``install_lazy_registration()`` wraps Gymnasium's spec lookup so that
+``gym.make("browsergym/acidwave.task_<id>")`` registers that single task
+right before it is resolved. Registration state is kept in a set, so
+checking a task is O(1) and import cost does not depend on the number of
+tasks in test.raw.json. If Gymnasium has not been imported yet, the wrapper
+is installed when it is, so processes that never create environments (e.g.
+offline re-scoring) do not import it at all.
+
+Example:
+    >>> install_lazy_registration()
+    >>> env = gym.make("browsergym/acidwave.task_3")
+    >>> ensure_task_registered("acidwave.task_4")  # explicit, e.g. before gym.spec()
+    True
+
+Task IDs are looked up in test.raw.json and in the task files added with
+``add_task_file()`` (``AcidwaveBenchmark(task_file=...)`` does so). Added
+files are also listed in ``ACIDWAVE_TASK_FILES``, so worker processes
+started afterwards (Ray, joblib) resolve the same tasks. Added files are
+streamed up to the task instead of loaded as a catalog, so workers of a
+large suite never hold the whole suite in memory.
+"""
+
+import importlib.abc
+import importlib.util
+import logging
+import os
+import re
+import sys
+import threading
+from pathlib import Path
+from typing import Optional, Union
+
+from .catalog import DEFAULT_TASK_FILE, find_task_config, get_task_catalog
+
+logger = logging.getLogger(__name__)
+
+
+GYM_TASK_PREFIX = "acidwave.task_"
+
+# "acidwave.task_<id>", optionally namespaced ("browsergym/...") or versioned
+_GYM_TASK_ID = re.compile(r"(?:^|/)acidwave\.task_(\d+)(?:-v\d+)?$")
+
+# BrowserEnv default for registered tasks (seconds)
+PRE_OBSERVATION_DELAY = 0.0
+
+# Task files besides test.raw.json, separated by os.pathsep (inherited by workers)
+TASK_FILES_ENV = "ACIDWAVE_TASK_FILES"
+
+# Task IDs registered by this process
+_registered: set[int] = set()
+_registered_lock = threading.Lock()
+_lazy_registration_installed = False
+
+# Env IDs resolved by the _find_spec wrapper: the per-lookup fast path
+_ready_env_ids: set[str] = set()
+
+
+def task_files() -> list[Path]:
+    """Task files registration looks task IDs up in (test.raw.json first)."""
+    files = [DEFAULT_TASK_FILE.resolve()]
+    for entry in os.environ.get(TASK_FILES_ENV, "").split(os.pathsep):
+        if entry and Path(entry) not in files:
+            files.append(Path(entry))
+    return files
+
+
+def add_task_file(path: Union[str, Path]) -> Path:
+    """
+    Make the tasks of a task file resolvable by registration (idempotent).
+
+    Returns:
+        The absolute path of the task file
+    """
+    path = Path(path).resolve()
+    if path not in task_files():
+        os.environ[TASK_FILES_ENV] = os.pathsep.join(
+            entry for entry in (os.environ.get(TASK_FILES_ENV), str(path)) if entry
+        )
+    return path
+
+
+def _find_task_file(task_id: int) -> Optional[Path]:
+    """First known task file defining ``task_id``."""
+    default_file = DEFAULT_TASK_FILE.resolve()
+    for path in task_files():
+        try:
+            if path == default_file:
+                found = task_id in get_task_catalog(path)
+            else:
+                found = find_task_config(path, task_id) is not None
+            if found:
+                return path
+        except OSError as e:
+            logger.warning(f"Skipping unreadable task file {path}: {e}")
+    return None
+
+
+def gym_task_name(task_id: int) -> str:
+    """BrowserGym task name of a task (``acidwave.task_<id>``)."""
+    return f"{GYM_TASK_PREFIX}{task_id}"
+
+
+def parse_gym_task_id(env_id: str) -> Optional[int]:
+    """Task ID of an Acidwave env/task name, or None for other environments."""
+    match = _GYM_TASK_ID.search(env_id)
+    return int(match.group(1)) if match else None
+
+
+def register_acidwave_task(task_id: int, task_file: Union[str, Path, None] = None) -> bool:
+    """
+    Register one task with BrowserGym if this process has not done so yet.
+
+    The task file itself is not frozen into the registration: AcidwaveTask
+    receives it through ``task_kwargs`` at environment creation.
+
+    Args:
+        task_id: Task ID
+        task_file: Task file defining the task, added with ``add_task_file``
+            (None: any known task file)
+
+    Returns:
+        False if the task ID is not in any known task file
+    """
+    if task_file is not None:
+        add_task_file(task_file)
+    if task_id in _registered:
+        return True
+
+    with _registered_lock:
+        if task_id in _registered:
+            return True
+        if _find_task_file(task_id) is None:
+            return False
+
+        import gymnasium as gym
+        from browsergym.core.registration import register_task
+
+        from .task import AcidwaveTask
+
+        gym_id = gym_task_name(task_id)
+        # Registered elsewhere (e.g. an older eager registration): keep that spec
+        if f"browsergym/{gym_id}" not in gym.envs.registry:
+            # Note: Only pass task_id as frozen parameter
+            # start_url and goal will be passed at environment creation time
+            register_task(
+                gym_id,
+                AcidwaveTask,
+                task_kwargs={
+                    "task_id": task_id,
+                },
+                # AcidwaveTask.validate waits for the page to settle instead of
+                # BrowserEnv's fixed 0.5 s sleep before each observation
+                kwargs={"pre_observation_delay": PRE_OBSERVATION_DELAY},
+            )
+        _registered.add(task_id)
+    return True
+
+
+def ensure_task_registered(env_id: Union[str, int]) -> bool:
+    """
+    Register the Acidwave task behind an env ID, task name or task ID.
+
+    Returns:
+        True if ``env_id`` is a known Acidwave task (now registered)
+    """
+    task_id = env_id if isinstance(env_id, int) else parse_gym_task_id(env_id)
+    if task_id is None:
+        return False
+    return register_acidwave_task(task_id)
+
+
+def wrap_find_spec(original_find_spec):
+    """
+    Wrap a Gymnasium ``_find_spec`` so Acidwave env IDs are registered before lookup.
+
+    Constant time (one set lookup) for env IDs already resolved.
+    """
+
+    def _find_spec(env_id: str):
+        if env_id not in _ready_env_ids and GYM_TASK_PREFIX in env_id:
+            try:
+                if ensure_task_registered(env_id):
+                    _ready_env_ids.add(env_id)
+            except Exception as e:
+                logger.warning(f"Failed to register {env_id}: {e}")
+        return original_find_spec(env_id)
+
+    _find_spec.__wrapped__ = original_find_spec
+    return _find_spec
+
+
+def _patch_find_spec(registration) -> None:
+    """Wrap ``gymnasium.envs.registration._find_spec`` (once per process)."""
+    global _lazy_registration_installed
+    if _lazy_registration_installed:
+        return
+
+    registration._find_spec = wrap_find_spec(registration._find_spec)
+    _lazy_registration_installed = True
+
+
+class _GymnasiumImportHook(importlib.abc.MetaPathFinder):
+    """Patches Gymnasium's registration module right after it is first imported."""
+
+    def find_spec(self, fullname, path, target=None):
+        if fullname != "gymnasium.envs.registration":
+            return None
+        sys.meta_path.remove(self)
+        spec = importlib.util.find_spec(fullname)
+        if spec is None or spec.loader is None:
+            return spec
+
+        exec_module = spec.loader.exec_module
+
+        def _exec_module(module):
+            exec_module(module)
+            _patch_find_spec(module)
+
+        spec.loader.exec_module = _exec_module
+        return spec
+
+
+def install_lazy_registration() -> None:
+    """
+    Make Gymnasium register Acidwave tasks on first lookup (idempotent).
+
+    Does not import Gymnasium: if it is not imported yet, the lookup is
+    patched as soon as it is.
+    """
+    if _lazy_registration_installed:
+        return
+
+    registration = sys.modules.get("gymnasium.envs.registration")
+    if registration is not None:
+        _patch_find_spec(registration)
+    elif not any(isinstance(finder, _GymnasiumImportHook) for finder in sys.meta_path):
+        sys.meta_path.insert(0, _GymnasiumImportHook())
@@ -0,0 +1,162 @@
+"""
+Resource Policy
+===============
+
+Request routing that keeps the Acidwave frontend from downloading what the
+evaluators never read.
+
+Validation only looks at text, attributes and the URL, but every page
+streams audio and loads album covers and avatars. Under the default "lean"
+policy ``AcidwaveTask.setup`` routes the page's requests through
+``ResourceRouter``, which:
+    - aborts audio/video streams (``media``) and web fonts (``font``)
+    - answers cross-origin images with a 1x1 transparent GIF, so ``<img>``
+      elements still load (no ``onerror`` fallbacks, no layout changes)
+    - lets everything else through, including navigations, so a link to an
+      ``.mp3`` file still navigates (url_match tasks)
+
+Only URLs that can be one of these resources are routed: audio, video and
+font files by extension, and images by extension or on the cover / avatar
+hosts (same-origin images are passed back). Documents, scripts and API
+calls never reach Python. Playwright still disables the browser's HTTP
+cache while any route is installed, so the app's own assets are refetched
+on every page load; when that outweighs the streams and covers avoided
+(e.g. a remote deployment with warm caches), use ``resource_policy="full"``.
+
+A task that depends on playback (or images, fonts) lists the resource types
+it needs in its config, e.g. ``"resource_policy": {"allow": ["media"]}``;
+``resource_policy="full"`` disables routing for a whole run.
+
+Example:
+    >>> router = ResourceRouter.for_task(task_config, start_url, policy="lean")
+    >>> router.install(page)
+    >>> router.counts
+    {'aborted': 4, 'stubbed': 12, 'passed': 1}
+"""
+
+import base64
+import logging
+import re
+from typing import Iterable, Optional
+from urllib.parse import urlsplit
+
+logger = logging.getLogger(__name__)
+
+
+RESOURCE_POLICIES = ("lean", "full")
+
+# Resource types handled under the "lean" policy
+ABORTED_RESOURCE_TYPES = frozenset({"media", "font"})
+STUBBED_RESOURCE_TYPES = frozenset({"image"})
+
+# URLs routed per resource type: only these reach the Python handler
+_AUDIO_VIDEO_URL = re.compile(r"\.(?:mp3|ogg|oga|wav|m4a|aac|flac|opus|mp4|webm)(?:[?#]|$)", re.IGNORECASE)
+_FONT_URL = re.compile(r"\.(?:woff2?|ttf|otf|eot)(?:[?#]|$)", re.IGNORECASE)
+_IMAGE_URL = re.compile(r"\.(?:png|jpe?g|gif|webp|avif|svg)(?:[?#]|$)", re.IGNORECASE)
+
+# Cover and avatar hosts of the catalog (image URLs without an extension)
+IMAGE_HOSTS = ("images.unsplash.com", "api.dicebear.com")
+
+_TRANSPARENT_GIF = base64.b64decode("R0lGODlhAQABAIAAAAAAAP///yH5BAEAAAAALAAAAAABAAEAAAIBRAA7")
+
+
+def _origin(url: str) -> tuple:
+    parts = urlsplit(url)
+    return parts.scheme, parts.netloc
+
+
+class ResourceRouter:
+    """
+    Playwright route handler applying one task's resource policy.
+
+    Same-origin images (the app's own icons and assets) are passed through;
+    only images from other origins (cover and avatar CDNs) are stubbed.
+    """
+
+    def __init__(
+        self,
+        start_url: str,
+        abort_types: Iterable[str] = ABORTED_RESOURCE_TYPES,
+        stub_types: Iterable[str] = STUBBED_RESOURCE_TYPES,
+    ) -> None:
+        self.app_origin = _origin(start_url)
+        self.abort_types = frozenset(abort_types)
+        self.stub_types = frozenset(stub_types)
+        # "passed": routed requests let through (navigations, same-origin images, ...)
+        self.counts = {"aborted": 0, "stubbed": 0, "passed": 0}
+        self._page = None
+        self._patterns: list = []
+
+    @classmethod
+    def for_task(cls, task_config: dict, start_url: str, policy: str = "lean") -> Optional["ResourceRouter"]:
+        """
+        Router for a task's config and the run's policy.
+
+        Returns:
+            None if nothing would be intercepted (policy "full", or the task
+            allows every handled resource type)
+
+        Raises:
+            ValueError: If policy is unknown
+        """
+        if policy not in RESOURCE_POLICIES:
+            raise ValueError(f"Unknown resource policy '{policy}', expected one of {RESOURCE_POLICIES}")
+        if policy == "full":
+            return None
+        allowed = frozenset((task_config.get("resource_policy") or {}).get("allow", ()))
+        abort_types = ABORTED_RESOURCE_TYPES - allowed
+        stub_types = STUBBED_RESOURCE_TYPES - allowed
+        if not abort_types and not stub_types:
+            return None
+        return cls(start_url, abort_types, stub_types)
+
+    def url_patterns(self) -> list:
+        """URL patterns of the requests this policy may abort or stub."""
+        patterns = []
+        if "media" in self.abort_types:
+            patterns.append(_AUDIO_VIDEO_URL)
+        if "font" in self.abort_types:
+            patterns.append(_FONT_URL)
+        if "image" in self.stub_types or "image" in self.abort_types:
+            patterns.append(_IMAGE_URL)
+            patterns.extend(f"*://{host}/**" for host in IMAGE_HOSTS)
+        return patterns
+
+    def install(self, page) -> None:
+        """Route the requests of ``page`` this policy handles."""
+        self._page = page
+        self._patterns = self.url_patterns()
+        for pattern in self._patterns:
+            page.route(pattern, self._handle)
+
+    def uninstall(self) -> None:
+        if self._page is None:
+            return
+        for pattern in self._patterns:
+            try:
+                self._page.unroute(pattern, self._handle)
+            except Exception as e:
+                # The page (or its context) is already closed
+                logger.debug(f"Could not remove resource routing: {e}")
+                break
+        self._page = None
+
+    def _handle(self, route) -> None:
+        request = route.request
+        resource_type = request.resource_type
+        try:
+            # Navigations always go through (e.g. following a link to an .mp3)
+            if not request.is_navigation_request():
+                if resource_type in self.abort_types:
+                    self.counts["aborted"] += 1
+                    route.abort("blockedbyclient")
+                    return
+                if resource_type in self.stub_types and _origin(request.url) != self.app_origin:
+                    self.counts["stubbed"] += 1
+                    route.fulfill(status=200, content_type="image/gif", body=_TRANSPARENT_GIF)
+                    return
+            self.counts["passed"] += 1
+            route.continue_()
+        except Exception as e:
+            # Page closed while the request was in flight
+            logger.debug(f"Resource routing failed for {request.url}: {e}")
@@ -0,0 +1,145 @@
+"""
+Task Scheduling
+===============
+
+Predicted task durations and longest-first ordering of a benchmark's tasks.
+
+With ``n_jobs > 1`` experiments are dispatched to workers in list order, so
+a long task that starts last stretches the makespan. Ordering tasks by
+decreasing predicted duration (the LPT rule) keeps the study's wall-clock
+time close to the lower bound ``max(longest task, total / n_workers)``.
+
+A task's predicted duration (seconds of ``stats.cum_step_elapsed``) is,
+in order of preference:
+    1. its median ``stats.cum_step_elapsed`` in earlier runs
+    2. its median ``n_steps`` in earlier runs x seconds per step
+    3. the step prior of its difficulty x seconds per step
+where seconds per step is the median over the history (or a default).
+
+Example:
+    >>> history = load_task_history(["agentlab_results"])
+    >>> durations = predict_task_durations(benchmark, history)
+    >>> longest_first(benchmark, durations)
+"""
+
+import heapq
+import json
+import logging
+import statistics
+from collections import defaultdict
+from pathlib import Path
+from typing import Iterable, Optional, Union
+
+from .offline import parse_task_id
+
+logger = logging.getLogger(__name__)
+
+
+# Median n_steps per difficulty (GPT-4o / GPT-4o-mini studies of 2025-12-14)
+DIFFICULTY_STEP_PRIORS = {"easy": 2.0, "medium": 3.0, "hard": 8.5}
+DEFAULT_STEP_PRIOR = 3.0
+
+# Median stats.cum_step_elapsed / n_steps of the same studies
+DEFAULT_SECONDS_PER_STEP = 3.0
+
+
+def load_task_history(results_dirs: Iterable[Union[str, Path]]) -> dict[int, dict]:
+    """
+    Median past duration and step count of each task found under ``results_dirs``.
+
+    Args:
+        results_dirs: Results roots, study directories or experiment directories
+
+    Returns:
+        Task ID -> ``{"cum_step_elapsed": float | None, "n_steps": float | None}``
+    """
+    elapsed = defaultdict(list)
+    n_steps = defaultdict(list)
+    for results_dir in results_dirs:
+        results_dir = Path(results_dir)
+        if not results_dir.is_dir():
+            logger.warning(f"Cost history directory not found: {results_dir}")
+            continue
+        for summary_file in sorted(results_dir.glob("**/summary_info.json")):
+            try:
+                task_id = parse_task_id(summary_file.parent)
+                with open(summary_file, 'r', encoding='utf-8') as f:
+                    summary = json.load(f)
+            except (ValueError, OSError) as e:
+                logger.debug(f"Skipping {summary_file}: {e}")
+                continue
+            value = summary.get("stats.cum_step_elapsed")
+            if isinstance(value, (int, float)) and value >= 0:
+                elapsed[task_id].append(float(value))
+            value = summary.get("n_steps")
+            if isinstance(value, (int, float)) and value > 0:
+                n_steps[task_id].append(float(value))
+
+    return {
+        task_id: {
+            "cum_step_elapsed": statistics.median(elapsed[task_id]) if elapsed[task_id] else None,
+            "n_steps": statistics.median(n_steps[task_id]) if n_steps[task_id] else None,
+        }
+        for task_id in set(elapsed) | set(n_steps)
+    }
+
+
+def seconds_per_step(history: dict[int, dict]) -> float:
+    """Median seconds per step over tasks with both duration and step count."""
+    rates = [
+        record["cum_step_elapsed"] / record["n_steps"]
+        for record in history.values()
+        if record["cum_step_elapsed"] is not None and record["n_steps"]
+    ]
+    return statistics.median(rates) if rates else DEFAULT_SECONDS_PER_STEP
+
+
+def predict_task_durations(
+    tasks: Iterable[dict],
+    history: Optional[dict[int, dict]] = None,
+) -> dict[int, float]:
+    """
+    Predicted duration in seconds of each task.
+
+    Args:
+        tasks: Task dicts with ``task_id`` and ``difficulty``
+        history: Output of ``load_task_history`` (None: priors only)
+
+    Returns:
+        Task ID -> predicted seconds
+    """
+    history = history or {}
+    step_seconds = seconds_per_step(history)
+    durations = {}
+    for task in tasks:
+        record = history.get(task["task_id"], {})
+        if record.get("cum_step_elapsed") is not None:
+            durations[task["task_id"]] = record["cum_step_elapsed"]
+        elif record.get("n_steps"):
+            durations[task["task_id"]] = record["n_steps"] * step_seconds
+        else:
+            difficulty = str(task.get("difficulty", "unknown")).lower()
+            steps = DIFFICULTY_STEP_PRIORS.get(difficulty, DEFAULT_STEP_PRIOR)
+            durations[task["task_id"]] = steps * step_seconds
+    return durations
+
+
+def longest_first(tasks: Iterable[dict], durations: dict[int, float]) -> list[dict]:
+    """Tasks by decreasing predicted duration (ties in task ID order)."""
+    return sorted(tasks, key=lambda task: (-durations.get(task["task_id"], 0.0), task["task_id"]))
+
+
+def makespan_lower_bound(durations: Iterable[float], n_workers: int) -> float:
+    """``max(longest task, total / n_workers)``: no schedule finishes sooner."""
+    durations = list(durations)
+    if not durations:
+        return 0.0
+    return max(max(durations), sum(durations) / max(n_workers, 1))
+
+
+def simulate_makespan(durations: Iterable[float], n_workers: int) -> float:
+    """Wall-clock time of dispatching tasks in order to the first idle of ``n_workers``."""
+    finish_times = [0.0] * max(n_workers, 1)
+    for duration in durations:
+        heapq.heapreplace(finish_times, finish_times[0] + duration)
+    return max(finish_times)
@@ -0,0 +1,181 @@
+"""
+Task Scoring
+============
+
+WebArena-style scoring of a page state against a compiled EvalPlan.
+
+The page state is anything exposing ``url``, ``text`` (body text) and
+``probe_html_checks(checks)``: a live ``PageSnapshot`` during a run, or a
+stored observation when re-scoring trajectories offline.
+
+The plan's evaluators run cheapest first and their scores are
+min-aggregated. Once one scores 0 the reward is decided, so the remaining
+(more expensive) evaluators are skipped.
+
+``text_changed`` checks compare against text hashes recorded from the page
+state right after setup (``record_text_baselines``).
+
+The info dict reports where validation time went under ``timings``:
+``total_ms``, ``evaluators`` (ms per eval type, including page captures
+triggered by the evaluator) and ``checks`` (ms per program_html check as
+measured by the probe).
+"""
+
+import logging
+import time
+from typing import Optional
+
+from .eval_plan import EvalPlan
+from .evaluators import EvalContext
+from .keywords import count_found_terms
+
+logger = logging.getLogger(__name__)
+
+
+def record_text_baselines(plan: EvalPlan, state) -> dict[str, Optional[int]]:
+    """
+    Hash the text of every element a ``text_changed`` check references.
+
+    Returns:
+        Dict mapping locator to text hash (None if the element is absent);
+        locators that could not be probed are left out
+    """
+    checks = plan.text_changed_checks
+    if not checks:
+        return {}
+
+    baselines = {}
+    for check, probe in zip(checks, state.probe_html_checks(checks)):
+        if "error" in probe:
+            logger.warning(f"Could not record text baseline for '{check.locator}': {probe['error']}")
+            continue
+        baselines[check.locator] = probe.get("text_hash") if probe["count"] else None
+    return baselines
+
+
+def score_page(
+    plan: EvalPlan,
+    state,
+    task_id: int,
+    goal_terms: tuple[str, ...],
+    text_baselines: Optional[dict[str, Optional[int]]] = None,
+) -> tuple[float, bool, str, dict]:
+    """
+    Score a page state against a task's EvalPlan.
+
+    Args:
+        plan: Compiled eval plan of the task
+        state: Page state (``url``, ``text``, ``probe_html_checks``)
+        task_id: Task ID, reported in logs and the info dict
+        goal_terms: Goal terms (``keywords.goal_terms``) for the heuristic fallback
+        text_baselines: Setup-time text hashes for ``text_changed`` checks
+
+    Returns:
+        Tuple of (reward, done, message, info_dict)
+    """
+    start = time.perf_counter()
+    ctx = EvalContext(text_baselines=text_baselines)
+    evaluator_ms = {}
+
+    # Initialize validation result
+    reward = 0.0
+    success = False
+    message = "Task not completed"
+
+    # Track individual evaluation scores
+    scores = {}
+    skipped = []
+
+    for evaluator in plan.evaluators:
+        if scores and min(scores.values()) <= 0.0:
+            # min() aggregation is already decided
+            skipped.append(evaluator.eval_type)
+            continue
+        evaluator_start = time.perf_counter()
+        scores[evaluator.eval_type] = evaluator.evaluate(state, ctx)
+        evaluator_ms[evaluator.eval_type] = (time.perf_counter() - evaluator_start) * 1000
+
+    # ==========================================
+    # CALCULATE FINAL REWARD
+    # ==========================================
+    # 如果任务使用多种评估类型，需要综合考虑所有类型的得分
+    # 策略：取所有有效评估类型的最小值（AND逻辑），确保所有条件都满足
+
+    if scores:
+        # 使用最小值策略：所有评估都必须通过
+        reward = min(scores.values())
+        # 如果所有评估类型都接近完美，才算成功
+        success = all(score >= 0.95 for score in scores.values())
+    else:
+        # 没有有效评估，使用启发式
+        reward = 0.0
+
+    # ==========================================
+    # DEFAULT: Heuristic Check
+    # ==========================================
+    if plan.uses_heuristic:
+        logger.warning(f"No evaluation type or checks failed for task {task_id}")
+        heuristic_start = time.perf_counter()
+        # Check if goal keywords are present
+        found_keywords = count_found_terms(goal_terms, state.text)
+        evaluator_ms["heuristic"] = (time.perf_counter() - heuristic_start) * 1000
+        reward = min(1.0, found_keywords / max(len(goal_terms), 1))
+        success = reward > 0.7
+        message = f"Heuristic evaluation: {found_keywords}/{len(goal_terms)} keywords found"
+
+    # ==========================================
+    # Build Final Message
+    # ==========================================
+    # 评估策略：需要所有检查都通过才算成功
+
+    if reward >= 0.98:
+        # 几乎完美完成
+        success = True
+        done = True
+        message = "✅ Task completed successfully"
+    elif reward >= 0.9:
+        # 所有关键检查通过，允许微小误差
+        success = True
+        done = True
+        message = f"✅ Task completed (score: {reward:.2f})"
+    elif reward >= 0.7:
+        # 大部分完成但不够完美，继续尝试
+        success = False
+        done = False
+        message = f"⚠️  Task mostly completed (score: {reward:.2f}), but not all checks passed. Continue..."
+    elif reward > 0:
+        # 部分完成，继续尝试
+        success = False
+        done = False
+        message = f"⚠️  Task in progress (score: {reward:.2f}), {len(ctx.checks_passed)}/{len(ctx.checks_passed) + len(ctx.checks_failed)} checks passed. Continue..."
+    else:
+        # 完全失败，继续尝试（除非超过max_steps）
+        success = False
+        done = False
+        message = f"❌ Task not completed (score: {reward:.2f}). Keep trying..."
+
+    # Add check details to message
+    if ctx.checks_passed or ctx.checks_failed:
+        message += f"\n   Passed: {len(ctx.checks_passed)}, Failed: {len(ctx.checks_failed)}"
+        if ctx.checks_failed and len(ctx.checks_failed) <= 3:
+            message += f"\n   Issues: {'; '.join(ctx.checks_failed)}"
+
+    logger.info(f"Task {task_id} validation: reward={reward:.2f}, done={done}, success={success}")
+    logger.debug(f"Passed checks: {ctx.checks_passed}")
+    logger.debug(f"Failed checks: {ctx.checks_failed}")
+
+    info = {
+        "reward": reward,
+        "success": success,
+        "task_id": task_id,
+        "checks_passed": ctx.checks_passed,
+        "checks_failed": ctx.checks_failed,
+        "skipped_evaluators": skipped,
+        "page_url": state.url,
+        "timings": {
+            "total_ms": (time.perf_counter() - start) * 1000,
+            "evaluators": evaluator_ms,
+            "checks": ctx.check_timings,
+        },
+    }
+    return reward, done, message, info
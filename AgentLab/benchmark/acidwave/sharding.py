@@ -0,0 +1,98 @@
+"""
+Benchmark Sharding
+==================
+
+Deterministic partitioning of Acidwave tasks across machines.
+
+Tasks are split with the longest-processing-time-first rule: sorted by
+historical cost (``stats.cum_step_elapsed`` from prior ``summary_info.json``
+files, median per task), each task goes to the currently lightest shard.
+Ties are broken by task ID and shard index, so every node computes the
+same partition from the same history. Tasks without history get the median
+cost of the known ones; ``AcidwaveBenchmark`` passes the durations predicted
+by ``scheduling.predict_task_durations`` instead, which covers every task.
+
+Example:
+    >>> costs = load_task_costs(["agentlab_results"])
+    >>> shards = assign_shards(range(16), num_shards=3, costs=costs)
+    >>> shard_task_ids(range(16), shard_index=0, num_shards=3, costs=costs)
+    [4, 6, 9, 11]
+"""
+
+import heapq
+import statistics
+from pathlib import Path
+from typing import Iterable, Optional, Union
+
+from .scheduling import load_task_history
+
+
+def load_task_costs(results_dirs: Iterable[Union[str, Path]]) -> dict[int, float]:
+    """
+    Median historical ``stats.cum_step_elapsed`` of each task found under ``results_dirs``.
+
+    Tasks without a usable summary are absent; see
+    ``scheduling.predict_task_durations`` for estimates that cover every task.
+    """
+    history = load_task_history(results_dirs)
+    return {
+        task_id: record["cum_step_elapsed"]
+        for task_id, record in history.items()
+        if record["cum_step_elapsed"] is not None
+    }
+
+
+def assign_shards(
+    task_ids: Iterable[int],
+    num_shards: int,
+    costs: Optional[dict[int, float]] = None,
+) -> list[list[int]]:
+    """
+    Partition task IDs into ``num_shards`` shards of similar total cost.
+
+    Args:
+        task_ids: Tasks to distribute
+        num_shards: Number of shards
+        costs: Task ID -> cost (see ``load_task_costs``); without costs tasks
+            are spread round-robin by ID
+
+    Returns:
+        Task IDs of each shard, each list in ascending ID order
+
+    Raises:
+        ValueError: If num_shards is not positive
+    """
+    if num_shards < 1:
+        raise ValueError(f"num_shards must be positive (got {num_shards})")
+    costs = costs or {}
+    task_ids = sorted(set(task_ids))
+    known = [costs[task_id] for task_id in task_ids if task_id in costs]
+    default_cost = statistics.median(known) if known else 1.0
+
+    # Longest first; equal costs in ID order
+    ordered = sorted(task_ids, key=lambda task_id: (-costs.get(task_id, default_cost), task_id))
+
+    shards = [[] for _ in range(num_shards)]
+    loads = [(0.0, index) for index in range(num_shards)]
+    for task_id in ordered:
+        load, index = heapq.heappop(loads)
+        shards[index].append(task_id)
+        heapq.heappush(loads, (load + costs.get(task_id, default_cost), index))
+    return [sorted(shard) for shard in shards]
+
+
+def shard_task_ids(
+    task_ids: Iterable[int],
+    shard_index: int,
+    num_shards: int,
+    costs: Optional[dict[int, float]] = None,
+) -> list[int]:
+    """
+    Task IDs of one shard (see ``assign_shards``).
+
+    Raises:
+        ValueError: If shard_index is not in [0, num_shards)
+    """
+    if not 0 <= shard_index < num_shards:
+        raise ValueError(f"shard_index must be in [0, {num_shards}) (got {shard_index})")
+    return assign_shards(task_ids, num_shards, costs)[shard_index]
@@ -0,0 +1,105 @@
+"""
+Page Snapshots
+==============
+
+Lazy, memoized view of the page state used during validation.
+
+``setup()`` installs a MutationObserver-backed DOM version counter in every
+document. A snapshot only serializes body text or full HTML the first time an
+evaluator asks for it, and the task keeps handing out the same snapshot while
+the (url, document, DOM version) key is unchanged, so every consumer within a
+step shares one serialization.
+"""
+
+import logging
+from typing import Optional
+
+from .html_checks import probe_check_with_locator, probe_checks_batched
+
+logger = logging.getLogger(__name__)
+
+
+# Installed via page.add_init_script so it runs in every new document. The
+# random token distinguishes documents, since the counter restarts at 0 after
+# each navigation.
+DOM_VERSION_INIT_JS = """
+(() => {
+    if (window.__acidwaveDom) return;
+    const state = {doc: Math.random().toString(36).slice(2), version: 0};
+    window.__acidwaveDom = state;
+    new MutationObserver(() => { state.version += 1; }).observe(document, {
+        subtree: true, childList: true, attributes: true, characterData: true,
+    });
+})();
+"""
+
+DOM_VERSION_JS = "() => window.__acidwaveDom ? [window.__acidwaveDom.doc, window.__acidwaveDom.version] : null"
+
+
+def install_dom_version_counter(page) -> None:
+    """Install the DOM version counter for future documents and the current one."""
+    page.add_init_script(script=DOM_VERSION_INIT_JS)
+    try:
+        page.evaluate(DOM_VERSION_INIT_JS)
+    except Exception as e:
+        # about:blank before the first navigation, or a page mid-navigation
+        logger.debug(f"Could not install DOM version counter on current document: {e}")
+
+
+def read_dom_version(page) -> Optional[tuple]:
+    """
+    Return ``(document_token, version)`` for the current document.
+
+    Returns None if the counter is not installed or the page cannot be
+    evaluated (e.g. during a navigation).
+    """
+    try:
+        value = page.evaluate(DOM_VERSION_JS)
+    except Exception:
+        return None
+    return tuple(value) if value else None
+
+
+class PageSnapshot:
+    """
+    Lazily captured page state for a single DOM version.
+
+    Attributes are fetched from the page on first access and memoized:
+        url: Current page URL (no browser roundtrip)
+        text: ``page.inner_text("body")``
+        html: ``page.content()``
+    """
+
+    def __init__(self, page, key: Optional[tuple] = None, html_eval_mode: str = "batched") -> None:
+        self.page = page
+        self.key = key
+        self.html_eval_mode = html_eval_mode
+        self.url = page.url
+        self._text: Optional[str] = None
+        self._html: Optional[str] = None
+
+    @property
+    def text(self) -> str:
+        if self._text is None:
+            self._text = self.page.inner_text("body")
+        return self._text
+
+    @property
+    def html(self) -> str:
+        if self._html is None:
+            self._html = self.page.content()
+        return self._html
+
+    def probe_html_checks(self, checks) -> list[dict]:
+        """Collect the element facts each program_html check is scored on."""
+        if self.html_eval_mode == "batched":
+            return probe_checks_batched(self.page, checks)
+        return [probe_check_with_locator(self.page, check) for check in checks]
+
+
+def snapshot_key(page) -> Optional[tuple]:
+    """Key identifying the page state, or None if it cannot be determined."""
+    dom_version = read_dom_version(page)
+    if dom_version is None:
+        return None
+    return (id(page), page.url, *dom_version)
@@ -0,0 +1,167 @@
+"""
+App State Reset
+===============
+
+Per-task reset of the Acidwave app state in well under a second, instead of
+``docker-compose down`` / ``up`` (which restarts the containers but leaves
+the Supabase data untouched).
+
+State lives in two places:
+    - the browser: cookies and ``localStorage`` (current user, registered
+      users, favorites backup). A storage snapshot (Playwright's
+      ``storage_state`` JSON) is captured once and applied to the fresh
+      context of every task before the app loads.
+    - the backend: playlists and favorites. A reset hook checkpoints them
+      once per study and restores the checkpoint before each task that has
+      ``require_reset``. ``HttpResetHook`` uses the backend's
+      ``/api/state`` routes (enabled with ``ENABLE_STATE_RESET=true``);
+      ``CommandResetHook`` runs shell commands for other setups (e.g.
+      ``pg_dump`` / ``pg_restore`` against a local database).
+
+Example:
+    >>> hook = make_reset_hook("http://localhost:3000/api")
+    >>> hook.checkpoint()
+    >>> capture_storage_state(page.context, "acidwave_state.json")
+    >>> # per task, before page.goto(start_url):
+    >>> restore_storage_state(page, load_storage_state("acidwave_state.json"))
+    >>> hook.restore()
+"""
+
+import json
+import logging
+import subprocess
+import threading
+import urllib.error
+import urllib.request
+from pathlib import Path
+from typing import Optional, Union
+
+logger = logging.getLogger(__name__)
+
+
+# localStorage is restored once per tab: sessionStorage survives reloads, so
+# reloads during an episode keep what the agent changed
+_RESTORE_LOCAL_STORAGE_JS = """
+(origins) => {
+    const flag = "__acidwaveStateRestored";
+    const entries = origins[window.location.origin];
+    if (!entries || window.sessionStorage.getItem(flag)) return;
+    window.localStorage.clear();
+    for (const {name, value} of entries) window.localStorage.setItem(name, value);
+    window.sessionStorage.setItem(flag, "1");
+}
+"""
+
+
+def capture_storage_state(context, path: Union[str, Path]) -> dict:
+    """Write the cookies and localStorage of a browser context to ``path``."""
+    state = context.storage_state(path=str(path))
+    logger.info(
+        f"Captured storage state to {path}: {len(state.get('cookies', []))} cookies, "
+        f"{len(state.get('origins', []))} origins"
+    )
+    return state
+
+
+# path -> ((mtime_ns, size), state)
+_storage_states: dict[Path, tuple] = {}
+_storage_states_lock = threading.Lock()
+
+
+def load_storage_state(path: Union[str, Path]) -> dict:
+    """Parsed storage snapshot (cached per process until the file changes)."""
+    path = Path(path).resolve()
+    stat = path.stat()
+    stamp = (stat.st_mtime_ns, stat.st_size)
+    cached = _storage_states.get(path)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+    with _storage_states_lock:
+        with open(path, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+        _storage_states[path] = (stamp, state)
+    return state
+
+
+def restore_storage_state(page, state: dict) -> None:
+    """
+    Apply a storage snapshot to ``page`` before its first navigation.
+
+    Cookies are added to the page's context; localStorage is written by an
+    init script before the app's own scripts run.
+    """
+    if state.get("cookies"):
+        page.context.add_cookies(state["cookies"])
+    origins = {
+        entry["origin"]: entry.get("localStorage", [])
+        for entry in state.get("origins", [])
+    }
+    if origins:
+        page.add_init_script(script=f"({_RESTORE_LOCAL_STORAGE_JS})({json.dumps(origins)})")
+
+
+class HttpResetHook:
+    """Backend checkpoint/restore through the ``/api/state`` routes."""
+
+    def __init__(self, api_url: str = "http://localhost:3000/api", timeout: float = 10.0) -> None:
+        self.api_url = api_url.rstrip("/")
+        self.timeout = timeout
+
+    def _post(self, action: str) -> dict:
+        request = urllib.request.Request(f"{self.api_url}/state/{action}", data=b"", method="POST")
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                result = json.loads(response.read().decode("utf-8"))
+        except urllib.error.HTTPError as e:
+            # 404: routes not enabled (ENABLE_STATE_RESET), 409: no checkpoint yet
+            raise RuntimeError(f"Backend state {action} failed: HTTP {e.code} {e.read().decode('utf-8', 'replace')[:200]}")
+        if not result.get("success"):
+            raise RuntimeError(f"Backend state {action} failed: {result.get('error')}")
+        return result
+
+    def checkpoint(self) -> dict:
+        return self._post("checkpoint")
+
+    def restore(self) -> dict:
+        return self._post("restore")
+
+    def __repr__(self) -> str:
+        return f"HttpResetHook({self.api_url!r})"
+
+
+class CommandResetHook:
+    """Backend checkpoint/restore by shell commands."""
+
+    def __init__(self, restore_command: str, checkpoint_command: Optional[str] = None, timeout: float = 30.0) -> None:
+        self.restore_command = restore_command
+        self.checkpoint_command = checkpoint_command
+        self.timeout = timeout
+
+    def _run(self, command: str) -> dict:
+        result = subprocess.run(command, shell=True, capture_output=True, text=True, timeout=self.timeout)
+        if result.returncode != 0:
+            raise RuntimeError(f"Reset command failed ({result.returncode}): {command}\n{result.stderr[-1000:]}")
+        return {"success": True, "stdout": result.stdout}
+
+    def checkpoint(self) -> dict:
+        if self.checkpoint_command is None:
+            return {"success": True}
+        return self._run(self.checkpoint_command)
+
+    def restore(self) -> dict:
+        return self._run(self.restore_command)
+
+    def __repr__(self) -> str:
+        return f"CommandResetHook({self.restore_command!r})"
+
+
+def make_reset_hook(spec: Optional[str]):
+    """
+    Reset hook from a spec string: an ``http(s)://`` backend API URL, or a
+    shell command that restores the backend data (None: no hook).
+    """
+    if not spec:
+        return None
+    if spec.startswith(("http://", "https://")):
+        return HttpResetHook(spec)
+    return CommandResetHook(spec)
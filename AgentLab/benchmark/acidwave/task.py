@@ -6,64 +6,34 @@ Defines the task class for Acidwave benchmark.
 Based on BrowserGym's AbstractBrowserTask.
 """
 
-import json
+from __future__ import annotations
+
 import logging
-import os
-from pathlib import Path
-from typing import Optional
-import playwright.sync_api
+import time
+from typing import TYPE_CHECKING, Optional
 
 from browsergym.core.task import AbstractBrowserTask
 
-logger = logging.getLogger(__name__)
-
-
-# CRITICAL: Auto-register all Acidwave tasks when this module is imported
-# This ensures tasks are available even in Ray workers
-def _ensure_tasks_registered():
-    """Ensure all Acidwave tasks are registered with Gymnasium."""
-    try:
-        import gymnasium as gym
-        from browsergym.core.registration import register_task
-        
-        # Check if tasks are already registered
-        registry = gym.envs.registry
-        acidwave_tasks = [env_id for env_id in registry if 'acidwave' in env_id]
-        
-        if acidwave_tasks:
-            # Tasks already registered
-            #logger.debug(f"[task.py] Acidwave tasks already registered ({len(acidwave_tasks)} tasks)")
-            return
-        
-        # Load and register all tasks
-        task_file = Path(__file__).parent / "test.raw.json"
-        with open(task_file, 'r', encoding='utf-8') as f:
-            all_tasks = json.load(f)
-        
-        for task_config in all_tasks:
-            task_id = task_config["task_id"]
-            gym_id = f"acidwave.task_{task_id}"
-            
-            # Register with BrowserGym (will be idempotent due to Gymnasium)
-            try:
-                register_task(
-                    gym_id,
-                    "benchmark.acidwave.task:AcidwaveTask",  # Use string to avoid circular import
-                    task_kwargs={
-                        "task_id": task_id,
-                    },
-                )
-            except Exception:
-                pass  # Task might already be registered
-        
-        #print(f"[task.py] Registered {len(all_tasks)} Acidwave tasks in PID {os.getpid()}")
-        
-    except Exception as e:
-        logger.warning(f"[task.py] Failed to auto-register tasks: {e}")
-
+from .catalog import get_task_catalog
+from .eval_plan import EvalPlan, compile_eval_plan
+from .har import DEFAULT_HAR_URL, HAR_MODES, install_har, task_har_path
+from .html_checks import HTML_EVAL_MODES
+from .keywords import goal_terms
+from .readiness import (
+    DEFAULT_QUIET_MS,
+    DEFAULT_READY_TIMEOUT_MS,
+    DEFAULT_STEP_READY_TIMEOUT_MS,
+    PageReadiness,
+)
+from .resources import RESOURCE_POLICIES, ResourceRouter
+from .scoring import record_text_baselines, score_page
+from .snapshot import PageSnapshot, install_dom_version_counter, snapshot_key
+from .state_reset import load_storage_state, make_reset_hook, restore_storage_state
+
+if TYPE_CHECKING:
+    import playwright.sync_api
 
-# Auto-register tasks on module import
-_ensure_tasks_registered()
+logger = logging.getLogger(__name__)
 
 
 class AcidwaveTask(AbstractBrowserTask):
@@ -85,6 +55,18 @@ class AcidwaveTask(AbstractBrowserTask):
         task_id: int,
         start_url: str = "http://localhost:5173",
         goal: Optional[str] = None,
+        html_eval_mode: str = "batched",
+        ready_timeout: int = DEFAULT_READY_TIMEOUT_MS,
+        step_ready_timeout: int = DEFAULT_STEP_READY_TIMEOUT_MS,
+        quiet_ms: int = DEFAULT_QUIET_MS,
+        resource_policy: str = "lean",
+        storage_state: Optional[str] = None,
+        reset_hook: Optional[str] = None,
+        har_mode: Optional[str] = None,
+        har_dir: Optional[str] = None,
+        har_url: str = DEFAULT_HAR_URL,
+        task_file: Optional[str] = None,
+        task_config: Optional[dict] = None,
     ) -> None:
         """
         Initialize Acidwave task.
@@ -94,6 +76,30 @@ class AcidwaveTask(AbstractBrowserTask):
             task_id: Task ID from test.raw.json
             start_url: URL of Acidwave frontend (default: http://localhost:5173)
             goal: Task goal/intent (loaded from test.raw.json if None)
+            html_eval_mode: How program_html checks are probed: "batched"
+                (one page.evaluate roundtrip for all checks) or "locator"
+                (Playwright locator calls per check)
+            ready_timeout: Upper bound (ms) for the app to settle after the
+                initial navigation (network idle and DOM quiet, see readiness.py)
+            step_ready_timeout: Upper bound (ms) for the page to settle after
+                each action, before validation and the observation
+            quiet_ms: How long (ms) the DOM must go without mutations to count as settled
+            resource_policy: "lean" (abort audio and fonts, stub cross-origin
+                images, except types the task config allows) or "full" (load
+                everything), see resources.py
+            storage_state: Storage snapshot (Playwright storage_state JSON)
+                applied to the page before the app loads (None: empty storage)
+            reset_hook: Backend API URL or shell command restoring the backend
+                data checkpoint before tasks with ``require_reset`` (None: no
+                backend reset), see state_reset.py
+            har_mode: "record" API traffic to, or "replay" it from, the task's
+                HAR file in har_dir (None: live API), see har.py
+            har_dir: Directory of the per-task HAR files
+            har_url: Glob of the requests recorded / replayed
+            task_file: Task file the task is defined in (None: test.raw.json)
+            task_config: Config of the task as read by the caller (e.g.
+                AcidwaveBenchmark for custom suites); None loads it from the
+                task file's catalog
         """
         super().__init__(seed)
 
@@ -102,30 +108,77 @@ class AcidwaveTask(AbstractBrowserTask):
         self.start_url = start_url
         self._goal = goal
 
+        if html_eval_mode not in HTML_EVAL_MODES:
+            raise ValueError(
+                f"Unknown html_eval_mode '{html_eval_mode}', expected one of {HTML_EVAL_MODES}"
+            )
+        self.html_eval_mode = html_eval_mode
+
+        if resource_policy not in RESOURCE_POLICIES:
+            raise ValueError(
+                f"Unknown resource_policy '{resource_policy}', expected one of {RESOURCE_POLICIES}"
+            )
+        self.resource_policy = resource_policy
+        self._router: Optional[ResourceRouter] = None
+
+        # App state restored at setup (see state_reset.py)
+        self.storage_state = storage_state
+        self.reset_hook = make_reset_hook(reset_hook)
+
+        if har_mode is not None:
+            if har_mode not in HAR_MODES:
+                raise ValueError(f"Unknown har_mode '{har_mode}', expected one of {HAR_MODES}")
+            if har_dir is None:
+                raise ValueError(f"har_mode '{har_mode}' needs a har_dir")
+        self.har_mode = har_mode
+        self.har_path = task_har_path(har_dir, task_id) if har_mode is not None else None
+        self.har_url = har_url
+
         # Browser configuration
         self.viewport = {"width": 1280, "height": 720}
-        self.slow_mo = 100  # ms - slower for UI interactions
+        self.slow_mo = 0  # ms - actions wait for readiness instead of a fixed delay
         self.timeout = 10000  # ms
 
-        # Load task configuration from test.raw.json
-        task_file = Path(__file__).parent / "test.raw.json"
-        with open(task_file, 'r', encoding='utf-8') as f:
-            all_tasks = json.load(f)
-
-        # Find this task's config
-        self.config = None
-        for task_config in all_tasks:
-            if task_config["task_id"] == task_id:
-                self.config = task_config
-                break
+        # Readiness bounds (ms), see readiness.py
+        self.ready_timeout = ready_timeout
+        self.step_ready_timeout = step_ready_timeout
+        self.quiet_ms = quiet_ms
+        self._readiness: Optional[PageReadiness] = None
+
+        # Page state cache, reused while the DOM version is unchanged
+        self._snapshot: Optional[PageSnapshot] = None
+        # (page fingerprint, validate() result) of the last validation
+        self._last_validation: Optional[tuple] = None
+        # Setup-time text hashes of elements referenced by text_changed checks
+        self._text_baselines: dict[str, Optional[int]] = {}
+
+        if task_config is not None:
+            # Config handed over with the env args: no task file is read here
+            if task_config.get("task_id") != task_id:
+                raise ValueError(f"task_config is for task {task_config.get('task_id')}, not {task_id}")
+            catalog = None
+            self.task_file = task_file
+            self.config = task_config
+        else:
+            # Load task configuration from the task file (parsed once per process)
+            catalog = get_task_catalog(task_file)
+            self.task_file = catalog.path
+            self.config = catalog.get(task_id)
 
-        if self.config is None:
-            raise ValueError(f"Task ID {task_id} not found in test.raw.json")
+            if self.config is None:
+                raise ValueError(f"Task ID {task_id} not found in {catalog.path.name}")
 
         # Override goal if provided in config
         if self._goal is None:
             self._goal = self.config["intent"]
 
+        # Eval config compiled once per process (per task for handed-over configs);
+        # validate() only executes the plan
+        self.eval_plan: EvalPlan = (
+            catalog.eval_plan(task_id) if catalog is not None else compile_eval_plan(self.config)
+        )
+        self._goal_terms = goal_terms(self._goal)
+
         logger.info(f"Initialized Acidwave task {task_id}: {self._goal[:60]}...")
 
     def setup(self, page: playwright.sync_api.Page) -> tuple[str, dict]:
@@ -141,31 +194,80 @@ class AcidwaveTask(AbstractBrowserTask):
         Returns:
             Tuple of (goal string, info dict)
         """
+        # Track DOM mutations so validation can reuse page captures
+        install_dom_version_counter(page)
+        self._snapshot = None
+        self._last_validation = None
+        self._text_baselines = {}
+
+        # Restore the app state checkpoint before the app reads it
+        reset_seconds = self._restore_app_state(page)
+
+        # Skip audio, fonts and cover images the evaluators never read
+        self._router = ResourceRouter.for_task(self.config, self.start_url, self.resource_policy)
+        if self._router is not None:
+            self._router.install(page)
+
+        # Serve (or record) the API from the task's HAR file; registered last so it
+        # takes precedence over the resource routing above
+        if self.har_mode is not None:
+            install_har(page, self.har_mode, self.har_path, self.har_url)
+
+        # Track requests before navigating so the app's module and API loads are counted
+        self._attach_readiness(page)
+
         # Navigate to Acidwave
         logger.info(f"Navigating to {self.start_url}")
         page.goto(self.start_url, wait_until="domcontentloaded")
 
-        # Wait for app to load (look for navigation elements)
-        try:
-            page.wait_for_selector('[role="button"]', timeout=5000)
+        # Wait for the app to finish loading and rendering (bounded by ready_timeout)
+        if self._readiness.wait(self.ready_timeout):
             logger.info("Acidwave app loaded successfully")
-        except Exception as e:
-            logger.warning(f"Acidwave may not have loaded properly: {e}")
+        else:
+            logger.warning(f"Acidwave may not have loaded properly: not settled after {self.ready_timeout}ms")
+
+        # Baseline for text_changed checks, compared by validate()
+        if self.eval_plan.text_changed_checks:
+            self._text_baselines = record_text_baselines(self.eval_plan, self.get_page_snapshot(page))
 
         # Return goal and metadata
         return self._goal, {
             "task_id": self.task_id,
             "difficulty": self.config.get("difficulty", "unknown"),
             "start_url": self.start_url,
+            "state_reset_seconds": reset_seconds,
         }
 
+    def _restore_app_state(self, page: playwright.sync_api.Page) -> Optional[float]:
+        """Apply the storage snapshot and backend checkpoint; returns seconds spent (None: nothing to do)."""
+        if self.storage_state is None and self.reset_hook is None:
+            return None
+        start = time.perf_counter()
+        if self.storage_state is not None:
+            restore_storage_state(page, load_storage_state(self.storage_state))
+        if self.reset_hook is not None and self.config.get("require_reset", False):
+            try:
+                self.reset_hook.restore()
+            except Exception as e:
+                logger.warning(f"Task {self.task_id}: backend state restore failed ({self.reset_hook}): {e}")
+        elapsed = time.perf_counter() - start
+        logger.info(f"Task {self.task_id}: app state restored in {elapsed * 1000:.0f}ms")
+        return elapsed
+
     def teardown(self) -> None:
         """
         Clean up after task completion.
 
-        For Acidwave, no special cleanup is needed since each task
-        starts fresh from the homepage.
+        For Acidwave, only the readiness tracker and resource routing are
+        removed, since each task starts fresh from the homepage.
         """
+        if self._readiness is not None:
+            self._readiness.detach()
+            self._readiness = None
+        if self._router is not None:
+            logger.debug(f"Task {self.task_id} resource routing: {self._router.counts}")
+            self._router.uninstall()
+            self._router = None
         logger.info(f"Task {self.task_id} teardown complete")
 
     def validate(
@@ -176,12 +278,12 @@ class AcidwaveTask(AbstractBrowserTask):
         """
         Validate task completion and calculate reward.
         
-        Implements WebArena-style evaluation with multiple eval types:
-        - string_match: Check for text in page
+        Implements WebArena-style evaluation with the evaluators registered
+        in ``evaluators.py`` for the task's eval types:
+        - string_match: Check for text in page (``reference_answers.case_insensitive``
+          makes the comparison ignore letter case)
         - program_html: Check for HTML elements and states
         - url_match: Check URL patterns
-        - element_state: Check element visibility/attributes
-        - element_changed: Check if elements changed
 
         Args:
             page: Playwright page object with final state
@@ -190,332 +292,75 @@ class AcidwaveTask(AbstractBrowserTask):
         Returns:
             Tuple of (reward, done, message, info_dict)
         """
-        eval_config = self.config.get("eval", {})
-        eval_types = eval_config.get("eval_types", [])
-        reference = eval_config.get("reference_answers", {})
-        program_html = eval_config.get("program_html", [])
+        plan = self.eval_plan
 
-        # Get current page content
+        # Let the action's effects settle (replaces BrowserEnv's fixed pre-observation delay)
+        if self._readiness is None or self._readiness.page is not page:
+            self._attach_readiness(page)
+        self._readiness.wait(self.step_ready_timeout)
+
+        # Evaluators only capture what they read, when they read it
         try:
-            page_text = page.inner_text("body")
-            page_html = page.content()
-            page_url = page.url
+            snapshot = self.get_page_snapshot(page)
+            fingerprint = self._page_fingerprint(snapshot, plan)
         except Exception as e:
             logger.error(f"Error getting page content: {e}")
             return 0.0, True, f"Error: {e}", {}
 
-        # Track validation details
-        checks_passed = []
-        checks_failed = []
-        
-        # Initialize validation result
-        reward = 0.0
-        success = False
-        message = "Task not completed"
-        
-        # Track individual evaluation scores
-        string_match_score = 0.0
-        html_check_score = 0.0
-        url_match_score = 0.0
-
-        # ==========================================
-        # EVALUATION TYPE 1: String Match
-        # ==========================================
-        if "string_match" in eval_types:
-            exact_match = reference.get("exact_match", "")
-            must_include = reference.get("must_include", [])
-            must_exclude = reference.get("must_exclude", [])
-
-            # Check exact match
-            exact_found = True
-            if exact_match:
-                exact_found = exact_match in page_text
-                if exact_found:
-                    checks_passed.append(f"Found exact: '{exact_match}'")
-                else:
-                    checks_failed.append(f"Missing exact: '{exact_match}'")
-
-            # Check must include
-            all_includes = True
-            for term in must_include:
-                if term in page_text:
-                    checks_passed.append(f"Found required: '{term}'")
-                else:
-                    checks_failed.append(f"Missing required: '{term}'")
-                    all_includes = False
-
-            # Check must exclude
-            no_excludes = True
-            for term in must_exclude:
-                if term not in page_text:
-                    checks_passed.append(f"Correctly excluded: '{term}'")
-                else:
-                    checks_failed.append(f"Found excluded term: '{term}'")
-                    no_excludes = False
-
-            # Calculate string match score
-            if exact_found and all_includes and no_excludes:
-                string_match_score = 1.0
-                success = True
-            else:
-                # Partial credit
-                partial_score = 0.0
-                if exact_found:
-                    partial_score += 0.4
-                if all_includes:
-                    partial_score += 0.4
-                if no_excludes:
-                    partial_score += 0.2
-                string_match_score = partial_score
-
-        # ==========================================
-        # EVALUATION TYPE 2: Program HTML
-        # ==========================================
-        if "program_html" in eval_types and program_html:
-            html_checks = []
-            
-            for check_config in program_html:
-                locator_str = check_config.get("locator", "")
-                required_state = check_config.get("required_state", None)
-                required_contents = check_config.get("required_contents", None)
-                attribute = check_config.get("attribute", None)
-                required_range = check_config.get("required_range", None)
-                check_type = check_config.get("check", None)
-                
-                try:
-                    # Find element(s)
-                    locator = page.locator(locator_str)
-                    element_count = locator.count()
-                    
-                    if element_count == 0:
-                        checks_failed.append(f"Element not found: {locator_str}")
-                        html_checks.append(False)
-                        continue
-                    
-                    # Get first matching element
-                    element = locator.first
-                    
-                    # Check 1: Visibility state
-                    if required_state == "visible":
-                        is_visible = element.is_visible()
-                        if is_visible:
-                            checks_passed.append(f"Element visible: {locator_str}")
-                            html_checks.append(True)
-                        else:
-                            checks_failed.append(f"Element not visible: {locator_str}")
-                            html_checks.append(False)
-                        continue
-                    
-                    # Check 2: Element attribute
-                    if attribute:
-                        attr_value = element.get_attribute(attribute)
-                        
-                        # Check if attribute contains required content
-                        if required_contents:
-                            if attr_value and required_contents.lower() in attr_value.lower():
-                                checks_passed.append(
-                                    f"Attribute '{attribute}' contains '{required_contents}'"
-                                )
-                                html_checks.append(True)
-                            else:
-                                checks_failed.append(
-                                    f"Attribute '{attribute}' missing '{required_contents}' (got: {attr_value})"
-                                )
-                                html_checks.append(False)
-                            continue
-                        
-                        # Check if attribute in range
-                        if required_range:
-                            try:
-                                value = float(attr_value or 0)
-                                min_val, max_val = required_range
-                                if min_val <= value <= max_val:
-                                    checks_passed.append(
-                                        f"Attribute '{attribute}' in range [{min_val}, {max_val}]: {value}"
-                                    )
-                                    html_checks.append(True)
-                                else:
-                                    checks_failed.append(
-                                        f"Attribute '{attribute}' out of range (got: {value})"
-                                    )
-                                    html_checks.append(False)
-                            except ValueError:
-                                checks_failed.append(
-                                    f"Attribute '{attribute}' not numeric: {attr_value}"
-                                )
-                                html_checks.append(False)
-                            continue
-                    
-                    # Check 3: Element text content
-                    if required_contents and not attribute:
-                        text_content = element.inner_text()
-                        if required_contents.lower() in text_content.lower():
-                            checks_passed.append(f"Element contains: '{required_contents}'")
-                            html_checks.append(True)
-                        else:
-                            checks_failed.append(
-                                f"Element missing text: '{required_contents}' (got: {text_content[:50]})"
-                            )
-                            html_checks.append(False)
-                        continue
-                    
-                    # Check 4: Element changed (for dynamic content)
-                    if check_type == "text_changed":
-                        # This is tricky - we need to compare with initial state
-                        # For now, just check if element has non-empty text
-                        text_content = element.inner_text()
-                        if text_content and len(text_content.strip()) > 0:
-                            checks_passed.append(f"Element has content: {locator_str}")
-                            html_checks.append(True)
-                        else:
-                            checks_failed.append(f"Element empty: {locator_str}")
-                            html_checks.append(False)
-                        continue
-                    
-                    # Default: element exists
-                    checks_passed.append(f"Element exists: {locator_str}")
-                    html_checks.append(True)
-                    
-                except Exception as e:
-                    logger.warning(f"Error checking element '{locator_str}': {e}")
-                    checks_failed.append(f"Error checking: {locator_str}")
-                    html_checks.append(False)
-            
-            # Calculate HTML check score
-            if html_checks:
-                html_success_rate = sum(html_checks) / len(html_checks)
-                if html_success_rate == 1.0:
-                    # 所有HTML检查都通过
-                    html_check_score = 1.0
-                    success = True
-                elif html_success_rate >= 0.8:
-                    # 大部分通过，给予较高分数但不算完全成功
-                    html_check_score = html_success_rate * 0.85
-                else:
-                    # 通过率低，给予较低分数
-                    html_check_score = html_success_rate * 0.6
-
-        # ==========================================
-        # EVALUATION TYPE 3: URL Match
-        # ==========================================
-        if "url_match" in eval_types:
-            import re
-            # Support both url_pattern (regex) and exact_match (exact URL)
-            url_pattern = reference.get("url_pattern", "")
-            exact_url = reference.get("exact_match", "")
-            
-            if url_pattern:
-                # Use regex pattern matching
-                if re.search(url_pattern, page_url):
-                    checks_passed.append(f"URL matches pattern: {url_pattern}")
-                    url_match_score = 1.0
-                else:
-                    checks_failed.append(f"URL doesn't match pattern: {url_pattern} (got: {page_url})")
-                    url_match_score = 0.0
-            elif exact_url:
-                # Use exact URL matching
-                if page_url == exact_url:
-                    checks_passed.append(f"URL matches exactly: {exact_url}")
-                    url_match_score = 1.0
-                else:
-                    checks_failed.append(f"URL doesn't match: expected '{exact_url}', got '{page_url}'")
-                    url_match_score = 0.0
-            else:
-                checks_failed.append("No URL pattern or exact match specified in eval config")
-                url_match_score = 0.0
-
-        # ==========================================
-        # EVALUATION TYPE 4: Element State
-        # ==========================================
-        if "element_state" in eval_types and program_html:
-            # Similar to program_html but focuses on state
-            # (Already handled in program_html section above)
-            pass
-
-        # ==========================================
-        # CALCULATE FINAL REWARD
-        # ==========================================
-        # 如果任务使用多种评估类型，需要综合考虑所有类型的得分
-        # 策略：取所有有效评估类型的最小值（AND逻辑），确保所有条件都满足
-        
-        active_scores = []
-        if "string_match" in eval_types:
-            active_scores.append(string_match_score)
-        if "program_html" in eval_types and program_html:
-            active_scores.append(html_check_score)
-        if "url_match" in eval_types:
-            active_scores.append(url_match_score)
-        
-        if active_scores:
-            # 使用最小值策略：所有评估都必须通过
-            reward = min(active_scores)
-            # 如果所有评估类型都接近完美，才算成功
-            success = all(score >= 0.95 for score in active_scores)
-        else:
-            # 没有有效评估，使用启发式
-            reward = 0.0
-        
-        # ==========================================
-        # DEFAULT: Heuristic Check
-        # ==========================================
-        if not eval_types or (reward == 0.0 and not active_scores):
-            logger.warning(f"No evaluation type or checks failed for task {self.task_id}")
-            # Check if goal keywords are present
-            goal_keywords = self._goal.lower().split()
-            found_keywords = sum(1 for kw in goal_keywords if kw in page_text.lower())
-            reward = min(1.0, found_keywords / max(len(goal_keywords), 1))
-            success = reward > 0.7
-            message = f"Heuristic evaluation: {found_keywords}/{len(goal_keywords)} keywords found"
-        
-        # ==========================================
-        # Build Final Message
-        # ==========================================
-        # 评估策略：需要所有检查都通过才算成功
-        
-        if reward >= 0.98:
-            # 几乎完美完成
-            success = True
-            done = True
-            message = "✅ Task completed successfully"
-        elif reward >= 0.9:
-            # 所有关键检查通过，允许微小误差
-            success = True
-            done = True
-            message = f"✅ Task completed (score: {reward:.2f})"
-        elif reward >= 0.7:
-            # 大部分完成但不够完美，继续尝试
-            success = False
-            done = False
-            message = f"⚠️  Task mostly completed (score: {reward:.2f}), but not all checks passed. Continue..."
-        elif reward > 0:
-            # 部分完成，继续尝试
-            success = False
-            done = False
-            message = f"⚠️  Task in progress (score: {reward:.2f}), {len(checks_passed)}/{len(checks_passed) + len(checks_failed)} checks passed. Continue..."
-        else:
-            # 完全失败，继续尝试（除非超过max_steps）
-            success = False
-            done = False
-            message = f"❌ Task not completed (score: {reward:.2f}). Keep trying..."
-
-        # Add check details to message
-        if checks_passed or checks_failed:
-            message += f"\n   Passed: {len(checks_passed)}, Failed: {len(checks_failed)}"
-            if checks_failed and len(checks_failed) <= 3:
-                message += f"\n   Issues: {'; '.join(checks_failed)}"
-
-        logger.info(f"Task {self.task_id} validation: reward={reward:.2f}, done={done}, success={success}")
-        logger.debug(f"Passed checks: {checks_passed}")
-        logger.debug(f"Failed checks: {checks_failed}")
-        
-        return reward, done, message, {
-            "reward": reward,
-            "success": success,
-            "task_id": self.task_id,
-            "checks_passed": checks_passed,
-            "checks_failed": checks_failed,
-            "page_url": page_url,
-        }
+        # Nothing changed since the last step: the result cannot differ
+        if (
+            fingerprint is not None
+            and self._last_validation is not None
+            and self._last_validation[0] == fingerprint
+        ):
+            reward, done, message, info = self._last_validation[1]
+            logger.debug(f"Task {self.task_id} page unchanged, reusing validation result")
+            return reward, done, message, {**info, "validation_cached": True}
+
+        try:
+            reward, done, message, info = score_page(
+                plan, snapshot, self.task_id, self._goal_terms, self._text_baselines
+            )
+        except Exception as e:
+            logger.error(f"Error getting page content: {e}")
+            return 0.0, True, f"Error: {e}", {}
+        self._last_validation = (fingerprint, (reward, done, message, info))
+        return reward, done, message, dict(info)
+
+    def _attach_readiness(self, page: playwright.sync_api.Page) -> None:
+        if self._readiness is not None:
+            self._readiness.detach()
+        self._readiness = PageReadiness(page, quiet_ms=self.quiet_ms)
+
+    def get_page_snapshot(self, page: playwright.sync_api.Page) -> PageSnapshot:
+        """
+        Return the snapshot for the current page state.
+
+        The previous snapshot (and whatever it already captured) is reused
+        while the page's DOM version is unchanged.
+        """
+        key = snapshot_key(page)
+        if key is None or self._snapshot is None or self._snapshot.key != key:
+            self._snapshot = PageSnapshot(page, key, html_eval_mode=self.html_eval_mode)
+        return self._snapshot
+
+    @staticmethod
+    def _page_fingerprint(snapshot: PageSnapshot, plan: EvalPlan) -> Optional[tuple]:
+        """
+        Cheap identity of the page state, or None if it cannot be determined.
+
+        Uses the DOM version counter installed at setup. Without it, falls
+        back to what the plan actually reads: the URL, plus a hash of the body
+        text (which text-based checks fetch anyway). Element checks cannot be
+        fingerprinted that way, so those results are not reused.
+        """
+        if snapshot.key is not None:
+            return snapshot.key
+        if plan.html_checks:
+            return None
+        if plan.needs_page_text:
+            return (id(snapshot.page), snapshot.url, hash(snapshot.text))
+        return (id(snapshot.page), snapshot.url)
 
     def cheat(self, page: playwright.sync_api.Page, chat_messages: list[str]) -> None:
         """
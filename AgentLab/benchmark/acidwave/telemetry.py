@@ -0,0 +1,100 @@
+"""
+Validation Telemetry
+====================
+
+Aggregates the per-step validation timings that ``validate()`` reports in
+``info["timings"]`` into each experiment's ``summary_info.json``, so slow
+evaluators and selectors show up in the result dataframe next to the
+other ``stats.*`` columns.
+
+Keys added per experiment (all times in ms):
+    validation.n_validations
+    validation.total_ms.p50 / .p95
+    validation.<eval_type>_ms.p50 / .p95     e.g. validation.program_html_ms.p95
+    validation.check.<kind>_ms.p50 / .p95    e.g. validation.check.text_contains_ms.p50
+    validation.slowest_check / validation.slowest_check_ms
+"""
+
+import json
+import logging
+import math
+from collections import defaultdict
+from pathlib import Path
+from typing import Union
+
+from .offline import iter_experiment_dirs, iter_step_files, load_step
+
+logger = logging.getLogger(__name__)
+
+
+def percentile(values: list[float], q: float) -> float:
+    """Linearly interpolated percentile of ``values`` (``q`` in [0, 100])."""
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * q / 100
+    low, high = math.floor(rank), math.ceil(rank)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def collect_validation_timings(exp_dir: Union[str, Path]) -> list[dict]:
+    """
+    Return the ``timings`` dicts of an experiment's validations, in step order.
+
+    Steps whose result was reused from the previous validation carry a copy
+    of its timings and are left out.
+    """
+    timings = []
+    for path in iter_step_files(exp_dir):
+        task_info = getattr(load_step(path), "task_info", None) or {}
+        if "timings" in task_info and not task_info.get("validation_cached"):
+            timings.append(task_info["timings"])
+    return timings
+
+
+def summarize_validation_timings(timings: list[dict]) -> dict:
+    """Reduce per-validation timings to the flat ``validation.*`` summary keys."""
+    samples = defaultdict(list)
+    slowest_check, slowest_ms = None, -1.0
+    for timing in timings:
+        samples["total"].append(timing["total_ms"])
+        for eval_type, ms in timing.get("evaluators", {}).items():
+            samples[eval_type].append(ms)
+        for check in timing.get("checks", []):
+            if check.get("ms") is None:
+                continue
+            samples[f"check.{check['kind']}"].append(check["ms"])
+            if check["ms"] > slowest_ms:
+                slowest_check, slowest_ms = check["locator"], check["ms"]
+
+    summary = {"validation.n_validations": len(timings)}
+    for name, values in samples.items():
+        summary[f"validation.{name}_ms.p50"] = percentile(values, 50)
+        summary[f"validation.{name}_ms.p95"] = percentile(values, 95)
+    if slowest_check is not None:
+        summary["validation.slowest_check"] = slowest_check
+        summary["validation.slowest_check_ms"] = slowest_ms
+    return summary
+
+
+def write_validation_timings(study_dir: Union[str, Path]) -> int:
+    """
+    Add validation timing percentiles to every ``summary_info.json`` of a study.
+
+    Returns:
+        Number of experiments updated
+    """
+    n_updated = 0
+    for exp_dir in iter_experiment_dirs(study_dir):
+        summary_file = exp_dir / "summary_info.json"
+        try:
+            timings = collect_validation_timings(exp_dir)
+            if not timings or not summary_file.exists():
+                continue
+            with open(summary_file, 'r', encoding='utf-8') as f:
+                summary = json.load(f)
+            summary.update(summarize_validation_timings(timings))
+            with open(summary_file, 'w', encoding='utf-8') as f:
+                json.dump(summary, f, indent=4)
+            n_updated += 1
+        except Exception as e:
+            logger.warning(f"Could not aggregate validation timings for {exp_dir}: {e}")
+    return n_updated
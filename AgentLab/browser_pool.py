@@ -0,0 +1,336 @@
+"""
+Persistent Browser Pool for Acidwave Experiments
+================================================
+
+BrowserGym launches (and closes) a Chromium process for every episode, and
+the first navigation of each episode hits a cold dev server. For easy tasks
+that finish in 2-3 steps this fixed cost dominates the run time.
+
+This module keeps browsers alive across episodes:
+
+- ``install_shared_browser()`` makes BrowserGym's ``chromium.launch`` return a
+  long-lived browser per launch configuration. ``BrowserEnv`` still opens a
+  fresh BrowserContext per episode (cookies, storage and pages are not
+  shared); closing the "browser" only closes the contexts the episode opened.
+- ``browser_pool_backend()`` runs a study's experiments on long-lived Ray
+  actors (``BrowserPoolWorker``) that have the shared browser launched, the
+  dev server warmed up and the task catalog loaded before the first task
+  arrives. With ``n_workers=1`` experiments run in-process, without Ray.
+
+Usage:
+    import patch_agentlab  # Must be first!
+    from browser_pool import browser_pool_backend
+
+    with browser_pool_backend(n_workers=4, headless=True, slow_mo=0,
+                              warmup_url="http://localhost:5173"):
+        study.run(n_jobs=4)
+"""
+
+import logging
+import os
+import sys
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Optional
+
+# 控制调试输出 - 设置环境变量 ACIDWAVE_DEBUG=1 启用详细输出
+ACIDWAVE_DEBUG = os.environ.get('ACIDWAVE_DEBUG', '0') == '1'
+
+PROJECT_ROOT = Path(__file__).resolve().parent
+
+logger = logging.getLogger(__name__)
+
+
+def debug_print(msg):
+    """条件打印调试信息"""
+    if ACIDWAVE_DEBUG:
+        print(msg)
+
+
+class _SharedBrowser:
+    """
+    Long-lived browser handed to BrowserGym in place of a freshly launched one.
+
+    ``close()`` closes the contexts opened through this handle since the last
+    close, and keeps the browser process running for the next episode.
+    """
+
+    def __init__(self, browser):
+        self._browser = browser
+        self._contexts = []
+
+    def new_context(self, *args, **kwargs):
+        context = self._browser.new_context(*args, **kwargs)
+        self._contexts.append(context)
+        return context
+
+    def close(self, *args, **kwargs):
+        contexts, self._contexts = self._contexts, []
+        for context in contexts:
+            try:
+                context.close()
+            except Exception as e:
+                debug_print(f"[browser_pool] Ignoring error closing context: {e}")
+
+    def shutdown(self):
+        """Really close the browser process."""
+        self.close()
+        self._browser.close()
+
+    def __getattr__(self, name):
+        return getattr(self._browser, name)
+
+
+class _PooledBrowserType:
+    """``playwright.chromium`` whose ``launch`` reuses browsers with the same options."""
+
+    def __init__(self, browser_type, browsers: dict):
+        self._browser_type = browser_type
+        self._browsers = browsers
+
+    def launch(self, **kwargs):
+        key = repr(sorted(kwargs.items()))
+        shared = self._browsers.get(key)
+        if shared is None or not shared.is_connected():
+            debug_print(f"[browser_pool] Launching shared browser in PID {os.getpid()}: {kwargs}")
+            shared = _SharedBrowser(self._browser_type.launch(**kwargs))
+            self._browsers[key] = shared
+        return shared
+
+    def __getattr__(self, name):
+        return getattr(self._browser_type, name)
+
+
+class _PooledPlaywright:
+    """Playwright instance whose ``chromium`` hands out shared browsers."""
+
+    def __init__(self, playwright):
+        self._playwright = playwright
+        # launch options -> _SharedBrowser
+        self.browsers = {}
+        self.chromium = _PooledBrowserType(playwright.chromium, self.browsers)
+
+    def __getattr__(self, name):
+        return getattr(self._playwright, name)
+
+
+_pooled_playwright: Optional[_PooledPlaywright] = None
+_install_lock = threading.Lock()
+
+
+def install_shared_browser() -> _PooledPlaywright:
+    """
+    Make BrowserGym reuse browsers across episodes in this process (idempotent).
+
+    Returns:
+        The pooled Playwright instance BrowserGym now uses
+    """
+    global _pooled_playwright
+    with _install_lock:
+        if _pooled_playwright is not None:
+            return _pooled_playwright
+
+        import browsergym.core
+        import browsergym.core.chat
+        import browsergym.core.env
+
+        pooled = _PooledPlaywright(browsergym.core._get_global_playwright())
+
+        def _get_pooled_playwright():
+            return pooled
+
+        # env.py and chat.py bind _get_global_playwright at import time
+        for module in (browsergym.core, browsergym.core.env, browsergym.core.chat):
+            module._get_global_playwright = _get_pooled_playwright
+
+        _pooled_playwright = pooled
+        debug_print(f"[browser_pool] Installed shared browser in PID {os.getpid()}")
+        return pooled
+
+
+def shutdown_shared_browsers() -> None:
+    """Close every shared browser of this process."""
+    if _pooled_playwright is None:
+        return
+    for shared in list(_pooled_playwright.browsers.values()):
+        try:
+            shared.shutdown()
+        except Exception as e:
+            debug_print(f"[browser_pool] Ignoring error closing browser: {e}")
+    _pooled_playwright.browsers.clear()
+
+
+def warm_up(headless: bool = True, slow_mo: int = 0, warmup_url: Optional[str] = None) -> None:
+    """
+    Launch the shared browser BrowserEnv will ask for and load the task catalog.
+
+    Args:
+        headless: Headless mode of the experiments' EnvArgs
+        slow_mo: slow_mo of the experiments' EnvArgs
+        warmup_url: Page to load once, so the dev server has compiled the app
+            before the first episode (None: skip)
+    """
+    # CRITICAL: project root for benchmark.acidwave / patch_agentlab in workers
+    if str(PROJECT_ROOT) not in sys.path:
+        sys.path.insert(0, str(PROJECT_ROOT))
+    import patch_agentlab  # noqa: F401  (Acidwave task registration)
+    from benchmark.acidwave import get_task_catalog
+
+    get_task_catalog()
+
+    pooled = install_shared_browser()
+    # Same launch options as BrowserEnv.reset (default BrowserEnv settings)
+    browser = pooled.chromium.launch(
+        headless=headless,
+        slow_mo=slow_mo,
+        args=["--disable-features=OverlayScrollbars,ExtendedOverlayScrollbars"],
+        ignore_default_args=["--hide-scrollbars"],
+    )
+    if warmup_url:
+        context = browser.new_context()
+        try:
+            context.new_page().goto(warmup_url, wait_until="load")
+        except Exception as e:
+            logger.warning(f"[browser_pool] Warm-up navigation to {warmup_url} failed: {e}")
+        finally:
+            browser.close()
+
+
+class BrowserPoolWorker:
+    """
+    Long-lived experiment runner holding a warm browser (used as a Ray actor).
+
+    Methods run one at a time on the actor's thread, which is the thread
+    Playwright's sync API was started on.
+    """
+
+    def __init__(self, headless: bool = True, slow_mo: int = 0, warmup_url: Optional[str] = None):
+        self.warmup_options = dict(headless=headless, slow_mo=slow_mo, warmup_url=warmup_url)
+        self.n_runs = 0
+
+    def warm_up(self) -> int:
+        warm_up(**self.warmup_options)
+        return os.getpid()
+
+    def run(self, exp_args):
+        """Run one experiment (results are written to ``exp_args.exp_dir``)."""
+        install_shared_browser()
+        try:
+            exp_args.run()
+        finally:
+            self.n_runs += 1
+        return exp_args.exp_id
+
+    def shutdown(self) -> int:
+        shutdown_shared_browsers()
+        return self.n_runs
+
+
+def run_on_browser_pool(
+    exp_args_list: list,
+    n_workers: int,
+    headless: bool = True,
+    slow_mo: int = 0,
+    warmup_url: Optional[str] = None,
+) -> None:
+    """
+    Run experiments on ``n_workers`` persistent browser workers.
+
+    Experiments are dispatched in list order to whichever worker is idle. A
+    worker that dies (e.g. browser crash) is replaced; its experiment is
+    left with whatever it wrote, like with AgentLab's own backends.
+    """
+    if n_workers <= 1:
+        worker = BrowserPoolWorker(headless=headless, slow_mo=slow_mo, warmup_url=warmup_url)
+        worker.warm_up()
+        try:
+            for exp_args in exp_args_list:
+                worker.run(exp_args)
+        finally:
+            worker.shutdown()
+        return
+
+    import ray
+
+    started_ray = not ray.is_initialized()
+    if started_ray:
+        ray.init(num_cpus=n_workers)
+
+    remote_worker = ray.remote(num_cpus=1)(BrowserPoolWorker)
+
+    def start_worker():
+        actor = remote_worker.remote(headless=headless, slow_mo=slow_mo, warmup_url=warmup_url)
+        actor.warm_up.remote()
+        return actor
+
+    try:
+        idle = [start_worker() for _ in range(min(n_workers, len(exp_args_list)))]
+        queue = list(exp_args_list)
+        pending = {}
+        while queue or pending:
+            while queue and idle:
+                actor = idle.pop()
+                exp_args = queue.pop(0)
+                pending[actor.run.remote(exp_args)] = (actor, exp_args)
+
+            done, _ = ray.wait(list(pending), num_returns=1)
+            actor, exp_args = pending.pop(done[0])
+            try:
+                ray.get(done[0])
+            except ray.exceptions.RayActorError as e:
+                logger.warning(f"[browser_pool] Worker died running {exp_args.exp_id}, restarting: {e}")
+                actor = start_worker()
+            except Exception as e:
+                logger.warning(f"[browser_pool] Experiment {exp_args.exp_id} failed: {e}")
+            idle.append(actor)
+
+        ray.get([actor.shutdown.remote() for actor in idle])
+    finally:
+        if started_ray:
+            ray.shutdown()
+
+
+@contextmanager
+def browser_pool_backend(
+    n_workers: int,
+    headless: bool = True,
+    slow_mo: int = 0,
+    warmup_url: Optional[str] = None,
+):
+    """
+    Route AgentLab's ``run_experiments`` to the persistent browser pool.
+
+    Inside the context, ``study.run()`` dispatches its experiments to
+    ``n_workers`` warm workers instead of AgentLab's joblib/Ray backends.
+    """
+    from agentlab.experiments import launch_exp, study as study_module
+
+    def _run_experiments(n_jobs, exp_args_list, study_dir, *args, **kwargs):
+        if not exp_args_list:
+            logger.warning("No experiments to run.")
+            return
+        study_dir = Path(study_dir)
+        study_dir.mkdir(parents=True, exist_ok=True)
+
+        logger.info(f"Saving experiments to {study_dir}")
+        for exp_args in exp_args_list:
+            exp_args.agent_args.prepare()
+            exp_args.prepare(exp_root=study_dir)
+
+        logger.info(f"Running {len(exp_args_list)} experiments on {n_workers} browser pool workers.")
+        try:
+            run_on_browser_pool(exp_args_list, n_workers, headless, slow_mo, warmup_url)
+        finally:
+            for exp_args in exp_args_list:
+                exp_args.agent_args.close()
+
+    modules = [m for m in (launch_exp, study_module) if hasattr(m, "run_experiments")]
+    originals = {m: m.run_experiments for m in modules}
+    for module in modules:
+        module.run_experiments = _run_experiments
+    try:
+        yield
+    finally:
+        for module, original in originals.items():
+            module.run_experiments = original
@@ -17,12 +17,17 @@ import sys
 import json
 from pathlib import Path
 import pandas as pd
-from typing import Dict, List, Optional
+from typing import TYPE_CHECKING, Dict, List, Optional
 import argparse
 
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from experiments.merge_shards import load_manifest, shard_report
+
+if TYPE_CHECKING:
+    from benchmark.acidwave.metadata import TaskIndex
+
 
 def load_experiment_results(result_dir: Path) -> Optional[pd.DataFrame]:
     """
@@ -43,7 +48,7 @@ def load_experiment_results(result_dir: Path) -> Optional[pd.DataFrame]:
         return None
 
 
-def load_task_metadata(task_ids: List[int]) -> Dict:
+def load_task_metadata(task_ids: List[int]) -> "TaskIndex":
     """
     Load task metadata
     
@@ -51,17 +56,11 @@ def load_task_metadata(task_ids: List[int]) -> Dict:
         task_ids: List of task IDs
         
     Returns:
-        Dict mapping task_id to task config
+        Shared TaskIndex of the task catalog (dict-like: task_id -> metadata record)
     """
-    from benchmark.acidwave import AcidwaveBenchmark
-    
-    benchmark = AcidwaveBenchmark()
-    task_map = {}
+    from benchmark.acidwave import get_task_catalog
     
-    for task in benchmark._tasks:
-        task_map[task["task_id"]] = task
-    
-    return task_map
+    return get_task_catalog().index
 
 
 def extract_task_id(task_name: str) -> int:
@@ -323,6 +322,15 @@ def generate_report(result_dir: Path, output_file: Optional[Path] = None):
             if failure['error'] and failure['error'] != 'No error message':
                 add_line(f"   Error: {failure['error'][:100]}")
     
+    # Merged shards (merge_shards.py): results per shard and skipped duplicates
+    manifest = load_manifest(result_dir)
+    if manifest is not None and 'exp_dir' in df.columns:
+        rewards = dict(zip((Path(exp_dir).name for exp_dir in df['exp_dir']), df['cum_reward']))
+        add_line(f"\n[*] Breakdown by Shard")
+        add_line("-" * 80)
+        for line in shard_report(manifest, rewards):
+            add_line(line)
+
     # Recommendations
     add_line(f"\n[!] Recommendations")
     add_line("-" * 80)
@@ -0,0 +1,143 @@
+"""
+Import-Time Benchmark
+=====================
+
+Imports a module in a fresh interpreter with ``python -X importtime`` and
+reports its cumulative import time, the slowest modules it pulls in, and
+whether any heavy dependency (pandas, Playwright, BrowserGym experiments,
+AgentLab, Gymnasium) was imported although it should be deferred.
+
+Usage:
+    python experiments/bench_import_time.py
+    python experiments/bench_import_time.py --module benchmark.acidwave.offline --budget-ms 200
+    python experiments/bench_import_time.py --top 20 --runs 5
+
+Exits with status 1 if the median import time exceeds the budget or a heavy
+dependency was imported.
+"""
+
+import os
+import re
+import sys
+import argparse
+import statistics
+import subprocess
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+# Packages that importing the benchmark package must not pull in
+HEAVY_MODULES = ("pandas", "playwright", "browsergym.experiments", "agentlab", "gymnasium")
+
+# "import time:       123 |        456 |     package.module"
+_IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)\s*$")
+
+
+def parse_importtime(stderr: str) -> list[dict]:
+    """Parse ``-X importtime`` output into ``{module, self_us, cumulative_us, depth}`` rows."""
+    rows = []
+    for line in stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match is None:
+            continue
+        self_us, cumulative_us, indent, module = match.groups()
+        rows.append({
+            "module": module,
+            "self_us": int(self_us),
+            "cumulative_us": int(cumulative_us),
+            "depth": (len(indent) - 1) // 2,
+        })
+    return rows
+
+
+def measure_import(module: str) -> list[dict]:
+    """Import ``module`` in a fresh interpreter and return its importtime rows."""
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(PROJECT_ROOT), env.get("PYTHONPATH")]))
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=PROJECT_ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr[-2000:]}")
+    return parse_importtime(result.stderr)
+
+
+def module_total_us(rows: list[dict], module: str) -> int:
+    """Cumulative import time of ``module``, including its parent packages."""
+    # A submodule is listed twice: under its parent package and at the top level
+    totals = [row["cumulative_us"] for row in rows if row["module"] == module]
+    if not totals:
+        raise ValueError(f"{module} not found in importtime output")
+    return max(totals)
+
+
+def heavy_imports(rows: list[dict]) -> list[str]:
+    """Heavy top-level packages present in the import trace."""
+    imported = {row["module"] for row in rows}
+    return [
+        name for name in HEAVY_MODULES
+        if any(module == name or module.startswith(name + ".") for module in imported)
+    ]
+
+
+def print_report(module: str, totals_ms: list[float], rows: list[dict], top: int) -> None:
+    print("=" * 80)
+    print(f"Import time of {module} ({len(totals_ms)} runs)")
+    print("=" * 80)
+    print(f"median: {statistics.median(totals_ms):8.1f} ms   "
+          f"min: {min(totals_ms):8.1f} ms   max: {max(totals_ms):8.1f} ms")
+
+    print("\nSlowest modules by self time (last run):")
+    print(f"{'self ms':>9}  {'cumul ms':>9}  module")
+    for row in sorted(rows, key=lambda r: r["self_us"], reverse=True)[:top]:
+        print(f"{row['self_us'] / 1000:9.1f}  {row['cumulative_us'] / 1000:9.1f}  {row['module']}")
+
+    print(f"\nModules imported: {len(rows)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure and budget a module's import time")
+    parser.add_argument("--module", default="benchmark.acidwave",
+                        help="Module to import (default: benchmark.acidwave)")
+    parser.add_argument("--runs", type=int, default=3,
+                        help="Fresh interpreters to measure (default: 3)")
+    parser.add_argument("--budget-ms", type=float, default=150.0,
+                        help="Maximum median import time in ms (default: 150)")
+    parser.add_argument("--allow-heavy", action="store_true",
+                        help="Do not fail when heavy dependencies are imported")
+    parser.add_argument("--top", type=int, default=15,
+                        help="Number of slowest modules to list (default: 15)")
+    args = parser.parse_args()
+
+    totals_ms = []
+    rows = []
+    for _ in range(args.runs):
+        rows = measure_import(args.module)
+        totals_ms.append(module_total_us(rows, args.module) / 1000)
+
+    print_report(args.module, totals_ms, rows, args.top)
+
+    failed = False
+    median_ms = statistics.median(totals_ms)
+    if median_ms > args.budget_ms:
+        print(f"\n❌ Over budget: {median_ms:.1f} ms > {args.budget_ms:.1f} ms")
+        failed = True
+    else:
+        print(f"\n✓ Within budget: {median_ms:.1f} ms <= {args.budget_ms:.1f} ms")
+
+    heavy = heavy_imports(rows)
+    if heavy:
+        print(f"{'❌' if not args.allow_heavy else '⚠'} Heavy dependencies imported: {', '.join(heavy)}")
+        failed |= not args.allow_heavy
+    else:
+        print("✓ No heavy dependencies imported")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
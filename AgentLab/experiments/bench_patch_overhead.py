@@ -0,0 +1,112 @@
+"""
+patch_agentlab Overhead Benchmark
+=================================
+
+Measures the per-call cost that patch_agentlab's wrapper adds to AgentLab's
+``_get_env_name`` and that the Acidwave registration adds to Gymnasium's
+``_find_spec`` once a task is registered (the fast path hit on every
+environment creation). ``_get_env_name`` is wrapped around a no-op. With
+Gymnasium installed, ``_find_spec`` is the function actually installed
+after ``import patch_agentlab`` (every stacked layer), timed against the
+unwrapped original; without it, the registration wrapper around a no-op.
+
+Usage:
+    python experiments/bench_patch_overhead.py
+    python experiments/bench_patch_overhead.py --task-id 3 -n 1000000 --budget-us 1.0
+
+Exits with status 1 if an overhead exceeds the budget.
+"""
+
+import sys
+import time
+import argparse
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+
+def time_per_call(func, arg, number: int, repeat: int = 5) -> float:
+    """Best-of-``repeat`` time of one ``func(arg)`` call, in microseconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func(arg)
+        best = min(best, time.perf_counter() - start)
+    return best / number * 1e6
+
+
+def unwrap(func):
+    """Original function below every ``__wrapped__`` layer, and the number of layers."""
+    layers = 0
+    while hasattr(func, "__wrapped__"):
+        func = func.__wrapped__
+        layers += 1
+    return func, layers
+
+
+def find_spec_case(baseline):
+    """(patched, original, description) of Gymnasium's _find_spec."""
+    try:
+        from gymnasium.envs import registration
+    except ImportError:
+        from benchmark.acidwave.registration import wrap_find_spec
+
+        return wrap_find_spec(baseline), baseline, "registration wrapper around a no-op"
+
+    installed = registration._find_spec
+    original, layers = unwrap(installed)
+    return installed, original, f"installed gymnasium _find_spec, {layers} wrapper layer(s)"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark patch_agentlab per-call overhead")
+    parser.add_argument("--task-id", type=int, default=None,
+                        help="Task to look up (default: first task of test.raw.json)")
+    parser.add_argument("-n", "--number", type=int, default=200_000,
+                        help="Calls per measurement (default: 200000)")
+    parser.add_argument("--budget-us", type=float, default=1.0,
+                        help="Maximum allowed overhead per call in microseconds (default: 1.0)")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    import patch_agentlab
+    print(f"import patch_agentlab: {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    from benchmark.acidwave import get_task_catalog
+
+    task_id = args.task_id if args.task_id is not None else get_task_catalog().task_ids[0]
+    task_name = f"acidwave.task_{task_id}"
+    env_id = f"browsergym/{task_name}"
+
+    def baseline(name):
+        return name
+
+    find_spec, original_find_spec, find_spec_label = find_spec_case(baseline)
+    print(f"_find_spec: {find_spec_label}")
+
+    cases = [
+        ("_get_env_name", patch_agentlab.wrap_get_env_name(baseline), baseline, task_name),
+        ("_find_spec", find_spec, original_find_spec, env_id),
+    ]
+
+    failed = False
+    for label, patched, original, name in cases:
+        # First call registers the task (slow path, once per process)
+        start = time.perf_counter()
+        patched(name)
+        first_ms = (time.perf_counter() - start) * 1000
+
+        original_us = time_per_call(original, name, args.number)
+        overhead_us = time_per_call(patched, name, args.number) - original_us
+        ok = overhead_us < args.budget_us
+        failed |= not ok
+        print(f"{label:<14} first call: {first_ms:8.2f} ms   "
+              f"overhead: {overhead_us:.3f} us/call   [{'OK' if ok else 'OVER BUDGET'}]")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -11,6 +11,8 @@
     python experiments/manage_environment.py check
     python experiments/manage_environment.py reset
     python experiments/manage_environment.py info
+    python experiments/manage_environment.py checkpoint --reset-hook http://localhost:3000/api --storage-state state.json
+    python experiments/manage_environment.py restore --reset-hook http://localhost:3000/api
 """
 
 import sys
@@ -166,6 +168,69 @@ class AcidwaveEnvironment:
             print(f"❌ 启动容器失败: {e}")
             return False
     
+    def checkpoint_state(self, reset_hook=None, storage_state=None) -> bool:
+        """
+        快照应用状态 (后端数据检查点 + 浏览器存储快照)
+        
+        之后每个任务可在1秒内恢复 (见 benchmark/acidwave/state_reset.py),
+        不再需要 docker-compose down/up
+        
+        Args:
+            reset_hook: 后端API URL或恢复命令
+            storage_state: 浏览器存储快照输出路径
+        
+        Returns:
+            是否成功
+        """
+        from benchmark.acidwave.state_reset import capture_storage_state, make_reset_hook
+        
+        hook = make_reset_hook(reset_hook)
+        if hook is not None:
+            try:
+                result = hook.checkpoint()
+                print(f"✅ 后端检查点已创建: {result.get('counts', '')}")
+            except Exception as e:
+                print(f"❌ 后端检查点失败: {e}")
+                return False
+        
+        if storage_state:
+            from playwright.sync_api import sync_playwright
+            try:
+                with sync_playwright() as p:
+                    browser = p.chromium.launch(headless=True)
+                    context = browser.new_context()
+                    context.new_page().goto(self.frontend_url, wait_until="networkidle")
+                    capture_storage_state(context, storage_state)
+                    browser.close()
+                print(f"✅ 浏览器存储快照已保存: {storage_state}")
+            except Exception as e:
+                print(f"❌ 浏览器存储快照失败: {e}")
+                return False
+        
+        return True
+    
+    def restore_state(self, reset_hook) -> bool:
+        """
+        恢复后端数据到最近的检查点
+        
+        Returns:
+            是否成功
+        """
+        from benchmark.acidwave.state_reset import make_reset_hook
+        
+        hook = make_reset_hook(reset_hook)
+        if hook is None:
+            print("❌ 需要 --reset-hook")
+            return False
+        start = time.perf_counter()
+        try:
+            hook.restore()
+        except Exception as e:
+            print(f"❌ 恢复失败: {e}")
+            return False
+        print(f"✅ 后端状态已恢复 ({(time.perf_counter() - start) * 1000:.0f}ms)")
+        return True
+    
     def get_info(self) -> dict:
         """
         获取环境信息
@@ -242,6 +307,8 @@ def main():
   info    - 显示环境信息
   start   - 启动环境
   stop    - 停止环境
+  checkpoint - 快照应用状态 (后端检查点 + 浏览器存储)
+  restore    - 恢复后端数据到检查点 (比 reset 快得多)
 
 示例:
   # 检查状态
@@ -253,6 +320,10 @@ def main():
   # 查看信息
   python experiments/manage_environment.py info
   
+  # 快照状态, 之后每个任务快速恢复 (后端需 ENABLE_STATE_RESET=true)
+  python experiments/manage_environment.py checkpoint --reset-hook http://localhost:3000/api --storage-state state.json
+  python experiments/run_full_experiments.py --reset-hook http://localhost:3000/api --storage-state state.json
+  
   # 自定义URL
   python experiments/manage_environment.py check --url http://localhost:8080
         """
@@ -260,7 +331,7 @@ def main():
     
     parser.add_argument(
         'command',
-        choices=['check', 'reset', 'info', 'start', 'stop'],
+        choices=['check', 'reset', 'info', 'start', 'stop', 'checkpoint', 'restore'],
         help='要执行的命令'
     )
     
@@ -271,6 +342,18 @@ def main():
         help='Acidwave前端URL (默认: http://localhost:5173)'
     )
     
+    parser.add_argument(
+        '--reset-hook',
+        type=str,
+        help='后端API URL (如 http://localhost:3000/api) 或恢复后端数据的命令'
+    )
+    
+    parser.add_argument(
+        '--storage-state',
+        type=str,
+        help='浏览器存储快照路径 (checkpoint 时写入)'
+    )
+    
     args = parser.parse_args()
     
     # Create environment manager
@@ -296,6 +379,14 @@ def main():
         success = env.reset_environment()
         sys.exit(0 if success else 1)
     
+    elif args.command == 'checkpoint':
+        success = env.checkpoint_state(reset_hook=args.reset_hook, storage_state=args.storage_state)
+        sys.exit(0 if success else 1)
+    
+    elif args.command == 'restore':
+        success = env.restore_state(args.reset_hook)
+        sys.exit(0 if success else 1)
+    
     elif args.command == 'info':
         env.print_info()
     
@@ -0,0 +1,159 @@
+"""
+Shard Merge Tool
+================
+
+Combine the study directories of a sharded run (``run_full_experiments.py
+--shard-index i --num-shards n`` on each machine) into one study view that
+AgentLab's ``load_result_df``, ``analyze_results.py`` and
+``rescore_results.py`` can read like a single study.
+
+Experiment directories are recreated in the merged directory with their
+files hard-linked (no extra disk space; files are copied where hard links
+are not possible, or always with ``--copy``), and a ``shards.json`` manifest
+records where each one came from. ``analyze_results.py`` and
+``rescore_results.py`` read the manifest of a merged study to report
+results per shard and the duplicates left out (``shard_report``).
+
+Usage:
+    python experiments/merge_shards.py <shard_dir> [<shard_dir> ...] -o <merged_dir>
+    python experiments/merge_shards.py ../agentlab_results/*_shard*of4 -o ../agentlab_results/merged --copy
+"""
+
+import os
+import sys
+import json
+import shutil
+import argparse
+from pathlib import Path
+from typing import Optional
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+MANIFEST_NAME = "shards.json"
+
+
+def _link_or_copy(src: str, dst: str) -> None:
+    """copytree copy_function: hard-link files, copying across filesystems."""
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
+
+def load_manifest(study_dir: Path) -> Optional[dict]:
+    """Shard manifest of a merged study directory (None for an unmerged study)."""
+    manifest_file = Path(study_dir) / MANIFEST_NAME
+    if not manifest_file.exists():
+        return None
+    with open(manifest_file, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def shard_report(manifest: dict, rewards: dict) -> list[str]:
+    """
+    Report lines on a merged study: experiments and successes per shard, duplicates.
+
+    Args:
+        manifest: Manifest of the merged study (see ``load_manifest``)
+        rewards: Experiment directory name -> cum_reward of the experiments to count
+    """
+    lines = [f"{'Shard':<60} {'Exps':>6} {'Success':>8}"]
+    for shard in manifest["shards"]:
+        names = [
+            name for name, source in manifest["experiments"].items()
+            if Path(source).parent == Path(shard) and name in rewards
+        ]
+        n_success = sum((rewards[name] or 0.0) > 0.8 for name in names)
+        lines.append(f"{shard:<60} {len(names):>6} {n_success:>8}")
+    if manifest["duplicates"]:
+        lines.append(f"[!] {len(manifest['duplicates'])} duplicate experiment(s) not merged:")
+        lines.extend(f"   {duplicate}" for duplicate in manifest["duplicates"])
+    return lines
+
+
+def merge_shards(shard_dirs: list[Path], output_dir: Path, copy: bool = False) -> dict:
+    """
+    Hard-link (or copy) every experiment of ``shard_dirs`` into ``output_dir``.
+
+    An experiment directory name that appears in several shards is taken from
+    the first shard that has it.
+
+    Returns:
+        The manifest written to ``output_dir/shards.json``
+    """
+    from benchmark.acidwave.offline import iter_experiment_dirs
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    manifest = {"shards": [str(d.resolve()) for d in shard_dirs], "experiments": {}, "duplicates": []}
+
+    for shard_dir in shard_dirs:
+        for exp_dir in iter_experiment_dirs(shard_dir):
+            if exp_dir.name in manifest["experiments"]:
+                manifest["duplicates"].append(str(exp_dir.resolve()))
+                continue
+            target = output_dir / exp_dir.name
+            # Re-merging replaces earlier copies
+            if target.is_symlink():
+                target.unlink()
+            elif target.exists():
+                shutil.rmtree(target)
+            # Real directories: result loaders do not always follow symlinks
+            shutil.copytree(exp_dir, target, copy_function=shutil.copy2 if copy else _link_or_copy)
+            manifest["experiments"][exp_dir.name] = str(exp_dir.resolve())
+
+    with open(output_dir / MANIFEST_NAME, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def print_report(manifest: dict, output_dir: Path) -> None:
+    """Print experiments per shard and the merged success rate."""
+    print("\n" + "=" * 80)
+    print(f"Merged {len(manifest['experiments'])} experiments from {len(manifest['shards'])} shards")
+    print("=" * 80)
+
+    rewards = {}
+    for name in manifest["experiments"]:
+        summary_file = output_dir / name / "summary_info.json"
+        if summary_file.exists():
+            with open(summary_file, 'r', encoding='utf-8') as f:
+                rewards[name] = json.load(f).get("cum_reward") or 0.0
+    for line in shard_report(manifest, rewards):
+        print(line)
+    if rewards:
+        n_success = sum(reward > 0.8 for reward in rewards.values())
+        print(f"\nSuccess: {n_success}/{len(rewards)} ({n_success / len(rewards) * 100:.1f}%)")
+    print(f"\nMerged study: {output_dir}")
+    print(f"   python experiments/analyze_results.py {output_dir}")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Merge per-shard Acidwave study directories into one study view",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python experiments/merge_shards.py ../agentlab_results/*_shard0of2 ../agentlab_results/*_shard1of2 -o merged
+  python experiments/merge_shards.py shard_a shard_b -o merged --copy
+        """,
+    )
+    parser.add_argument("shard_dirs", nargs="+", help="Study directories of the shards")
+    parser.add_argument("-o", "--output", required=True, help="Merged study directory")
+    parser.add_argument("--copy", action="store_true",
+                        help="Copy result files instead of hard-linking them")
+    args = parser.parse_args()
+
+    shard_dirs = [Path(d) for d in args.shard_dirs]
+    for shard_dir in shard_dirs:
+        if not shard_dir.is_dir():
+            print(f"[X] Not a directory: {shard_dir}")
+            sys.exit(1)
+
+    output_dir = Path(args.output)
+    manifest = merge_shards(shard_dirs, output_dir, copy=args.copy)
+    print_report(manifest, output_dir)
+
+
+if __name__ == "__main__":
+    main()
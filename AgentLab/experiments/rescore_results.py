@@ -0,0 +1,140 @@
+"""
+Offline Re-scoring Tool
+=======================
+
+Re-score stored experiment trajectories against the current test.raw.json,
+without rerunning the browser or the LLM. Useful after editing a task's
+``eval`` block.
+
+Usage:
+    python experiments/rescore_results.py <study_dir> [<study_dir> ...]
+    python experiments/rescore_results.py ../agentlab_results/2025-12-14_* -j 8 -o rescored.json
+"""
+
+import sys
+import json
+import time
+import argparse
+from collections import defaultdict
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from experiments.merge_shards import load_manifest, shard_report
+
+
+def print_report(results: list[dict]) -> None:
+    """Print per-episode changes and per-study totals (per shard for merged studies)."""
+    by_study = defaultdict(list)
+    for result in results:
+        by_study[Path(result["exp_dir"]).parent].append(result)
+
+    for study_dir, study_results in by_study.items():
+        study = study_dir.name
+        print("\n" + "=" * 80)
+        print(f"Study: {study}")
+        print("=" * 80)
+        print(f"{'Task':>6}  {'Original':>10}  {'Rescored':>10}  {'Success':>8}  Note")
+
+        n_success = 0
+        n_changed = 0
+        for result in sorted(study_results, key=lambda r: r.get("task_id", -1)):
+            if "error" in result:
+                print(f"{'?':>6}  {'':>10}  {'':>10}  {'':>8}  [X] {result['error']}")
+                continue
+            original = result["original_cum_reward"]
+            rescored = result["cum_reward"]
+            changed = original is None or abs(original - rescored) > 1e-6
+            n_changed += changed
+            n_success += result["success"]
+            original_str = f"{original:.2f}" if original is not None else "n/a"
+            note = "[CHANGED] " + "; ".join(result["checks_failed"][:2]) if changed else ""
+            print(
+                f"{result['task_id']:>6}  {original_str:>10}  {rescored:>10.2f}  "
+                f"{'yes' if result['success'] else 'no':>8}  {note}"
+            )
+
+        print(f"\nSuccess: {n_success}/{len(study_results)}, changed rewards: {n_changed}")
+
+        manifest = load_manifest(study_dir)
+        if manifest is not None:
+            rewards = {
+                Path(result["exp_dir"]).name: result["cum_reward"]
+                for result in study_results if "error" not in result
+            }
+            print()
+            for line in shard_report(manifest, rewards):
+                print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Re-score stored Acidwave trajectories with the current eval config",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Re-score one study
+  python experiments/rescore_results.py ../agentlab_results/<study_dir>
+
+  # Re-score several studies on 8 processes and keep the raw results
+  python experiments/rescore_results.py ../agentlab_results/2025-12-14_* -j 8 -o rescored.json
+        """
+    )
+
+    parser.add_argument(
+        'study_dirs',
+        type=str,
+        nargs='+',
+        help='Study (or single experiment) directories to re-score'
+    )
+
+    parser.add_argument(
+        '-j', '--jobs',
+        type=int,
+        default=None,
+        help='Number of worker processes (default: CPU count)'
+    )
+
+    parser.add_argument(
+        '--task-file',
+        type=str,
+        default=None,
+        help='Task definitions to score against (default: benchmark/acidwave/test.raw.json)'
+    )
+
+    parser.add_argument(
+        '-o', '--output',
+        type=str,
+        help='Write the per-episode results to this JSON file'
+    )
+
+    args = parser.parse_args()
+
+    study_dirs = [Path(d) for d in args.study_dirs]
+    for study_dir in study_dirs:
+        if not study_dir.exists():
+            print(f"[X] Directory does not exist: {study_dir}")
+            sys.exit(1)
+
+    from benchmark.acidwave.offline import DEFAULT_TASK_FILE, rescore_study
+
+    start = time.time()
+    results = rescore_study(
+        study_dirs,
+        task_file=args.task_file or DEFAULT_TASK_FILE,
+        max_workers=args.jobs,
+    )
+    elapsed = time.time() - start
+
+    print_report(results)
+    print(f"\n[OK] Re-scored {len(results)} episodes in {elapsed:.1f}s")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+        print(f"[OK] Results saved to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,7 +7,11 @@ Following WebArena's evaluation process, run all 16 tasks and generate detailed
 Usage:
     python experiments/run_full_experiments.py
     python experiments/run_full_experiments.py --difficulty easy
+    python experiments/run_full_experiments.py --difficulty hard --eval-type program_html
     python experiments/run_full_experiments.py --task-range 0 5
+    python experiments/run_full_experiments.py --har-record hars/ && python experiments/run_full_experiments.py --har-replay hars/
+    python experiments/run_full_experiments.py --local-backend
+    python experiments/run_full_experiments.py --shard-index 0 --num-shards 4 --cost-history ../agentlab_results
 """
 
 import os
@@ -20,7 +24,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 # CRITICAL: Patch AgentLab to support Acidwave tasks in Ray workers
 import patch_agentlab
 
-from benchmark.acidwave import AcidwaveBenchmark
+from benchmark.acidwave import AcidwaveBenchmark, get_task_catalog
 
 # Set API key if not already set
 if not os.getenv("OPENAI_API_KEY"):
@@ -36,12 +40,26 @@ from agents.acidwave_agent import ACIDWAVE_AGENT, ACIDWAVE_REASONING_AGENT
 def run_full_experiments(
     task_ids=None,
     difficulty=None,
+    eval_type=None,
     agent=None,
     headless=True,
-    slow_mo=100,
+    slow_mo=0,
+    ready_timeout=None,
+    resource_policy=None,
+    storage_state=None,
+    reset_hook=None,
+    har_mode=None,
+    har_dir=None,
+    local_backend=None,
+    local_frontend=None,
     max_steps=30,
     n_jobs=1,
     quiet=False,
+    browser_pool=False,
+    shard_index=None,
+    num_shards=None,
+    cost_history=None,
+    schedule="auto",
 ):
     """
     Run complete Acidwave experiments
@@ -49,12 +67,28 @@ def run_full_experiments(
     Args:
         task_ids: List of task IDs to run (None = all)
         difficulty: Filter by difficulty ("easy", "medium", "hard")
+        eval_type: Filter by evaluator type, or a list of types (any of them)
         agent: Agent to use (default: ACIDWAVE_AGENT)
         headless: Whether to run in headless mode
-        slow_mo: Browser operation delay (ms)
+        slow_mo: Browser operation delay (ms, 0: rely on readiness waits)
+        ready_timeout: Upper bound (ms) for the app to settle after loading (None: task default)
+        resource_policy: "lean" (skip audio, fonts and cover images) or "full" (None: task default, lean)
+        storage_state: Storage snapshot applied to every task before the app loads
+        reset_hook: Backend API URL or shell command restoring the backend checkpoint
+            before each task (checkpoint taken once before the run)
+        har_mode: "record" each task's API traffic into har_dir, or "replay" it from there
+        har_dir: Directory of the per-task HAR files
+        local_backend: Port of an in-process stand-in backend (SQLite, mock data) that also
+            serves the built frontend; every task starts there (None: deployed app)
+        local_frontend: Built frontend served by the local backend (None: acidwave-app/dist)
         max_steps: Maximum steps per task
         n_jobs: Number of parallel tasks
         quiet: Quiet mode, reduce terminal output
+        browser_pool: Run tasks on persistent workers that keep a launched browser
+        shard_index: Shard of the selected tasks to run on this node (with num_shards)
+        num_shards: Number of nodes the selected tasks are split across
+        cost_history: Results directories used to predict task durations (shards, schedule)
+        schedule: Task order: "task_id", "longest_first", or "auto" (longest first if n_jobs > 1)
     """
     def log(msg="", level="info"):
         """Conditional print function"""
@@ -78,23 +112,84 @@ def run_full_experiments(
     # Load benchmark
     log("\n[1/6] Loading tasks...")
     
+    # Longest tasks first keeps parallel runs close to the makespan lower bound
+    if schedule == "auto":
+        schedule = "longest_first" if n_jobs > 1 else "task_id"
+
+    # Serve the API and the frontend locally; tasks start there instead of the deployed app
+    local_server = None
+    if local_backend is not None:
+        from benchmark.acidwave.local_backend import DEFAULT_FRONTEND_DIR, LocalBackend
+
+        try:
+            local_server = LocalBackend(
+                port=local_backend, frontend_dir=local_frontend or DEFAULT_FRONTEND_DIR
+            ).start()
+        except OSError as e:
+            print(f"   ❌ Cannot start local backend: {e}")  # Always show errors
+            sys.exit(1)
+        # Restoring the local database takes milliseconds
+        if reset_hook is None:
+            reset_hook = local_server.api_url
+
+    # Same partition on every node given the same selection and cost history
+    benchmark_kwargs = dict(
+        shard_index=shard_index,
+        num_shards=num_shards,
+        cost_history=cost_history,
+        schedule=schedule,
+        ready_timeout=ready_timeout,
+        resource_policy=resource_policy,
+        storage_state=storage_state,
+        reset_hook=reset_hook,
+        har_mode=har_mode,
+        har_dir=har_dir,
+        start_url=local_server.url if local_server else None,
+    )
+
+    # Metadata filters, intersected (e.g. hard AND program_html)
+    criteria = {}
+    if difficulty is not None:
+        criteria["difficulty"] = difficulty
+    if eval_type is not None:
+        criteria["eval_type"] = eval_type
+
     # Determine task subset
-    if task_ids is not None:
+    if criteria:
+        # Filter by metadata (within the explicit task IDs, if any)
+        index = get_task_catalog().index
+        matching = [record["task_id"] for record in index.select(**criteria)]
+        if task_ids is not None:
+            selected = set(task_ids)
+            matching = [task_id for task_id in matching if task_id in selected]
+        task_ids = matching
+        benchmark = AcidwaveBenchmark(task_subset=task_ids, **benchmark_kwargs)
+        log(f"   Filtered by: {', '.join(f'{k}={v}' for k, v in criteria.items())}")
+        log(f"   Matching tasks: {len(task_ids)} tasks")
+    elif task_ids is not None:
         # Explicit task IDs
-        benchmark = AcidwaveBenchmark(task_subset=task_ids)
+        benchmark = AcidwaveBenchmark(task_subset=task_ids, **benchmark_kwargs)
         log(f"   Using specified tasks: {task_ids}")
-    elif difficulty is not None:
-        # Filter by difficulty
-        temp_benchmark = AcidwaveBenchmark()
-        filtered_tasks = temp_benchmark.get_tasks_by_difficulty(difficulty)
-        task_ids = [t["task_id"] for t in filtered_tasks]
-        benchmark = AcidwaveBenchmark(task_subset=task_ids)
-        log(f"   Filtered by difficulty: {difficulty}")
-        log(f"   Matching tasks: {len(task_ids)} tasks")
     else:
         # All tasks
-        benchmark = AcidwaveBenchmark()
+        benchmark = AcidwaveBenchmark(**benchmark_kwargs)
         log(f"   Loaded all tasks: {len(benchmark)} tasks")
+
+    if num_shards is not None:
+        log(f"   Shard {shard_index + 1}/{num_shards}: {len(benchmark)} tasks "
+            f"{[t['task_id'] for t in benchmark]}")
+
+    if schedule == "longest_first":
+        from benchmark.acidwave.scheduling import makespan_lower_bound, simulate_makespan
+
+        durations = benchmark.predicted_durations
+        ordered = [durations[t["task_id"]] for t in benchmark]
+        by_id = [durations[t["task_id"]] for t in sorted(benchmark, key=lambda t: t["task_id"])]
+        log(f"   Schedule: longest first {[t['task_id'] for t in benchmark]}")
+        log(f"   Predicted step time with {n_jobs} workers: "
+            f"{simulate_makespan(ordered, n_jobs):.0f}s "
+            f"(task-id order {simulate_makespan(by_id, n_jobs):.0f}s, "
+            f"lower bound {makespan_lower_bound(ordered, n_jobs):.0f}s)")
     
     # Show task details
     if not quiet:
@@ -106,8 +201,22 @@ def run_full_experiments(
     log(f"\n🖥️  Browser Configuration:")
     log(f"   Display Mode: {'Headless' if headless else 'Visual'}")
     log(f"   Operation Delay: {slow_mo}ms")
+    log(f"   Readiness Timeout: {f'{ready_timeout}ms' if ready_timeout is not None else 'default'}")
+    log(f"   Resources: {resource_policy or 'lean'} (lean: no audio, fonts or cover images)")
+    log(f"   State Reset: storage {storage_state or 'empty'}, backend {reset_hook or 'none'}")
+    log(f"   API: {f'HAR {har_mode} ({har_dir})' if har_mode else 'live'}")
+    if local_server:
+        counts = local_server.counts()
+        log(f"   Backend: local {local_server.url} ({counts['songs']} songs, {counts['playlists']} playlists)")
+    if har_mode == "replay":
+        from benchmark.acidwave.har import task_har_path
+
+        missing = [t["task_id"] for t in benchmark if not task_har_path(har_dir, t["task_id"]).exists()]
+        if missing:
+            log(f"   ⚠️  No recorded HAR for tasks {missing}: they will fail in setup", level="warning")
     log(f"   Max Steps: {max_steps}")
     log(f"   Parallel Tasks: {n_jobs}")
+    log(f"   Browser Pool: {'Persistent workers' if browser_pool else 'Off (new browser per task)'}")
     
     # Create study
     log("\n[2/6] Creating experiment...")
@@ -134,8 +243,12 @@ def run_full_experiments(
         suffix = f"full_experiment"
         if difficulty:
             suffix += f"_{difficulty}"
+        if eval_type:
+            suffix += "_" + ("-".join(eval_type) if isinstance(eval_type, (list, tuple)) else eval_type)
         if task_ids and len(task_ids) < 16:
             suffix += f"_tasks{len(task_ids)}"
+        if num_shards is not None:
+            suffix += f"_shard{shard_index}of{num_shards}"
         
         study = make_study(
             agent_args=[agent],
@@ -168,6 +281,20 @@ def run_full_experiments(
     #     if response.lower() != 'y':
     #         sys.exit(1)
     
+    # Checkpoint the backend data once; each task restores it at setup
+    if reset_hook:
+        from benchmark.acidwave.state_reset import make_reset_hook
+
+        if n_jobs > 1:
+            log("   ⚠️  Parallel tasks share the backend: a restore can undo another running task's changes",
+                level="warning")
+        try:
+            make_reset_hook(reset_hook).checkpoint()
+            log(f"   ✅ Backend state checkpoint taken ({reset_hook})")
+        except Exception as e:
+            print(f"   ❌ Backend state checkpoint failed: {e}")  # Always show errors
+            sys.exit(1)
+    
     # Run experiments
     log("\n[4/6] Running experiments...")
     log(f"   This may take {len(benchmark) * 2}-{len(benchmark) * 5} minutes...")
@@ -176,28 +303,54 @@ def run_full_experiments(
         log("\n   💡 Browser window will open, you can watch the agent's actions")
     
     try:
-        study.run(n_jobs=n_jobs)
+        if browser_pool:
+            # Long-lived workers keep Chromium running; each task gets a fresh BrowserContext
+            from browser_pool import browser_pool_backend
+
+            warmup_url = benchmark[0]["start_url"] if len(benchmark) > 0 else None
+            with browser_pool_backend(
+                n_workers=n_jobs, headless=headless, slow_mo=slow_mo, warmup_url=warmup_url
+            ):
+                study.run(n_jobs=n_jobs)
+        else:
+            study.run(n_jobs=n_jobs)
         log("   ✅ Experiment completed!")
+        if har_mode == "record":
+            from benchmark.acidwave.har import har_summary
+
+            recorded = har_summary(har_dir)
+            log(f"   ✅ Recorded API traffic of {len(recorded)} tasks "
+                f"({sum(recorded.values())} requests) into {har_dir}")
     except Exception as e:
         print(f"   ❌ Experiment failed: {e}")  # Always show errors
         print(f"\n   View logs: {study.dir}")
         sys.exit(1)
+    finally:
+        if local_server:
+            local_server.stop()
     
     # Analyze results
     log("\n[5/6] Analyzing results...")
     from agentlab.analyze import inspect_results
-    
+    from benchmark.acidwave.telemetry import write_validation_timings
+
     summary_file = None  # Initialize to avoid UnboundLocalError
-    
+
+    # Per-task validation timing percentiles (validation.* columns)
+    try:
+        n_timed = write_validation_timings(study.dir)
+        log(f"   ✅ Validation timings aggregated for {n_timed} tasks")
+    except Exception as e:
+        log(f"   ⚠️  Could not aggregate validation timings: {e}", level="warning")
+
     try:
         result_df = inspect_results.load_result_df(study.dir)
 
+        # Task name -> difficulty, shared by the enrichment below
+        task_difficulty = benchmark.task_index.column("difficulty")
+
         # Enrich with difficulty if missing
         if "difficulty" not in result_df.columns:
-            difficulty_map = {
-                f"acidwave.task_{t['task_id']}": t.get("difficulty", "unknown")
-                for t in benchmark
-            }
 
             # Try to find a task identifier column
             task_col = None
@@ -208,7 +361,7 @@ def run_full_experiments(
 
             if task_col:
                 result_df["difficulty"] = result_df[task_col].map(
-                    lambda tn: difficulty_map.get(tn, "unknown")
+                    lambda tn: task_difficulty.get(tn, "unknown")
                 )
             else:
                 # Fallback: fill with unknown to avoid KeyError in downstream analysis
@@ -234,22 +387,14 @@ def run_full_experiments(
         print(f"   Failed: {fail_count:2d} / {total}")
         
         # By difficulty
-        if not quiet and ("difficulty" in result_df.columns or len(benchmark._tasks) > 0):
+        if not quiet and ("difficulty" in result_df.columns or len(benchmark) > 0):
             print(f"\n📈 Analysis by Difficulty:")
             
             # Add difficulty to results - check for task_name column
             if 'task_name' in result_df.columns:
-                task_difficulty = {
-                    f"acidwave.task_{t['task_id']}": t['difficulty']
-                    for t in benchmark._tasks
-                }
                 result_df['difficulty'] = result_df['task_name'].map(task_difficulty)
             elif 'exp_args.env_args.task_name' in result_df.columns:
                 # Alternative column name
-                task_difficulty = {
-                    f"acidwave.task_{t['task_id']}": t['difficulty']
-                    for t in benchmark._tasks
-                }
                 result_df['difficulty'] = result_df['exp_args.env_args.task_name'].map(task_difficulty)
             
             for diff in ["easy", "medium", "hard"]:
@@ -368,6 +513,7 @@ def run_full_experiments(
 
 def main():
     import argparse
+    from benchmark.acidwave.local_backend import DEFAULT_PORT
     
     parser = argparse.ArgumentParser(
         description="Run complete Acidwave experiments (WebArena style)",
@@ -380,6 +526,9 @@ Examples:
   # Run only easy tasks
   python experiments/run_full_experiments.py --difficulty easy
   
+  # Run hard tasks checked by program_html
+  python experiments/run_full_experiments.py --difficulty hard --eval-type program_html
+  
   # Run specified task range
   python experiments/run_full_experiments.py --task-range 0 5
   
@@ -391,6 +540,16 @@ Examples:
   
   # Parallel execution (requires sufficient resources)
   python experiments/run_full_experiments.py --n-jobs 3
+  
+  # Reuse launched browsers across tasks (persistent workers)
+  python experiments/run_full_experiments.py --n-jobs 3 --browser-pool
+  
+  # Run against a local stand-in backend (build acidwave-app first: npm run build)
+  python experiments/run_full_experiments.py --local-backend
+  
+  # Split the tasks across 4 machines (run once per machine, then merge)
+  python experiments/run_full_experiments.py --shard-index 0 --num-shards 4 --cost-history ../agentlab_results
+  python experiments/merge_shards.py <shard_study_dir> ... -o <merged_dir>
         """
     )
     
@@ -400,6 +559,14 @@ Examples:
         help='Filter tasks by difficulty'
     )
     
+    parser.add_argument(
+        '--eval-type',
+        nargs='+',
+        choices=['string_match', 'url_match', 'program_html'],
+        help='Filter tasks by evaluator type (any of the given types; '
+             'combined with --difficulty and --task-ids/--task-range)'
+    )
+    
     parser.add_argument(
         '--task-range',
         nargs=2,
@@ -431,8 +598,62 @@ Examples:
     parser.add_argument(
         '--slow-mo',
         type=int,
-        default=100,
-        help='Browser operation delay (ms, default: 100)'
+        default=0,
+        help='Browser operation delay (ms, default: 0; pages are awaited until they settle)'
+    )
+    
+    parser.add_argument(
+        '--ready-timeout',
+        type=int,
+        help='Upper bound (ms) for the app to settle (network idle, DOM quiet) after loading (default: 5000)'
+    )
+    
+    parser.add_argument(
+        '--resource-policy',
+        choices=['lean', 'full'],
+        help='lean: abort audio and fonts and stub cover images unless a task allows them; '
+             'full: load everything (default: lean)'
+    )
+    
+    parser.add_argument(
+        '--storage-state',
+        metavar='PATH',
+        help='Storage snapshot (see manage_environment.py checkpoint) applied to every task'
+    )
+    
+    har_group = parser.add_mutually_exclusive_group()
+    har_group.add_argument(
+        '--har-record',
+        metavar='DIR',
+        help='Record each task\'s /api/* traffic into DIR/acidwave.task_<id>.har'
+    )
+    har_group.add_argument(
+        '--har-replay',
+        metavar='DIR',
+        help='Serve /api/* from the HAR files recorded into DIR (no backend needed)'
+    )
+    
+    parser.add_argument(
+        '--local-backend',
+        nargs='?',
+        type=int,
+        const=DEFAULT_PORT,
+        metavar='PORT',
+        help=f'Serve the API from an in-memory SQLite copy of backend/database (mock data) and the '
+             f'built frontend on PORT (default: {DEFAULT_PORT}), and start every task there'
+    )
+    
+    parser.add_argument(
+        '--local-frontend',
+        metavar='DIR',
+        help='Built frontend served by --local-backend (default: acidwave-app/dist)'
+    )
+    
+    parser.add_argument(
+        '--reset-hook',
+        metavar='URL_OR_COMMAND',
+        help='Backend API URL (e.g. http://localhost:3000/api, needs ENABLE_STATE_RESET=true) '
+             'or shell command restoring the backend data before each task'
     )
     
     parser.add_argument(
@@ -455,8 +676,49 @@ Examples:
         help='Quiet mode, reduce terminal output'
     )
     
+    parser.add_argument(
+        '--browser-pool',
+        action='store_true',
+        help='Run tasks on persistent workers that keep a launched browser (fresh context per task)'
+    )
+    
+    parser.add_argument(
+        '--shard-index',
+        type=int,
+        help='Shard of the selected tasks to run on this machine (0-based, with --num-shards)'
+    )
+    
+    parser.add_argument(
+        '--num-shards',
+        type=int,
+        help='Number of machines the selected tasks are split across'
+    )
+    
+    parser.add_argument(
+        '--cost-history',
+        nargs='+',
+        metavar='DIR',
+        help='Results directories whose summary_info.json predict task durations for '
+             'shard balancing and scheduling (use the same directories on every machine)'
+    )
+    
+    parser.add_argument(
+        '--schedule',
+        choices=['auto', 'task-id', 'longest-first'],
+        default='auto',
+        help='Task order: longest predicted duration first, or task ID order '
+             '(default: auto = longest-first when --n-jobs > 1)'
+    )
+    
     args = parser.parse_args()
     
+    if args.local_frontend and args.local_backend is None:
+        parser.error("--local-frontend requires --local-backend")
+    if (args.shard_index is None) != (args.num_shards is None):
+        parser.error("--shard-index and --num-shards must be given together")
+    if args.num_shards is not None and not 0 <= args.shard_index < args.num_shards:
+        parser.error(f"--shard-index must be in [0, {args.num_shards})")
+    
     # Determine task IDs
     task_ids = None
     if args.task_ids:
@@ -478,12 +740,26 @@ Examples:
     run_full_experiments(
         task_ids=task_ids,
         difficulty=args.difficulty,
+        eval_type=args.eval_type,
         agent=agent,
         headless=not args.no_headless,
         slow_mo=args.slow_mo,
+        ready_timeout=args.ready_timeout,
+        resource_policy=args.resource_policy,
+        storage_state=args.storage_state,
+        reset_hook=args.reset_hook,
+        har_mode="record" if args.har_record else "replay" if args.har_replay else None,
+        har_dir=args.har_record or args.har_replay,
+        local_backend=args.local_backend,
+        local_frontend=args.local_frontend,
         max_steps=args.max_steps,
         n_jobs=args.n_jobs,
         quiet=args.quiet,
+        browser_pool=args.browser_pool,
+        shard_index=args.shard_index,
+        num_shards=args.num_shards,
+        cost_history=args.cost_history,
+        schedule=args.schedule.replace('-', '_'),
     )
 
 
@@ -0,0 +1,86 @@
+"""
+Local Backend Server
+====================
+
+Serve the Acidwave API from an in-memory SQLite copy of backend/database
+(schema.sql + mock-data.sql), optionally with the built frontend, without
+Supabase or Node. Same routes and responses as backend/src; POST
+/api/state/restore reloads the seed data.
+
+Usage:
+    python experiments/serve_local_backend.py
+    python experiments/serve_local_backend.py --port 3001 --frontend ../acidwave-app/dist
+    python experiments/serve_local_backend.py --seed ../backend/database/mock-data.sql extra.sql
+"""
+
+import sys
+import time
+import logging
+import argparse
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from benchmark.acidwave.local_backend import DEFAULT_DATABASE_DIR, DEFAULT_HOST, DEFAULT_PORT, LocalBackend
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Serve the Acidwave API (and frontend) from an in-memory SQLite database",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # API only, for the Vite dev server (its /api proxy targets port 3000)
+  python experiments/serve_local_backend.py
+
+  # API and production build on one origin
+  python experiments/serve_local_backend.py --frontend ../acidwave-app/dist
+        """
+    )
+
+    parser.add_argument('--host', default=DEFAULT_HOST, help=f'Host to listen on (default: {DEFAULT_HOST})')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help=f'Port (default: {DEFAULT_PORT})')
+
+    parser.add_argument(
+        '--database-dir',
+        default=str(DEFAULT_DATABASE_DIR),
+        help='Directory of schema.sql and add-user-favorites.sql (default: backend/database)'
+    )
+
+    parser.add_argument(
+        '--seed',
+        nargs='+',
+        metavar='SQL',
+        help='SQL files loaded after the schema (default: mock-data.sql)'
+    )
+
+    parser.add_argument(
+        '--frontend',
+        metavar='DIR',
+        help='Built frontend served for non-API paths'
+    )
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    backend = LocalBackend(
+        host=args.host,
+        port=args.port,
+        database_dir=args.database_dir,
+        seed_files=args.seed,
+        frontend_dir=args.frontend,
+    )
+    with backend:
+        print(f"API: {backend.api_url}")
+        if backend.frontend_dir:
+            print(f"App: {backend.url}")
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
@@ -14,49 +14,100 @@ Usage:
 
 import os
 import sys
+import threading
+from pathlib import Path
 
 # 控制调试输出 - 设置环境变量 ACIDWAVE_DEBUG=1 启用详细输出
 ACIDWAVE_DEBUG = os.environ.get('ACIDWAVE_DEBUG', '0') == '1'
 
+# Directory containing the benchmark package (browsergym-integration/ loads this file too)
+PROJECT_ROOT = Path(__file__).resolve().parent
+
+# Attribute marking functions already wrapped by this module (patch once per process)
+_PATCH_MARKER = "_acidwave_patched"
+
 def debug_print(msg):
     """条件打印调试信息"""
     if ACIDWAVE_DEBUG:
         print(msg)
 
 
+# benchmark.acidwave, imported once per process by _import_acidwave()
+_acidwave = None
+_acidwave_lock = threading.Lock()
+
+# Env IDs and task names already registered in this process: the per-call fast path
+_ready_names = set()
+
+
+def _import_acidwave():
+    """Import benchmark.acidwave (adding PROJECT_ROOT to sys.path) once per process."""
+    global _acidwave
+    if _acidwave is None:
+        with _acidwave_lock:
+            if _acidwave is None:
+                # CRITICAL: Ensure project root is in sys.path
+                if str(PROJECT_ROOT) not in sys.path:
+                    sys.path.insert(0, str(PROJECT_ROOT))
+                    debug_print(f"[patch_agentlab] Added {PROJECT_ROOT} to sys.path")
+                import benchmark.acidwave
+                _acidwave = benchmark.acidwave
+    return _acidwave
+
+
+def _ensure_acidwave_task(name: str) -> bool:
+    """
+    Register the Acidwave task behind an env ID or task name.
+
+    Constant time (one set lookup) once ``name`` has been registered.
+
+    Returns:
+        False if ``name`` is not a task of test.raw.json
+    """
+    if name in _ready_names:
+        return True
+    registered = _import_acidwave().ensure_task_registered(name)
+    if registered:
+        _ready_names.add(name)
+        debug_print(f"[patch_agentlab] Registered {name} in PID {os.getpid()}")
+    return registered
+
+
+def wrap_get_env_name(original_get_env_name):
+    """Wrap AgentLab's _get_env_name so Acidwave tasks are registered before env creation."""
+
+    def _patched_get_env_name(task_name: str):
+        """Enhanced version that handles Acidwave tasks."""
+        if task_name not in _ready_names and task_name.startswith("acidwave"):
+            try:
+                if not _ensure_acidwave_task(task_name):
+                    print(f"[patch_agentlab] WARNING: {task_name} is not an Acidwave task of test.raw.json")
+            except ImportError as e:
+                print(f"[patch_agentlab] ERROR: Failed to import benchmark.acidwave: {e}")
+                print(f"[patch_agentlab] sys.path = {sys.path}")
+                raise
+
+        # Call original function for other tasks
+        return original_get_env_name(task_name)
+
+    setattr(_patched_get_env_name, _PATCH_MARKER, True)
+    return _patched_get_env_name
+
+
 def patch_gymnasium_for_acidwave():
     """
-    Patch Gymnasium's _find_spec to auto-import benchmark.acidwave when acidwave tasks are requested.
-    
-    This is a fallback to ensure tasks are registered even in Ray workers.
+    Make Gymnasium register Acidwave tasks when they are looked up.
+
+    Delegates to benchmark.acidwave's lazy registration, the one wrapper of
+    Gymnasium's _find_spec (installed when Gymnasium is imported, if it is
+    not yet). This is a fallback to ensure tasks are registered even in Ray workers.
     """
     try:
-        import gymnasium
-        from gymnasium.envs import registration
-        
-        # Save original function
-        _original_find_spec = registration._find_spec
-        
-        def _patched_find_spec(env_id: str):
-            """Enhanced _find_spec that auto-imports acidwave benchmark."""
-            # Check if it's an acidwave task
-            if "acidwave" in env_id.lower():
-                # Force import to register tasks
-                try:
-                    import benchmark.acidwave
-                    debug_print(f"[patch_gymnasium] Auto-imported benchmark.acidwave for {env_id} in PID {os.getpid()}")
-                except Exception as e:
-                    debug_print(f"[patch_gymnasium] Failed to import benchmark.acidwave: {e}")
-            
-            # Call original function
-            return _original_find_spec(env_id)
-        
-        # Replace the function
-        registration._find_spec = _patched_find_spec
-        
-        debug_print("[patch_gymnasium] Successfully patched Gymnasium for Acidwave tasks")
+        _import_acidwave().install_lazy_registration()
+
+        debug_print("[patch_gymnasium] Installed Acidwave lazy registration for Gymnasium")
         return True
-        
+
     except Exception as e:
         debug_print(f"[patch_gymnasium] Error patching Gymnasium: {e}")
         return False
@@ -72,49 +123,11 @@ def patch_agentlab_for_acidwave():
     try:
         from agentlab.experiments import loop
 
-        # Save original function
-        _original_get_env_name = loop._get_env_name
-
-        def _patched_get_env_name(task_name: str):
-            """Enhanced version that handles Acidwave tasks."""
-            import sys
-            import os
-            from pathlib import Path
-            
-            debug_print(f"[patch_agentlab._patched_get_env_name] Called with task_name={task_name}, PID={os.getpid()}")
-            
-            # Register Acidwave tasks if needed
-            if task_name.startswith("acidwave"):
-                # CRITICAL: Ensure project root is in sys.path
-                project_root = Path(__file__).parent
-                if str(project_root) not in sys.path:
-                    sys.path.insert(0, str(project_root))
-                    debug_print(f"[patch_agentlab] Added {project_root} to sys.path")
-                
-                # Force import of benchmark package
-                # This triggers automatic registration via benchmark/acidwave/__init__.py
-                try:
-                    import benchmark.acidwave
-                    debug_print(f"[patch_agentlab] Successfully imported benchmark.acidwave (registered {len(benchmark.acidwave.ALL_ACIDWAVE_TASK_IDS)} tasks) in PID {os.getpid()}")
-                    
-                    # Verify registration
-                    import gymnasium as gym
-                    registry = gym.envs.registry
-                    acidwave_tasks = [env_id for env_id in registry if 'acidwave' in env_id]
-                    debug_print(f"[patch_agentlab] Found {len(acidwave_tasks)} acidwave tasks in gym registry")
-                    
-                except ImportError as e:
-                    print(f"[patch_agentlab] ERROR: Failed to import benchmark.acidwave: {e}")
-                    print(f"[patch_agentlab] sys.path = {sys.path}")
-                    raise
-
-            # Call original function for other tasks
-            result = _original_get_env_name(task_name)
-            debug_print(f"[patch_agentlab._patched_get_env_name] Returning: {result}")
-            return result
+        if getattr(loop._get_env_name, _PATCH_MARKER, False):
+            return True
 
         # Replace the function
-        loop._get_env_name = _patched_get_env_name
+        loop._get_env_name = wrap_get_env_name(loop._get_env_name)
 
         debug_print("[patch_agentlab] Successfully patched AgentLab for Acidwave tasks")
         return True
@@ -139,8 +152,10 @@ def patch_ray_init_for_acidwave():
     """
     try:
         import ray
-        from pathlib import Path
-        
+
+        if getattr(ray.init, _PATCH_MARKER, False):
+            return True
+
         # Save original ray.init
         _original_ray_init = ray.init
         
@@ -149,7 +164,7 @@ def patch_ray_init_for_acidwave():
             debug_print(f"[patch_ray_init] Patching ray.init with Acidwave runtime_env")
             
             # Get project root directory
-            project_root = Path(__file__).parent.absolute()
+            project_root = PROJECT_ROOT
             
             # Set up runtime_env if not provided
             if 'runtime_env' not in kwargs:
@@ -180,6 +195,7 @@ def patch_ray_init_for_acidwave():
             return _original_ray_init(*args, **kwargs)
         
         # Replace ray.init
+        setattr(_patched_ray_init, _PATCH_MARKER, True)
         ray.init = _patched_ray_init
         
         debug_print("[patch_ray_init] Successfully patched ray.init for Acidwave tasks")
@@ -203,21 +219,12 @@ patch_ray_init_for_acidwave()   # Finally patch Ray to setup worker initializati
 
 
 # CRITICAL: Also ensure benchmark is imported in main process
+# (installs lazy registration; tasks are registered when first looked up)
 try:
-    import benchmark.acidwave
-    debug_print(f"[patch_agentlab] Registered {len(benchmark.acidwave.ALL_ACIDWAVE_TASK_IDS)} tasks in main process (PID {os.getpid()})")
-    
-    # Verify tasks are actually registered
-    import gymnasium as gym
-    registry = gym.envs.registry
-    acidwave_tasks = [env_id for env_id in registry if 'acidwave' in env_id]
-    if acidwave_tasks:
-        debug_print(f"[patch_agentlab] Verified {len(acidwave_tasks)} Acidwave tasks in Gymnasium registry")
-    else:
-        print("[patch_agentlab] WARNING: No Acidwave tasks found in Gymnasium registry!")
-        
+    _import_acidwave()
+    debug_print(f"[patch_agentlab] Installed lazy Acidwave task registration in main process (PID {os.getpid()})")
+
 except ImportError as e:
     print(f"[patch_agentlab] Warning: Could not import benchmark.acidwave: {e}")
 except Exception as e:
     print(f"[patch_agentlab] Error during task registration: {e}")
-
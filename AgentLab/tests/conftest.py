@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# Project root for benchmark.acidwave / experiments (as the scripts do)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -0,0 +1,108 @@
+import json
+import os
+import stat
+
+import pytest
+
+from benchmark.acidwave.catalog import (
+    DEFAULT_TASK_FILE,
+    TaskCatalog,
+    catalog_cache_path,
+    find_task_config,
+    get_task_catalog,
+)
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    directory = tmp_path / "cache"
+    monkeypatch.setenv("ACIDWAVE_CACHE_DIR", str(directory))
+    return directory
+
+
+@pytest.fixture
+def tasks():
+    with open(DEFAULT_TASK_FILE, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def write_tasks(path, tasks, mtime_ns=None):
+    path.write_text(json.dumps(tasks), encoding='utf-8')
+    if mtime_ns is not None:
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_cache_is_written_outside_the_task_dir(tmp_path, cache_dir, tasks):
+    task_file = tmp_path / "suite.json"
+    write_tasks(task_file, tasks)
+    TaskCatalog.load(task_file)
+
+    cache_path = catalog_cache_path(task_file)
+    assert cache_path.parent == cache_dir
+    assert stat.S_IMODE(os.stat(cache_path).st_mode) == 0o644
+    assert not list(tmp_path.glob("*.pkl"))
+
+
+def test_cache_hit_returns_the_same_tasks_and_plans(tmp_path, cache_dir, tasks):
+    task_file = tmp_path / "suite.json"
+    write_tasks(task_file, tasks)
+    parsed = TaskCatalog.load(task_file)
+    cached = TaskCatalog.load(task_file)
+
+    assert cached._pickled_plans  # served from the cache
+    assert list(cached) == list(parsed)
+    task_id = parsed.task_ids[0]
+    assert cached.eval_plan(task_id) == parsed.eval_plan(task_id)
+
+
+def test_get_task_catalog_reloads_after_the_file_changes(tmp_path, cache_dir, tasks):
+    task_file = tmp_path / "suite.json"
+    write_tasks(task_file, tasks[:2], mtime_ns=1_000_000_000)
+    first = get_task_catalog(task_file)
+    assert get_task_catalog(task_file) is first
+    assert len(first) == 2
+
+    write_tasks(task_file, tasks[:3], mtime_ns=2_000_000_000)
+    second = get_task_catalog(task_file)
+    assert second is not first
+    assert len(second) == 3
+
+
+def test_corrupt_cache_falls_back_to_json(tmp_path, cache_dir, tasks):
+    task_file = tmp_path / "suite.json"
+    write_tasks(task_file, tasks)
+    TaskCatalog.load(task_file)
+    catalog_cache_path(task_file).write_bytes(b"not a pickle")
+
+    catalog = TaskCatalog.load(task_file)
+    assert len(catalog) == len(tasks)
+    assert catalog.eval_plan(catalog.task_ids[0]) is not None
+
+
+def test_invalid_eval_config_only_fails_its_task(tmp_path, cache_dir, tasks):
+    broken = dict(tasks[0], eval={"eval_types": ["url_match"], "reference_answers": {"url_pattern": "("}})
+    task_file = tmp_path / "suite.json"
+    write_tasks(task_file, [broken] + tasks[1:])
+
+    catalog = TaskCatalog.load(task_file)
+    assert len(catalog) == len(tasks)
+    assert catalog.eval_plan(tasks[1]["task_id"]) is not None
+    with pytest.raises(Exception):
+        catalog.eval_plan(broken["task_id"])
+
+
+def test_cache_can_be_disabled(tmp_path, monkeypatch, tasks):
+    monkeypatch.setenv("ACIDWAVE_CACHE_DIR", "")
+    task_file = tmp_path / "suite.json"
+    write_tasks(task_file, tasks)
+    assert catalog_cache_path(task_file) is None
+    assert len(TaskCatalog.load(task_file)) == len(tasks)
+
+
+def test_jsonl_suites(tmp_path, cache_dir, tasks):
+    task_file = tmp_path / "suite.jsonl"
+    task_file.write_text("\n".join(json.dumps(task) for task in tasks) + "\n", encoding='utf-8')
+
+    assert TaskCatalog.load(task_file).task_ids == [task["task_id"] for task in tasks]
+    assert find_task_config(task_file, tasks[-1]["task_id"]) == tasks[-1]
+    assert find_task_config(task_file, -1) is None
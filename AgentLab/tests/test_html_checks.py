@@ -0,0 +1,36 @@
+import pytest
+
+from benchmark.acidwave.html_checks import compile_locator
+
+
+def test_top_level_has_text_becomes_text_filter():
+    assert compile_locator('button.play:has-text("Play Now")') == [
+        {"css": "button.play", "texts": ["play now"]}
+    ]
+
+
+def test_selector_list_compiles_each_alternative():
+    assert compile_locator('a:has-text("x"), li.song') == [
+        {"css": "a", "texts": ["x"]},
+        {"css": "li.song", "texts": []},
+    ]
+
+
+def test_parentheses_inside_text_are_not_nesting():
+    assert compile_locator('button:has-text("Mix (2024)")') == [
+        {"css": "button", "texts": ["mix (2024)"]}
+    ]
+
+
+@pytest.mark.parametrize(
+    "locator",
+    [
+        'div:has(span:has-text("x"))',
+        'li:not(:has-text("x"))',
+        'div:is(.a:has-text("x"), .b)',
+        'div:has-text("x") span',
+        "text=Play",
+    ],
+)
+def test_untranslatable_locators_fall_back(locator):
+    assert compile_locator(locator) is None
@@ -0,0 +1,129 @@
+import json
+import urllib.request
+
+import pytest
+
+from benchmark.acidwave.local_backend import LocalBackend
+
+
+@pytest.fixture(scope="module")
+def shared_backend():
+    return LocalBackend(port=0)
+
+
+@pytest.fixture
+def backend(shared_backend):
+    shared_backend.reset()
+    yield shared_backend
+    shared_backend.reset()
+
+
+def call(backend, method, path, query=None, body=None):
+    return backend.handle(method, path, query or {}, body or {})
+
+
+def first_song(backend):
+    status, payload = call(backend, "GET", "/api/songs", {"limit": "1"})
+    assert status == 200
+    return payload["data"][0]
+
+
+def test_list_songs_embeds_artist_and_album(backend):
+    status, payload = call(backend, "GET", "/api/songs", {"limit": "3", "sort": "title"})
+    assert status == 200
+    assert payload["count"] == len(payload["data"]) == 3
+    titles = [song["title"] for song in payload["data"]]
+    assert titles == sorted(titles)
+    assert set(payload["data"][0]["artist"]) == {"id", "name", "avatar_url"}
+
+
+@pytest.mark.parametrize("query", [{"sort": "no_such_column"}, {"limit": "abc"}, {"offset": "-1"}])
+def test_invalid_query_parameters_are_bad_requests(backend, query):
+    status, payload = call(backend, "GET", "/api/songs", query)
+    assert status == 400
+    assert payload["success"] is False
+
+
+def test_artist_crud(backend):
+    status, payload = call(backend, "POST", "/api/artists", body={"name": "Test Artist", "genres": ["synth"]})
+    assert status == 201
+    artist_id = payload["data"]["id"]
+    assert payload["data"]["genres"] == ["synth"]
+
+    status, payload = call(backend, "PUT", f"/api/artists/{artist_id}", body={"country": "JP"})
+    assert status == 200 and payload["data"]["country"] == "JP"
+
+    status, payload = call(backend, "GET", f"/api/artists/{artist_id}")
+    assert status == 200 and payload["data"]["name"] == "Test Artist"
+
+    assert call(backend, "DELETE", f"/api/artists/{artist_id}")[0] == 200
+    assert call(backend, "GET", f"/api/artists/{artist_id}")[0] == 404
+
+
+def test_missing_required_field_is_a_bad_request(backend):
+    assert call(backend, "POST", "/api/artists", body={})[0] == 400
+
+
+def test_playlist_songs_update_playlist_stats(backend):
+    song = first_song(backend)
+    status, payload = call(backend, "POST", "/api/playlists", body={"name": "Mix"})
+    assert status == 201
+    playlist_id = payload["data"]["id"]
+
+    assert call(backend, "POST", f"/api/playlists/{playlist_id}/songs", body={"song_id": song["id"]})[0] == 201
+    status, payload = call(backend, "GET", f"/api/playlists/{playlist_id}")
+    assert payload["data"]["total_tracks"] == 1
+    assert payload["data"]["total_duration"] == song["duration"]
+    assert payload["data"]["playlist_songs"][0]["songs"]["id"] == song["id"]
+
+    call(backend, "DELETE", f"/api/playlists/{playlist_id}/songs/{song['id']}")
+    status, payload = call(backend, "GET", f"/api/playlists/{playlist_id}")
+    assert payload["data"]["total_tracks"] == 0
+
+
+def test_failed_writes_are_rolled_back(backend):
+    song = first_song(backend)
+    assert call(backend, "POST", "/api/favorites", body={"song_id": song["id"]})[0] == 201
+    status, payload = call(backend, "POST", "/api/favorites", body={"song_id": song["id"]})
+    assert status == 200 and payload["data"] is None
+    assert call(backend, "POST", "/api/playlists/missing/songs", body={"song_id": song["id"]})[0] == 500
+
+    assert not backend.conn.in_transaction
+    assert call(backend, "POST", "/api/state/restore")[0] == 200
+
+
+def test_reset_restores_the_seed_data(backend):
+    seeded = backend.counts()
+    song = first_song(backend)
+    call(backend, "POST", "/api/favorites", body={"song_id": song["id"]})
+    call(backend, "DELETE", f"/api/songs/{song['id']}")
+    assert backend.counts() != seeded
+
+    backend.reset()
+    assert backend.counts() == seeded
+    assert call(backend, "GET", f"/api/songs/{song['id']}")[0] == 200
+
+
+def test_reset_restores_the_last_checkpoint(backend):
+    song = first_song(backend)
+    call(backend, "POST", "/api/favorites", body={"song_id": song["id"]})
+    status, payload = call(backend, "POST", "/api/state/checkpoint")
+    assert status == 200
+    checkpointed = payload["counts"]
+    try:
+        call(backend, "DELETE", f"/api/favorites/{song['id']}")
+        status, payload = call(backend, "POST", "/api/state/restore")
+        assert status == 200 and payload["counts"] == checkpointed
+        assert call(backend, "POST", "/api/favorites/check", body={"song_id": song["id"]})[1]["is_favorited"]
+    finally:
+        # Later tests start from the seed data
+        call(backend, "DELETE", f"/api/favorites/{song['id']}")
+        backend.checkpoint()
+
+
+def test_serves_the_api_over_http(shared_backend):
+    with LocalBackend(port=0) as backend:
+        with urllib.request.urlopen(f"{backend.api_url}/health", timeout=5) as response:
+            payload = json.load(response)
+    assert payload["status"] == "ok"
+    assert payload["database"]["songs_count"] == shared_backend.counts()["songs"]
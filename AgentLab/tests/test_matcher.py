@@ -0,0 +1,46 @@
+import pytest
+
+from benchmark.acidwave import matcher as matcher_module
+from benchmark.acidwave.matcher import AUTOMATON_MIN_TERMS, MultiPatternMatcher
+
+TEXT = "ARTIST_PROFILE :: Mise Darling - Plastic Love (1984) shared with her"
+
+
+def padded_terms(terms, total):
+    """``terms`` plus filler terms that never occur, ``total`` terms in all."""
+    return list(terms) + [f"zz-filler-{i}" for i in range(total - len(terms))]
+
+
+@pytest.mark.parametrize("n_terms", [3, AUTOMATON_MIN_TERMS - 1, AUTOMATON_MIN_TERMS, AUTOMATON_MIN_TERMS * 2])
+def test_find_reports_present_terms(n_terms):
+    terms = padded_terms(["Mise Darling", "Plastic Love", "missing"], n_terms)
+    matcher = MultiPatternMatcher(terms)
+    assert matcher._use_automaton == (n_terms >= AUTOMATON_MIN_TERMS)
+    assert matcher.find(TEXT) == {"Mise Darling", "Plastic Love"}
+
+
+@pytest.mark.parametrize("n_terms", [3, AUTOMATON_MIN_TERMS])
+def test_case_insensitive(n_terms):
+    matcher = MultiPatternMatcher(padded_terms(["mise darling", "PLASTIC"], n_terms), case_insensitive=True)
+    assert matcher.find(TEXT) == {"mise darling", "PLASTIC"}
+
+
+@pytest.mark.parametrize("n_terms", [3, AUTOMATON_MIN_TERMS])
+def test_overlapping_and_nested_terms(n_terms):
+    # "he" ends inside "her"; "she" and "hers" share prefixes with present terms
+    terms = padded_terms(["he", "her", "she", "hers", "shared"], n_terms)
+    assert MultiPatternMatcher(terms).find(TEXT) == {"he", "her", "shared"}
+
+
+def test_empty_term_always_found():
+    matcher = MultiPatternMatcher(padded_terms(["", "absent"], AUTOMATON_MIN_TERMS))
+    assert matcher.find("") == {""}
+
+
+def test_automaton_agrees_with_substring_scan(monkeypatch):
+    terms = [TEXT[i:i + k] for i in range(0, len(TEXT), 3) for k in (2, 5, 9)] + ["nope", "Love!"]
+    scan = MultiPatternMatcher(terms).find(TEXT)
+    monkeypatch.setattr(matcher_module, "AUTOMATON_MIN_TERMS", 1)
+    automaton = MultiPatternMatcher(terms)
+    assert automaton._use_automaton
+    assert automaton.find(TEXT) == scan
@@ -0,0 +1,46 @@
+import pytest
+
+from benchmark.acidwave.sharding import assign_shards, shard_task_ids
+
+COSTS = {0: 40.0, 1: 5.0, 2: 12.0, 3: 30.0, 4: 5.0, 5: 18.0, 6: 7.0, 7: 22.0}
+
+
+def test_assign_shards_is_deterministic():
+    first = assign_shards(range(8), num_shards=3, costs=COSTS)
+    # Input order and duplicates do not change the partition
+    again = assign_shards([7, 3, 3, 0, 5, 1, 6, 2, 4], num_shards=3, costs=dict(reversed(COSTS.items())))
+    assert first == again
+
+
+def test_assign_shards_partitions_every_task_once():
+    shards = assign_shards(range(8), num_shards=3, costs=COSTS)
+    assert sorted(task_id for shard in shards for task_id in shard) == list(range(8))
+    assert all(shard == sorted(shard) for shard in shards)
+
+
+def test_assign_shards_balances_costs_longest_first():
+    shards = assign_shards(range(8), num_shards=3, costs=COSTS)
+    loads = [sum(COSTS[task_id] for task_id in shard) for shard in shards]
+    assert max(loads) - min(loads) <= max(COSTS.values())
+    assert shards[0][0] == 0  # the longest task opens the first shard
+
+
+def test_assign_shards_without_costs_is_round_robin():
+    assert assign_shards(range(6), num_shards=2) == [[0, 2, 4], [1, 3, 5]]
+
+
+def test_unknown_tasks_get_the_median_cost():
+    with_default = assign_shards(range(4), num_shards=2, costs={0: 10.0, 1: 10.0})
+    explicit = assign_shards(range(4), num_shards=2, costs={0: 10.0, 1: 10.0, 2: 10.0, 3: 10.0})
+    assert with_default == explicit
+
+
+def test_shard_task_ids_matches_assign_shards():
+    shards = assign_shards(range(8), num_shards=3, costs=COSTS)
+    assert [shard_task_ids(range(8), i, 3, COSTS) for i in range(3)] == shards
+
+
+@pytest.mark.parametrize("shard_index, num_shards", [(3, 3), (-1, 3), (0, 0)])
+def test_invalid_shards_are_rejected(shard_index, num_shards):
+    with pytest.raises(ValueError):
+        shard_task_ids(range(8), shard_index, num_shards)
@@ -0,0 +1,58 @@
+import express from 'express';
+import { supabase } from '../config/supabase.js';
+import { restoreCheckpoint, rowCounts, takeCheckpoint } from '../services/stateCheckpoint.js';
+
+const router = express.Router();
+
+// Rows of the mutable tables at the last checkpoint, kept in memory
+let checkpoint = null;
+
+// POST take a checkpoint of the mutable tables
+router.post('/checkpoint', async (req, res) => {
+  try {
+    checkpoint = await takeCheckpoint(supabase);
+
+    res.json({
+      success: true,
+      created_at: checkpoint.created_at,
+      counts: rowCounts(checkpoint)
+    });
+  } catch (error) {
+    console.error('Error taking state checkpoint:', error);
+    res.status(500).json({
+      success: false,
+      error: error.message
+    });
+  }
+});
+
+// POST restore the mutable tables to the last checkpoint
+router.post('/restore', async (req, res) => {
+  if (!checkpoint) {
+    return res.status(409).json({
+      success: false,
+      error: 'No checkpoint taken yet (POST /api/state/checkpoint first)'
+    });
+  }
+
+  try {
+    const started = Date.now();
+
+    await restoreCheckpoint(supabase, checkpoint);
+
+    res.json({
+      success: true,
+      checkpoint: checkpoint.created_at,
+      counts: rowCounts(checkpoint),
+      elapsed_ms: Date.now() - started
+    });
+  } catch (error) {
+    console.error('Error restoring state checkpoint:', error);
+    res.status(500).json({
+      success: false,
+      error: error.message
+    });
+  }
+});
+
+export default router;
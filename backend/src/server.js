@@ -11,6 +11,7 @@ import songsRouter from './routes/songs.js';
 import playlistsRouter from './routes/playlists.js';
 import favoritesRouter from './routes/favorites.js';
 import healthRouter from './routes/health.js';
+import stateRouter from './routes/state.js';
 
 dotenv.config();
 
@@ -31,6 +32,11 @@ app.use('/api/songs', songsRouter);
 app.use('/api/playlists', playlistsRouter);
 app.use('/api/favorites', favoritesRouter);
 
+// Benchmark state checkpoint/restore (mutates data: opt-in for test deployments)
+if (process.env.ENABLE_STATE_RESET === 'true') {
+  app.use('/api/state', stateRouter);
+}
+
 // Root endpoint
 app.get('/', (req, res) => {
   res.json({
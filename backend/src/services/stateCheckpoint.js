@@ -0,0 +1,107 @@
+// Benchmark state checkpoint/restore of the mutable tables
+// Used by routes/state.js; takes the Supabase client as a parameter
+
+// Tables mutated through the app (favorites, playlists), in insert order.
+// Catalog tables (artists, albums, songs) are read-only during benchmark runs.
+export const MUTABLE_TABLES = ['playlists', 'playlist_songs', 'user_favorites'];
+
+// Tables whose statistics columns are maintained by triggers on a child table
+// (schema.sql: update_playlist_stats_on_song_change)
+const TRIGGER_STATS_TABLES = ['playlists'];
+
+// Rows per request: at most PostgREST's default max-rows, so every page is
+// either full or the last one
+export const PAGE_SIZE = 1000;
+
+// Ids per delete request, keeping the `id=in.(...)` filter well within URL limits
+export const DELETE_BATCH_SIZE = 100;
+
+export function rowCounts(checkpoint) {
+  return Object.fromEntries(
+    Object.entries(checkpoint.tables).map(([table, rows]) => [table, rows.length])
+  );
+}
+
+/**
+ * Read every row of a table, one page at a time
+ * @param {object} client - Supabase client
+ * @param {string} table - Table name
+ * @param {string} columns - Columns to select
+ * @returns {Promise<Array>} rows, ordered by id
+ * @throws if fewer rows were read than the table holds (e.g. a lower max-rows)
+ */
+export async function selectAll(client, table, columns = '*') {
+  const rows = [];
+  let total = null;
+  for (;;) {
+    const { data, count, error } = await client
+      .from(table)
+      .select(columns, { count: 'exact' })
+      .order('id')
+      .range(rows.length, rows.length + PAGE_SIZE - 1);
+    if (error) throw error;
+    if (total === null) total = count;
+    rows.push(...data);
+    if (data.length < PAGE_SIZE) break;
+  }
+  if (total !== null && rows.length !== total) {
+    throw new Error(`Read ${rows.length} of ${total} rows of ${table}; refusing a partial checkpoint`);
+  }
+  return rows;
+}
+
+/**
+ * Read the rows of every mutable table
+ * @param {object} client - Supabase client
+ * @returns {Promise<object>} checkpoint { created_at, tables }
+ */
+export async function takeCheckpoint(client) {
+  const tables = {};
+  for (const table of MUTABLE_TABLES) {
+    tables[table] = await selectAll(client, table);
+  }
+  return { created_at: new Date().toISOString(), tables };
+}
+
+async function upsertRows(client, table, rows) {
+  for (let start = 0; start < rows.length; start += PAGE_SIZE) {
+    const { error } = await client
+      .from(table)
+      .upsert(rows.slice(start, start + PAGE_SIZE), { onConflict: 'id' });
+    if (error) throw error;
+  }
+}
+
+/**
+ * Bring the mutable tables back to a checkpoint
+ * @param {object} client - Supabase client
+ * @param {object} checkpoint - Result of takeCheckpoint
+ */
+export async function restoreCheckpoint(client, checkpoint) {
+  // Drop rows created since the checkpoint (children first, so unique
+  // constraints are free again before the checkpoint rows come back)
+  for (const table of [...MUTABLE_TABLES].reverse()) {
+    const keep = new Set(checkpoint.tables[table].map((row) => String(row.id)));
+    const created = (await selectAll(client, table, 'id'))
+      .map((row) => row.id)
+      .filter((id) => !keep.has(String(id)));
+    for (let start = 0; start < created.length; start += DELETE_BATCH_SIZE) {
+      const { error } = await client
+        .from(table)
+        .delete()
+        .in('id', created.slice(start, start + DELETE_BATCH_SIZE));
+      if (error) throw error;
+    }
+  }
+
+  // Bring back deleted and modified rows (parents first)
+  for (const table of MUTABLE_TABLES) {
+    await upsertRows(client, table, checkpoint.tables[table]);
+  }
+
+  // The playlist_songs writes above re-ran the stats triggers: write the
+  // checkpointed statistics back last so they match the checkpoint exactly
+  for (const table of TRIGGER_STATS_TABLES) {
+    await upsertRows(client, table, checkpoint.tables[table]);
+  }
+}
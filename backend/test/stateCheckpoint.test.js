@@ -0,0 +1,161 @@
+import assert from 'node:assert/strict';
+import { test } from 'node:test';
+import {
+  DELETE_BATCH_SIZE,
+  PAGE_SIZE,
+  restoreCheckpoint,
+  selectAll,
+  takeCheckpoint
+} from '../src/services/stateCheckpoint.js';
+
+// PostgREST's default max-rows
+const MAX_ROWS = 1000;
+
+// In-memory stand-in for the Supabase client, with the playlist stats
+// trigger of schema.sql (update_playlist_stats_on_song_change)
+function fakeClient() {
+  const db = {
+    songs: [
+      { id: 's1', duration: 200 },
+      { id: 's2', duration: 180 },
+      { id: 's3', duration: 240 }
+    ],
+    playlists: [],
+    playlist_songs: [],
+    user_favorites: []
+  };
+
+  function updatePlaylistStats(playlistId) {
+    const playlist = db.playlists.find((row) => row.id === playlistId);
+    if (!playlist) return;
+    const entries = db.playlist_songs.filter((row) => row.playlist_id === playlistId);
+    playlist.total_tracks = entries.length;
+    playlist.total_duration = entries.reduce(
+      (sum, entry) => sum + db.songs.find((song) => song.id === entry.song_id).duration,
+      0
+    );
+  }
+
+  function afterWrite(table, row) {
+    if (table === 'playlist_songs') updatePlaylistStats(row.playlist_id);
+  }
+
+  const deleteBatches = [];
+
+  return {
+    db,
+    deleteBatches,
+    insert(table, row) {
+      db[table].push({ ...row });
+      afterWrite(table, row);
+    },
+    from(table) {
+      return {
+        select(columns, { count } = {}) {
+          let rows = db[table].map((row) => (columns === '*' ? { ...row } : { id: row.id }));
+          const query = {
+            order(column) {
+              rows = [...rows].sort((x, y) => String(x[column]).localeCompare(String(y[column])));
+              return query;
+            },
+            async range(from, to) {
+              // PostgREST caps every response at max-rows
+              const page = rows.slice(from, Math.min(to + 1, from + MAX_ROWS));
+              return { data: page, count: count === 'exact' ? rows.length : null, error: null };
+            }
+          };
+          return query;
+        },
+        delete() {
+          return {
+            async in(column, values) {
+              deleteBatches.push(values.length);
+              const removed = db[table].filter((row) => values.includes(row[column]));
+              db[table] = db[table].filter((row) => !removed.includes(row));
+              removed.forEach((row) => afterWrite(table, row));
+              return { error: null };
+            }
+          };
+        },
+        async upsert(rows) {
+          for (const row of rows) {
+            const existing = db[table].find((current) => current.id === row.id);
+            if (existing) Object.assign(existing, row);
+            else db[table].push({ ...row });
+            afterWrite(table, row);
+          }
+          return { error: null };
+        }
+      };
+    }
+  };
+}
+
+test('restoring twice keeps playlist stats at the checkpoint values', async () => {
+  const client = fakeClient();
+  client.insert('playlists', { id: 'p1', name: 'Mix', total_tracks: 0, total_duration: 0 });
+  client.insert('playlist_songs', { id: 'ps1', playlist_id: 'p1', song_id: 's1' });
+  client.insert('playlist_songs', { id: 'ps2', playlist_id: 'p1', song_id: 's2' });
+  const checkpoint = await takeCheckpoint(client);
+
+  // A task adds a song, removes another and creates a playlist
+  client.insert('playlist_songs', { id: 'ps3', playlist_id: 'p1', song_id: 's3' });
+  client.db.playlist_songs = client.db.playlist_songs.filter((row) => row.id !== 'ps1');
+  client.insert('playlists', { id: 'p2', name: 'New', total_tracks: 0, total_duration: 0 });
+  client.insert('playlist_songs', { id: 'ps4', playlist_id: 'p2', song_id: 's1' });
+
+  await restoreCheckpoint(client, checkpoint);
+  await restoreCheckpoint(client, checkpoint);
+
+  assert.deepEqual(client.db.playlists, checkpoint.tables.playlists);
+  assert.deepEqual(
+    client.db.playlist_songs.map((row) => row.id).sort(),
+    checkpoint.tables.playlist_songs.map((row) => row.id).sort()
+  );
+  const [playlist] = client.db.playlists;
+  assert.equal(playlist.total_tracks, 2);
+  assert.equal(playlist.total_duration, 380);
+});
+
+test('checkpoint and restore page through tables larger than max-rows', async () => {
+  const client = fakeClient();
+  const n = PAGE_SIZE * 2 + 500;
+  for (let i = 0; i < n; i++) {
+    client.insert('user_favorites', { id: `f${String(i).padStart(5, '0')}`, song_id: 's1' });
+  }
+  const checkpoint = await takeCheckpoint(client);
+  assert.equal(checkpoint.tables.user_favorites.length, n);
+
+  for (let i = 0; i < DELETE_BATCH_SIZE * 2 + 50; i++) {
+    client.insert('user_favorites', { id: `new-${i}`, song_id: 's2' });
+  }
+  client.db.user_favorites.splice(0, 10);
+
+  await restoreCheckpoint(client, checkpoint);
+
+  assert.equal(client.db.user_favorites.length, n);
+  assert.ok(!client.db.user_favorites.some((row) => row.id.startsWith('new-')));
+  assert.deepEqual(client.deleteBatches, [DELETE_BATCH_SIZE, DELETE_BATCH_SIZE, 50]);
+});
+
+test('a read cut short by a lower max-rows refuses to checkpoint', async () => {
+  const client = fakeClient();
+  for (let i = 0; i < MAX_ROWS + 1; i++) {
+    client.insert('user_favorites', { id: `f${i}`, song_id: 's1' });
+  }
+  const from = client.from;
+  client.from = (table) => {
+    const query = from(table);
+    const select = query.select;
+    query.select = (...args) => {
+      const builder = select(...args);
+      const range = builder.range;
+      // max-rows of 10: the first page comes back short
+      builder.range = (start) => range(start, start + 9);
+      return builder;
+    };
+    return query;
+  };
+
+  await assert.rejects(selectAll(client, 'user_favorites'), /refusing a partial checkpoint/);
+});